@@ -110,11 +110,33 @@ class RelayProjectConfigsEndpoint(Endpoint):
         return post_or_schedule
 
     def _post_or_schedule_by_key(self, request: Request):
-        public_keys = set(request.relay_request_data.get("publicKeys") or ())
+        requested_keys = request.relay_request_data.get("publicKeys") or ()
+        public_keys = set(requested_keys)
+
+        # Relays may send the revisions of the configs they already have, in the
+        # same order as `publicKeys`. For these, only the changes since are sent.
+        revisions = {
+            key: revision
+            for key, revision in zip(
+                requested_keys, request.relay_request_data.get("revisions") or ()
+            )
+            if revision
+        }
 
         proj_configs = {}
+        deltas = {}
+        unchanged = []
         pending = []
         for key in public_keys:
+            if key in revisions:
+                delta = projectconfig_cache.backend.get_delta(key, revisions[key])
+                if delta is not None and delta["rev"] == revisions[key]:
+                    unchanged.append(key)
+                    continue
+                elif delta is not None:
+                    deltas[key] = delta["patch"]
+                    continue
+
             computed = self._get_cached_or_schedule(key)
             if not computed:
                 pending.append(key)
@@ -127,7 +149,14 @@ class RelayProjectConfigsEndpoint(Endpoint):
         # result, we're keeping the same name.
         metrics.incr("relay.project_configs.post_v3.pending", amount=len(pending))
         metrics.incr("relay.project_configs.post_v3.fetched", amount=len(proj_configs))
-        return {"configs": proj_configs, "pending": pending}
+
+        response: dict[str, Any] = {"configs": proj_configs, "pending": pending}
+        if revisions:
+            metrics.incr("relay.project_configs.post_v3.unchanged", amount=len(unchanged))
+            metrics.incr("relay.project_configs.post_v3.delta", amount=len(deltas))
+            response["unchanged"] = unchanged
+            response["deltas"] = deltas
+        return response
 
     def _get_cached_or_schedule(self, public_key) -> dict | None:
         """
@@ -2,14 +2,14 @@ from __future__ import annotations
 
 import functools
 from abc import abstractmethod
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from datetime import datetime, timedelta
 from typing import Any, NamedTuple, NotRequired, Protocol, TypedDict
 
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 
-from sentry import features, release_health, tsdb
+from sentry import features, options, release_health, tsdb
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.group import (
     BaseGroupSerializerResponse,
@@ -555,6 +555,31 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
         if not groups:
             return
 
+        return self._get_cached_group_results(
+            "stats",
+            groups,
+            [
+                environment_ids,
+                conditions,
+                query_params["rollup"],
+                query_params["start"],
+                query_params["end"],
+            ],
+            functools.partial(
+                self._query_tsdb,
+                query_params=query_params,
+                conditions=conditions,
+                environment_ids=environment_ids,
+            ),
+        )
+
+    def _query_tsdb(
+        self,
+        groups: Sequence[Group],
+        query_params,
+        conditions=None,
+        environment_ids=None,
+    ):
         error_issue_ids, generic_issue_ids = [], []
         for group in groups:
             if GroupCategory.ERROR == group.issue_category:
@@ -591,25 +616,48 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
     def _seen_stats_error(
         self, error_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(error_issue_list, self._execute_error_seen_stats_query)
+        return self.__seen_stats_impl(
+            "seen_error", error_issue_list, self._execute_error_seen_stats_query
+        )
 
     def _seen_stats_generic(
         self, generic_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(generic_issue_list, self._execute_generic_seen_stats_query)
+        return self.__seen_stats_impl(
+            "seen_generic", generic_issue_list, self._execute_generic_seen_stats_query
+        )
 
     def __seen_stats_impl(
         self,
+        name: str,
         error_issue_list: Sequence[Group],
         seen_stats_func: _SeenStatsFunc,
     ) -> Mapping[Any, SeenStats]:
-        partial_execute_seen_stats_query = functools.partial(
-            seen_stats_func,
-            item_list=error_issue_list,
-            environment_ids=self.environment_ids,
-            start=self.start,
-            end=self.end,
-        )
+        def partial_execute_seen_stats_query(
+            start: datetime | None = self.start,
+            end: datetime | None = self.end,
+            conditions=None,
+        ) -> Mapping[str, Any]:
+            def execute(groups: Sequence[Group]) -> dict[int, dict[str, Any]]:
+                result = seen_stats_func(
+                    item_list=groups,
+                    start=start,
+                    end=end,
+                    conditions=conditions,
+                    environment_ids=self.environment_ids,
+                )
+                rows = {row["group_id"]: row for row in result["data"]}
+                # Groups without events are cached as empty rows.
+                return {group.id: rows.get(group.id, {}) for group in groups}
+
+            rows = self._get_cached_group_results(
+                name,
+                error_issue_list,
+                [self.environment_ids, conditions, start, end],
+                execute,
+            )
+            return {"data": [row for row in rows.values() if row]}
+
         time_range_result = self._parse_seen_stats_results(
             partial_execute_seen_stats_query(),
             error_issue_list,
@@ -650,6 +698,56 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             )
         return time_range_result
 
+    def _get_cached_group_results[T](
+        self,
+        name: str,
+        groups: Sequence[Group],
+        key_parts: Sequence[Any],
+        fetch: Callable[[Sequence[Group]], Mapping[int, T]],
+    ) -> dict[int, T]:
+        """
+        Returns ``fetch(groups)``, serving the results of individual groups from
+        the cache where possible so that only the missing groups are queried.
+
+        Results are cached for ``issues.stream.stats-cache-ttl`` seconds. Times
+        in ``key_parts`` are bucketed by the TTL, so that the moving time ranges
+        of relative stats periods share cache entries within a bucket.
+        """
+        ttl = options.get("issues.stream.stats-cache-ttl")
+        if ttl <= 0:
+            return dict(fetch(groups))
+
+        key_values = [
+            int(part.timestamp()) // ttl if isinstance(part, datetime) else repr(part)
+            for part in key_parts
+        ]
+        cache_keys = {
+            group.id: f"stream-stats:{name}:{hash_values([group.id, *key_values])}"
+            for group in groups
+        }
+        cache_data = cache.get_many(cache_keys.values())
+
+        results: dict[int, T] = {}
+        missed_groups = []
+        for group in groups:
+            value = cache_data.get(cache_keys[group.id])
+            if value is None:
+                missed_groups.append(group)
+            else:
+                results[group.id] = value
+        metrics.incr("group.stream_stats_cache.hit", amount=len(results), tags={"name": name})
+        metrics.incr(
+            "group.stream_stats_cache.miss", amount=len(missed_groups), tags={"name": name}
+        )
+
+        if missed_groups:
+            fetched = fetch(missed_groups)
+            cache.set_many(
+                {cache_keys[group_id]: value for group_id, value in fetched.items()}, ttl
+            )
+            results.update(fetched)
+        return results
+
     def _build_session_cache_key(self, project_id):
         start_key_dt = end_key_dt = None
         env_key = ""
@@ -1,16 +1,33 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
 from django.db.models import Expression, F
+from django.db.models.signals import post_save
 
 from sentry.db import models
+from sentry.db.models.query import _handle_value
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils import metrics
 from sentry.utils.services import Service
 
 BufferField = models.Model | str | int
 
 
+class BufferedIncr(NamedTuple):
+    """
+    A single buffered increment, as passed to `Buffer.process`.
+    """
+
+    model: type[models.Model] | None
+    columns: dict[str, int] | None
+    filters: dict[str, Any] | None
+    extra: dict[str, Any] | None = None
+    signal_only: bool | None = None
+
+
 class Buffer(Service):
     """
     Buffers act as temporary stores for counters. The default implementation is just a passthru and
@@ -28,6 +45,7 @@ class Buffer(Service):
     __all__ = (
         "get",
         "incr",
+        "incr_many",
         "process",
         "process_pending",
         "process_batch",
@@ -137,12 +155,93 @@ class Buffer(Service):
             headers={"sentry-propagate-traces": False},
         )
 
+    def incr_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Apply multiple increments, possibly for different models, at once. See
+        `incr` for the meaning of the fields of each increment.
+
+        >>> incr_many([
+        ...     BufferedIncr(Group, {'times_seen': 1}, {'pk': group.pk}),
+        ...     BufferedIncr(ReleaseProject, {'new_groups': 1}, {'pk': release_project.pk}),
+        ... ])
+        """
+        for incr in incrs:
+            assert incr.model is not None and incr.columns is not None
+            assert incr.filters is not None
+            self.incr(incr.model, incr.columns, incr.filters, incr.extra, incr.signal_only)
+
     def process_pending(self) -> None:
         return
 
     def process_batch(self) -> None:
         return
 
+    def process_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Process multiple buffered increments at once, coalescing updates to
+        groups into a single query per set of updated columns. Anything else
+        is processed one by one, exactly like `process`.
+        """
+        from sentry.models.group import Group
+
+        group_incrs: dict[int, BufferedIncr] = {}
+        for incr in incrs:
+            group_id = _get_pk_filter(incr.filters) if incr.model is Group else None
+            if group_id is None or incr.signal_only or group_id in group_incrs:
+                Buffer.process(self, *incr)
+            else:
+                group_incrs[group_id] = incr
+
+        if group_incrs:
+            self._process_group_incrs(group_incrs)
+
+    def _process_group_incrs(self, group_incrs: dict[int, BufferedIncr]) -> None:
+        from sentry.models.group import Group
+
+        # Mirror `Group.update` in `process`, which fires `post_save` with the
+        # updated group so that it ends up in the cache.
+        groups = Group.objects.in_bulk(list(group_incrs))
+
+        updates_by_fields: dict[frozenset[str], list[tuple[Group, dict[str, Any]]]] = (
+            defaultdict(list)
+        )
+        for group_id, incr in group_incrs.items():
+            group = groups.get(group_id)
+            # If the group was deleted by the time we flush buffers we don't
+            # care, just continue
+            if group is not None:
+                update_kwargs = _get_update_kwargs(incr.columns or {}, incr.extra)
+                updates_by_fields[frozenset(update_kwargs)].append((group, update_kwargs))
+
+        for fields, updates in updates_by_fields.items():
+            if not fields:
+                continue
+
+            # `bulk_update` reads the new values from the instances, so they
+            # are passed as unsaved stand-ins rather than the loaded groups.
+            Group.objects.bulk_update(
+                [Group(id=group.id, **update_kwargs) for group, update_kwargs in updates],
+                list(fields),
+            )
+            for group, update_kwargs in updates:
+                for key, value in update_kwargs.items():
+                    setattr(group, key, _handle_value(group, value))
+                post_save.send_robust(
+                    sender=Group, instance=group, created=False, update_fields=list(fields)
+                )
+
+            metrics.distribution("buffer.process-many.groups", len(updates))
+
+        for group_id, incr in group_incrs.items():
+            buffer_incr_complete.send_robust(
+                model=Group,
+                columns=incr.columns or {},
+                filters=incr.filters,
+                extra=incr.extra,
+                created=False,
+                sender=Group,
+            )
+
     def process(
         self,
         model: type[models.Model] | None,
@@ -161,16 +260,7 @@ class Buffer(Service):
         created = False
 
         if not signal_only:
-            update_kwargs: dict[str, Expression] = {c: F(c) + v for c, v in columns.items()}
-
-            if extra:
-                # Because of the group.update() below, we need to parse
-                # datetime strings back into datetime objects. This ensures that
-                # the cache data contains the correct type.
-                for key in ("last_seen", "first_seen"):
-                    if key in extra and isinstance(extra[key], str):
-                        extra[key] = datetime.fromisoformat(extra[key])
-                update_kwargs.update(extra)
+            update_kwargs = _get_update_kwargs(columns, extra)
             # HACK(dcramer): this is gross, but we don't have a good hook to compute this property today
             # XXX(dcramer): remove once we can replace 'priority' with something reasonable via Snuba
             if model is Group:
@@ -198,3 +288,26 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+
+def _get_pk_filter(filters: dict[str, Any] | None) -> int | None:
+    if filters and len(filters) == 1:
+        ((key, value),) = filters.items()
+        if key in ("id", "pk") and isinstance(value, int):
+            return value
+    return None
+
+
+def _get_update_kwargs(columns: dict[str, int], extra: dict[str, Any] | None) -> dict[str, Any]:
+    update_kwargs: dict[str, Expression] = {c: F(c) + v for c, v in columns.items()}
+
+    if extra:
+        # Because of the group.update() in `process`, we need to parse
+        # datetime strings back into datetime objects. This ensures that
+        # the cache data contains the correct type.
+        for key in ("last_seen", "first_seen"):
+            if key in extra and isinstance(extra[key], str):
+                extra[key] = datetime.fromisoformat(extra[key])
+        update_kwargs.update(extra)
+
+    return update_kwargs
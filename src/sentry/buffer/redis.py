@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import pickle
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from enum import Enum
@@ -13,7 +14,8 @@ import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry import options
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -24,11 +26,14 @@ from sentry.utils.redis import (
     get_dynamic_cluster_from_options,
     is_instance_rb_cluster,
     is_instance_redis_cluster,
+    load_redis_script,
     validate_dynamic_cluster,
 )
 
 logger = logging.getLogger(__name__)
 
+incr_multi_script = load_redis_script("buffer/incr_multi.lua")
+
 T = TypeVar("T", str, bytes)
 # Debounce our JSON validation a bit in order to not cause too much additional
 # load everywhere
@@ -468,17 +473,31 @@ class RedisBuffer(Buffer):
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         pipe = self.get_redis_connection(key)
-        pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
-        _validate_json_roundtrip(filters, model)
+        self._pipeline_incr(pipe, key, BufferedIncr(model, columns, filters, extra, signal_only))
+        pipe.zadd(self.pending_key, {key: time()})
+        pipe.execute()
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+    def _encode_incr(self, incr: BufferedIncr) -> tuple[str, Any, dict[str, Any]]:
+        """
+        Encode an increment into the model name, filters and hash fields which
+        are set on its buffered hash.
+        """
+        model, _, filters, extra, signal_only = incr
+        assert model is not None and filters is not None
 
+        _validate_json_roundtrip(filters, model)
         if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-            pipe.hsetnx(key, "f", json.dumps(self._dump_values(filters)))
+            encoded_filters: Any = json.dumps(self._dump_values(filters))
         else:
-            pipe.hsetnx(key, "f", pickle.dumps(filters))
-
-        for column, amount in columns.items():
-            pipe.hincrby(key, "i+" + column, amount)
+            encoded_filters = pickle.dumps(filters)
 
+        sets: dict[str, Any] = {}
         if extra:
             # Group tries to serialize 'score', so we'd need some kind of processing
             # hook here
@@ -486,22 +505,74 @@ class RedisBuffer(Buffer):
             _validate_json_roundtrip(extra, model)
             for column, value in extra.items():
                 if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                    pipe.hset(key, "e+" + column, json.dumps(self._dump_value(value)))
+                    sets["e+" + column] = json.dumps(self._dump_value(value))
                 else:
-                    pipe.hset(key, "e+" + column, pickle.dumps(value))
+                    sets["e+" + column] = pickle.dumps(value)
 
         if signal_only is True:
-            pipe.hset(key, "s", "1")
+            sets["s"] = "1"
+
+        return f"{model.__module__}.{model.__name__}", encoded_filters, sets
+
+    def _pipeline_incr(self, pipe: Pipeline, key: str, incr: BufferedIncr) -> None:
+        model_name, filters, sets = self._encode_incr(incr)
+        pipe.hsetnx(key, "m", model_name)
+        pipe.hsetnx(key, "f", filters)
+
+        for column, amount in (incr.columns or {}).items():
+            pipe.hincrby(key, "i+" + column, amount)
+
+        for field, value in sets.items():
+            pipe.hset(key, field, value)
 
         pipe.expire(key, self.key_expire)
-        pipe.zadd(self.pending_key, {key: time()})
-        pipe.execute()
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
+    def incr_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Apply multiple increments, e.g. all increments for one event, at once.
+
+        With a blaster cluster, all increments for keys on the same host are
+        applied by a single script, which also adds the keys to the pending set
+        of that host. A Redis cluster can't run a script on keys from different
+        slots, so there the increments are sent in a single pipeline instead.
+        """
+        now = time()
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for incr in incrs:
+                key = self._make_key(incr.model, incr.filters)
+                self._pipeline_incr(pipe, key, incr)
+                pipe.zadd(self.pending_key, {key: now})
+            pipe.execute()
+        else:
+            router = self.cluster.get_router()
+            incrs_by_host: dict[int, list[tuple[str, BufferedIncr]]] = defaultdict(list)
+            for incr in incrs:
+                key = self._make_key(incr.model, incr.filters)
+                incrs_by_host[router.get_host_for_key(key)].append((key, incr))
+
+            for host_id, host_incrs in incrs_by_host.items():
+                keys = [self.pending_key]
+                args: list[Any] = [self.key_expire, now]
+                for key, incr in host_incrs:
+                    model_name, filters, sets = self._encode_incr(incr)
+                    columns = incr.columns or {}
+                    keys.append(key)
+                    args.extend([model_name, filters, len(columns), len(sets)])
+                    for column, amount in columns.items():
+                        args.extend(["i+" + column, amount])
+                    for field, value in sets.items():
+                        args.extend([field, value])
+
+                incr_multi_script(keys, args, self.cluster.get_local_client(host_id))
+
+        for incr in incrs:
+            assert incr.model is not None
+            metrics.incr(
+                "buffer.incr",
+                skip_internal=True,
+                tags={"module": incr.model.__module__, "model": incr.model.__name__},
+            )
 
     def process_pending(self) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
@@ -537,9 +608,14 @@ class RedisBuffer(Buffer):
 
         try:
             keycount = 0
+            now = time()
             if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                keys: list[str] = self.cluster.zrange(self.pending_key, 0, -1)
+                keys_with_scores: list[tuple[str, float]] = self.cluster.zrange(
+                    self.pending_key, 0, -1, withscores=True
+                )
+                keys = [key for key, _ in keys_with_scores]
                 keycount += len(keys)
+                self._record_pending_lag("cluster", keys_with_scores, now)
 
                 for key in keys:
                     model_key = self._extract_model_from_key(key=key)
@@ -556,13 +632,15 @@ class RedisBuffer(Buffer):
                 self.cluster.zrem(self.pending_key, *keys)
             elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
                 with self.cluster.all() as conn:
-                    results = conn.zrange(self.pending_key, 0, -1)
+                    results = conn.zrange(self.pending_key, 0, -1, withscores=True)
 
                 with self.cluster.all() as conn:
-                    for host_id, keysb in results.value.items():
-                        if not keysb:
+                    for host_id, keysb_with_scores in results.value.items():
+                        if not keysb_with_scores:
                             continue
+                        keysb = [keyb for keyb, _ in keysb_with_scores]
                         keycount += len(keysb)
+                        self._record_pending_lag(str(host_id), keysb_with_scores, now)
                         for keyb in keysb:
                             key = keyb.decode("utf-8")
                             model_key = self._extract_model_from_key(key=key)
@@ -600,6 +678,20 @@ class RedisBuffer(Buffer):
         finally:
             client.delete(lock_key)
 
+    def _record_pending_lag(
+        self, shard: str, keys_with_scores: list[tuple[Any, float]], now: float
+    ) -> None:
+        # The score of a pending key is the time of its last increment, so
+        # this is how long the oldest pending key has been waiting to be
+        # flushed.
+        if keys_with_scores:
+            metrics.distribution(
+                "buffer.pending-lag",
+                now - min(score for _, score in keys_with_scores),
+                tags={"shard": shard},
+                unit="second",
+            )
+
     def process(self, key: str | None = None, batch_keys: list[str] | None = None, **kwargs: Any) -> None:  # type: ignore[override]
         # NOTE: This method has a totally different signature than the base class
         assert not (key is None and batch_keys is None)
@@ -609,6 +701,10 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if len(batch_keys) > 1 and options.get("buffer.batched-flush.enabled"):
+                self._process_batch_incr(batch_keys)
+                return
+
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -637,39 +733,119 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
+            incr = self._load_incr(key, values)
+            if incr is not None:
+                self._base_process(*incr)
+        finally:
+            client.delete(lock_key)
 
-            model = import_string(force_str(values.pop("m")))
+    def _get_shard(self, key: str) -> str:
+        if is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            return str(self.cluster.get_router().get_host_for_key(key))
+        # The cluster client routes the commands of a pipeline to the right
+        # nodes itself
+        return "cluster"
 
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
+    def _process_batch_incr(self, keys: list[str]) -> None:
+        """
+        Flush a batch of keys at once: locks are acquired and released with
+        one round trip, the keys of each shard are drained in one pipeline,
+        and the resulting updates are processed together so that updates to
+        the same model can be coalesced.
+        """
+        lock_ex = 10
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            lock_pipe = self.cluster.pipeline(transaction=False)
+            for key in keys:
+                lock_pipe.set(self._make_lock_key(key), "1", nx=True, ex=lock_ex)
+            acquired = lock_pipe.execute()
+        else:
+            with self.cluster.map() as conn:
+                promises = [
+                    conn.set(self._make_lock_key(key), "1", nx=True, ex=lock_ex) for key in keys
+                ]
+            acquired = [promise.value for promise in promises]
+
+        locked_keys = []
+        for key, lock_acquired in zip(keys, acquired):
+            if lock_acquired:
+                locked_keys.append(key)
             else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._base_process(model, incr_values, filters, extra_values, signal_only)
+                metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        if not locked_keys:
+            return
+
+        try:
+            keys_by_shard: dict[str, list[str]] = {}
+            for key in locked_keys:
+                keys_by_shard.setdefault(self._get_shard(key), []).append(key)
+
+            incrs = []
+            for shard, shard_keys in keys_by_shard.items():
+                with metrics.timer("buffer.flush.drain", tags={"shard": shard}):
+                    pipe = self.get_redis_connection(shard_keys[0], transaction=False)
+                    for key in shard_keys:
+                        pipe.hgetall(key)
+                        pipe.zrem(self.pending_key, key)
+                        pipe.delete(key)
+                    results = pipe.execute()
+
+                for key, values in zip(shard_keys, results[::3]):
+                    incr = self._load_incr(key, values)
+                    if incr is not None:
+                        incrs.append(incr)
+
+                metrics.incr("buffer.flush.keys", amount=len(shard_keys), tags={"shard": shard})
+
+            metrics.distribution("buffer.flush.batch_size", len(incrs))
+            with metrics.timer("buffer.flush.process"):
+                Buffer.process_many(self, incrs)
         finally:
-            client.delete(lock_key)
+            if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                # A multi-key DELETE would be split into one command per key.
+                unlock_pipe = self.cluster.pipeline(transaction=False)
+                for key in locked_keys:
+                    unlock_pipe.delete(self._make_lock_key(key))
+                unlock_pipe.execute()
+            else:
+                with self.cluster.map() as conn:
+                    for key in locked_keys:
+                        conn.delete(self._make_lock_key(key))
+
+    def _load_incr(self, key: str, values: dict[Any, Any]) -> BufferedIncr | None:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(model, incr_values, filters, extra_values, signal_only)
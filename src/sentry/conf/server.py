@@ -1913,6 +1913,14 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# How long a worker may hold the lease on a Snuba query cache key while it runs
+# the query, and how long others wait for the cached result. 0 disables this.
+# When enabled, this should cover SENTRY_SNUBA_TIMEOUT, otherwise the waiting
+# workers give up on slow queries and run them anyway.
+SENTRY_SNUBA_CACHE_LEASE_SECONDS = 0
+# If set, query cache keys ignore differences in query datetimes within buckets
+# of this many seconds, so that queries for relative time ranges can hit.
+SENTRY_SNUBA_CACHE_TIME_BUCKET_SECONDS = 0
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -3415,7 +3423,9 @@ ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 
 
 # Default string indexer cache options
-SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
+# Set "local_cache_size" (and optionally "local_cache_ttl" in seconds) to keep
+# hot indexer entries in an in-process cache in front of "cache_name".
+SENTRY_STRING_INDEXER_CACHE_OPTIONS: dict[str, Any] = {
     "cache_name": "default",
 }
 SENTRY_POSTGRES_INDEXER_RETRY_COUNT = 2
@@ -424,6 +424,24 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
                 default=100,
                 help="The number of segments to download from redis at once. Defaults to 100.",
             ),
+            click.Option(
+                ["--flusher-processes", "flusher_processes"],
+                type=int,
+                default=1,
+                help="The maximum number of processes flushing segments. The assigned partitions are distributed across them. Defaults to 1.",
+            ),
+            click.Option(
+                ["--max-memory-percentage", "max_memory_percentage"],
+                type=float,
+                default=1.0,
+                help="Reject new spans while any Redis node of the span buffer uses more than this fraction of its maximum memory. Defaults to 1.0 (no limit).",
+            ),
+            click.Option(
+                ["--max-segment-bytes", "max_segment_bytes"],
+                type=int,
+                default=0,
+                help="The maximum total size of span payloads to flush for a single segment. Spans beyond this size are dropped. Defaults to 0 (no limit).",
+            ),
             *multiprocessing_options(default_max_batch_size=100),
         ],
     },
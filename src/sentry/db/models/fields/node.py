@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import pickle
 from base64 import b64encode
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, MutableMapping, Sequence
 from typing import Any
 from uuid import uuid4
 
@@ -133,10 +133,35 @@ class NodeData(MutableMapping[str, Any]):
             See documentation of nodestore.
         """
 
+        subkeys = self._get_subkeys_to_save(subkeys)
+        if subkeys is None:
+            return
+
+        nodestore.backend.set_subkeys(self.id, subkeys)
+
+    @staticmethod
+    def save_many(nodes: Sequence[tuple[NodeData, dict[str | None, Any] | None]]) -> None:
+        """
+        Write the current data of multiple nodes back to nodestore in a single
+        batch. Each node is paired with its subkeys, as they'd be passed to
+        `save`.
+        """
+        items = {}
+        for node, subkeys in nodes:
+            to_save = node._get_subkeys_to_save(subkeys)
+            if to_save is not None:
+                items[node.id] = to_save
+
+        if items:
+            nodestore.backend.set_subkeys_multi(items)
+
+    def _get_subkeys_to_save(
+        self, subkeys: dict[str | None, Any] | None
+    ) -> dict[str | None, Any] | None:
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -146,8 +171,7 @@ class NodeData(MutableMapping[str, Any]):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.backend.set_subkeys(self.id, subkeys)
+        return subkeys
 
 
 class NodeField(GzippedDictField):
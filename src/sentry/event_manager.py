@@ -31,6 +31,7 @@ from sentry import (
     tsdb,
 )
 from sentry.attachments import CachedAttachment, MissingAttachmentChunks, attachment_cache
+from sentry.buffer.base import BufferedIncr
 from sentry.constants import (
     DEFAULT_STORE_NORMALIZER_ARGS,
     INSIGHT_MODULE_FILTERS,
@@ -41,6 +42,7 @@ from sentry.constants import (
     InsightModules,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.dynamic_sampling import record_latest_release
 from sentry.eventstore.processing import event_processing_store
 from sentry.eventstream.base import GroupState
@@ -56,6 +58,7 @@ from sentry.grouping.api import (
 from sentry.grouping.grouptype import ErrorGroupType
 from sentry.grouping.ingest.config import is_in_transition, update_grouping_config_if_needed
 from sentry.grouping.ingest.hashing import (
+    bulk_get_or_create_grouphashes,
     find_grouphash_with_group,
     get_or_create_grouphashes,
     maybe_run_background_grouping,
@@ -116,7 +119,7 @@ from sentry.signals import (
     first_event_with_minified_stack_trace_received,
     issue_unresolved,
 )
-from sentry.tasks.process_buffer import buffer_incr
+from sentry.tasks.process_buffer import buffer_incr, buffer_incr_many
 from sentry.tsdb.base import TSDBModel
 from sentry.types.activity import ActivityType
 from sentry.types.group import GroupSubStatus, PriorityLevel
@@ -524,6 +527,7 @@ class EventManager:
             attachments = []
 
         try:
+            _get_or_create_primary_grouphashes_many(jobs, metric_tags)
             group_info = assign_event_to_group(event=job["event"], job=job, metric_tags=metric_tags)
 
         except HashDiscarded:
@@ -537,10 +541,15 @@ class EventManager:
         # XXX(markus): No clue what this does
         job["event"].data.bind_ref(job["event"])
 
-        _get_or_create_environment_many(jobs, projects)
-        _get_or_create_group_environment_many(jobs)
-        _get_or_create_release_associated_models(jobs, projects)
-        _increment_release_associated_counts_many(jobs, projects)
+        try:
+            _get_or_create_environment_many(jobs, projects)
+            _get_or_create_group_environment_many(jobs)
+            _get_or_create_release_associated_models(jobs, projects)
+            _buffer_release_associated_counts_many(jobs, projects)
+        finally:
+            # The event is already assigned to its group, so its buffered
+            # increments must be applied even if the steps above fail
+            _apply_buffered_incrs_many(jobs)
         _get_or_create_group_release_many(jobs)
         _tsdb_record_all_metrics(jobs)
 
@@ -868,23 +877,43 @@ def _get_or_create_release_associated_models(
         )
 
 
-def _increment_release_associated_counts_many(
+def _buffer_release_associated_counts_many(
     jobs: Sequence[Job], projects: ProjectsMapping
 ) -> None:
     for job in jobs:
-        _increment_release_associated_counts(
-            projects[job["project_id"]], job["environment"], job["release"], job["groups"]
+        job.setdefault("buffered_incrs", []).extend(
+            _get_release_associated_count_incrs(
+                projects[job["project_id"]], job["environment"], job["release"], job["groups"]
+            )
         )
 
 
+def _apply_buffered_incrs_many(jobs: Sequence[Job]) -> None:
+    incrs: list[BufferedIncr] = []
+    for job in jobs:
+        incrs.extend(job.pop("buffered_incrs", ()))
+
+    # Apply the increments of all events at once
+    buffer_incr_many(incrs)
+
+
 def _increment_release_associated_counts(
     project: Project,
     environment: Environment,
     release: Release | None,
     groups: Sequence[GroupInfo],
 ) -> None:
+    buffer_incr_many(_get_release_associated_count_incrs(project, environment, release, groups))
+
+
+def _get_release_associated_count_incrs(
+    project: Project,
+    environment: Environment,
+    release: Release | None,
+    groups: Sequence[GroupInfo],
+) -> list[BufferedIncr]:
     if not release:
-        return
+        return []
 
     rp_new_groups = 0
     rpe_new_groups = 0
@@ -893,22 +922,28 @@ def _increment_release_associated_counts(
             rp_new_groups += 1
         if group_info.is_new_group_environment:
             rpe_new_groups += 1
+    incrs = []
     if rp_new_groups:
-        buffer_incr(
-            ReleaseProject,
-            {"new_groups": rp_new_groups},
-            {"release_id": release.id, "project_id": project.id},
+        incrs.append(
+            BufferedIncr(
+                ReleaseProject,
+                {"new_groups": rp_new_groups},
+                {"release_id": release.id, "project_id": project.id},
+            )
         )
     if rpe_new_groups:
-        buffer_incr(
-            ReleaseProjectEnvironment,
-            {"new_issues_count": rpe_new_groups},
-            {
-                "project_id": project.id,
-                "release_id": release.id,
-                "environment_id": environment.id,
-            },
+        incrs.append(
+            BufferedIncr(
+                ReleaseProjectEnvironment,
+                {"new_issues_count": rpe_new_groups},
+                {
+                    "project_id": project.id,
+                    "release_id": release.id,
+                    "environment_id": environment.id,
+                },
+            )
         )
+    return incrs
 
 
 def _get_or_create_group_release_many(jobs: Sequence[Job]) -> None:
@@ -994,6 +1029,7 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
     inserted_time = datetime.now(timezone.utc).timestamp()
+    nodes_to_save = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1020,7 +1056,10 @@ def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
                 usage_type=UsageUnit.BYTES,
             )
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        nodes_to_save.append((job["event"].data, subkeys))
+
+    # Write all of the events to nodestore in a single batch
+    NodeData.save_many(nodes_to_save)
 
 
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
@@ -1192,6 +1231,53 @@ def get_culprit(data: Mapping[str, Any]) -> str:
     )
 
 
+@sentry_sdk.tracing.trace
+def _get_or_create_primary_grouphashes_many(jobs: Sequence[Job], metric_tags: MutableTags) -> None:
+    """
+    Calculate the primary hashes for every job's event and resolve the corresponding `GroupHash`
+    records with a single bulk lookup per project, rather than one round trip per hash.
+
+    The result is stored on each job as `primary_grouphash_info`, where `assign_event_to_group`
+    picks it up instead of recalculating it.
+    """
+    calculated_hashes = []
+    projects: dict[int, Project] = {}
+    hashes_by_project: dict[int, set[str]] = {}
+
+    for job in jobs:
+        project = job["event"].project
+        grouping_config, hashes, variants = run_primary_grouping(project, job, metric_tags)
+        calculated_hashes.append((job, grouping_config, hashes, variants))
+        projects[project.id] = project
+        hashes_by_project.setdefault(project.id, set()).update(hashes)
+
+    grouphashes_by_project = {
+        project_id: bulk_get_or_create_grouphashes(projects[project_id], hashes)
+        for project_id, hashes in hashes_by_project.items()
+    }
+
+    for job, grouping_config, hashes, variants in calculated_hashes:
+        if not hashes:
+            job["primary_grouphash_info"] = NULL_GROUPHASH_INFO
+            continue
+
+        event = job["event"]
+        grouphashes = get_or_create_grouphashes(
+            event,
+            event.project,
+            variants,
+            hashes,
+            grouping_config["id"],
+            prefetched_grouphashes=grouphashes_by_project[event.project.id],
+        )
+        # Finding the existing grouphash is left to `assign_event_to_group`, both because it can
+        # raise `HashDiscarded` and because an earlier event in the batch may link a group to one
+        # of these grouphashes in the meantime.
+        job["primary_grouphash_info"] = GroupHashInfo(
+            grouping_config, variants, hashes, grouphashes, None
+        )
+
+
 @sentry_sdk.tracing.trace
 def assign_event_to_group(
     event: Event,
@@ -1201,8 +1287,13 @@ def assign_event_to_group(
     project = event.project
     secondary = NULL_GROUPHASH_INFO
 
-    # Try looking for an existing group using the current grouping config
-    primary = get_hashes_and_grouphashes(job, run_primary_grouping, metric_tags)
+    # Try looking for an existing group using the current grouping config (reusing the hashes and
+    # grouphashes from `_get_or_create_primary_grouphashes_many` if they've already been resolved)
+    primary = job.pop("primary_grouphash_info", None)
+    if primary is None:
+        primary = get_hashes_and_grouphashes(job, run_primary_grouping, metric_tags)
+    elif primary.grouphashes:
+        primary.existing_grouphash = find_grouphash_with_group(primary.grouphashes)
 
     # If we've found one, great. No need to do any more calculations
     if primary.existing_grouphash:
@@ -1254,6 +1345,17 @@ def assign_event_to_group(
     # something we've ever observed, but theoretically possible.
     if group_info:
         event.group = group_info.group
+
+        # Grouphash records are shared between the events of a batch (see
+        # `_get_or_create_primary_grouphashes_many`), so make sure the events which follow this one
+        # see the group we've just linked, rather than trying to create another one
+        for grouphash in primary.grouphashes:
+            if (
+                grouphash.group_id is None
+                and grouphash.state != GroupHash.State.LOCKED_IN_MIGRATION
+            ):
+                grouphash.group_id = group_info.group.id
+
     job["groups"] = [group_info]
 
     return group_info
@@ -1343,6 +1445,7 @@ def handle_existing_grouphash(
         event=job["event"],
         incoming_group_values=_get_group_processing_kwargs(job),
         release=job["release"],
+        buffered_incrs=job.setdefault("buffered_incrs", []),
     )
 
     return GroupInfo(group=group, is_new=False, is_regression=is_regression)
@@ -1775,7 +1878,13 @@ def _process_existing_aggregate(
     event: BaseEvent,
     incoming_group_values: Mapping[str, Any],
     release: Release | None,
+    buffered_incrs: list[BufferedIncr] | None = None,
 ) -> bool:
+    """
+    If `buffered_incrs` is given, the increment of the group's `times_seen` is
+    appended to it instead of being applied, so that the caller can apply it
+    together with the event's other buffer increments.
+    """
     last_seen = max(event.datetime, group.last_seen)
     updated_group_values: dict[str, Any] = {"last_seen": last_seen}
     # Unclear why this is necessary, given that it's also in `updated_group_values`, but removing
@@ -1828,7 +1937,12 @@ def _process_existing_aggregate(
 
     # We pass `times_seen` separately from all of the other columns so that `buffer_inr` knows to
     # increment rather than overwrite the existing value
-    buffer_incr(Group, {"times_seen": 1}, {"id": group.id}, updated_group_values)
+    if buffered_incrs is not None:
+        buffered_incrs.append(
+            BufferedIncr(Group, {"times_seen": 1}, {"id": group.id}, updated_group_values)
+        )
+    else:
+        buffer_incr(Group, {"times_seen": 1}, {"id": group.id}, updated_group_values)
 
     return bool(is_regression)
 
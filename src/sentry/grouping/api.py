@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import re
+import threading
 from collections.abc import MutableMapping, Sequence
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
 import sentry_sdk
+from cachetools import LRUCache
 
 from sentry import options
 from sentry.db.models.fields.node import NodeData
@@ -39,6 +41,7 @@ from sentry.grouping.variants import (
 )
 from sentry.issues.auto_source_code_config.constants import DERIVED_ENHANCEMENTS_OPTION_KEY
 from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
 
 if TYPE_CHECKING:
     from sentry.eventstore.models import Event
@@ -48,6 +51,14 @@ if TYPE_CHECKING:
 
 HASH_RE = re.compile(r"^[0-9a-f]{32}$")
 
+# Parsed fingerprinting rules (along with their lazily-built `CompiledFingerprintingRules` index),
+# keyed by project, the hash of the project's custom rules, and the built-in bases, so that neither
+# parsing nor compiling the rules happens on every event
+_fingerprinting_rules_cache: LRUCache[tuple[int, str, tuple[str, ...]], FingerprintingRules] = (
+    LRUCache(maxsize=1000)
+)
+_fingerprinting_rules_cache_lock = threading.Lock()
+
 
 class FingerprintInfo(TypedDict):
     client_fingerprint: NotRequired[list[str]]
@@ -243,17 +254,38 @@ def get_fingerprinting_config_for_project(
     Merges the project's custom fingerprinting rules (if any) with the default built-in rules.
     """
 
-    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+    from sentry.grouping.fingerprinting import FingerprintingRules
+    from sentry.utils.hashlib import md5_text
 
     bases = get_projects_default_fingerprinting_bases(project, config_id=config_id)
     raw_rules = project.get_option("sentry:fingerprinting_rules")
+    rules_hash = md5_text(raw_rules).hexdigest() if raw_rules else ""
+
+    local_cache_key = (project.id, rules_hash, tuple(bases or ()))
+    with _fingerprinting_rules_cache_lock:
+        rules = _fingerprinting_rules_cache.get(local_cache_key)
+    if rules is not None:
+        metrics.incr("grouping.fingerprinting_rules.local_cache", tags={"result": "hit"})
+        return rules
+    metrics.incr("grouping.fingerprinting_rules.local_cache", tags={"result": "miss"})
+
     if not raw_rules:
-        return FingerprintingRules([], bases=bases)
+        rules = FingerprintingRules([], bases=bases)
+    else:
+        rules = _get_fingerprinting_rules_from_raw_rules(raw_rules, rules_hash, bases)
+
+    with _fingerprinting_rules_cache_lock:
+        _fingerprinting_rules_cache[local_cache_key] = rules
+    return rules
+
 
+def _get_fingerprinting_rules_from_raw_rules(
+    raw_rules: str, rules_hash: str, bases: Sequence[str] | None
+) -> FingerprintingRules:
+    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
     from sentry.utils.cache import cache
-    from sentry.utils.hashlib import md5_text
 
-    cache_key = "fingerprinting-rules:" + md5_text(raw_rules).hexdigest()
+    cache_key = "fingerprinting-rules:" + rules_hash
     config_json = cache.get(cache_key)
     if config_json is not None:
         return FingerprintingRules.from_json(config_json, bases=bases)
@@ -3,16 +3,18 @@ from __future__ import annotations
 import base64
 import logging
 import os
+import threading
 import zlib
 from collections import Counter
 from collections.abc import Sequence
 from functools import cached_property
 from random import random
-from typing import Any, Literal
+from typing import Any, Literal, NamedTuple
 
 import msgpack
 import sentry_sdk
 import zstandard
+from cachetools import LRUCache
 from sentry_ophio.enhancers import AssembleResult as RustStacktraceResult
 from sentry_ophio.enhancers import Cache as RustCache
 from sentry_ophio.enhancers import Component as RustFrame
@@ -23,6 +25,7 @@ from sentry.grouping.component import FrameGroupingComponent, StacktraceGrouping
 from sentry.models.project import Project
 from sentry.stacktraces.functions import set_in_app
 from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
 from sentry.utils.safe import get_path, set_path
 
 from .exceptions import InvalidEnhancerConfig
@@ -36,6 +39,15 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Results of applying enhancements to stacktraces, keyed by the enhancements, the frames (in the
+# form the rust enhancer matches against), and the exception data, which together fully determine
+# the results. During a crash storm the same stacktrace shows up over and over again, so this lets
+# us skip re-running the rules. Sized by the total number of frames stored.
+ENHANCEMENT_RESULTS_CACHE: LRUCache[tuple[Any, ...], tuple[Any, ...]] = LRUCache(
+    maxsize=100_000, getsizeof=lambda results: len(results[0])
+)
+ENHANCEMENT_RESULTS_CACHE_LOCK = threading.Lock()
+
 # TODO: Move 3 to the end when we're ready for it to be the default
 VERSIONS = [
     3,  # Enhancements with this version run the split enhancements experiment
@@ -137,6 +149,41 @@ def make_rust_exception_data(
     )
 
 
+class CachedRustFrame(NamedTuple):
+    """Stand-in for a `RustFrame` whose `contributes` and `hint` values came from the cache"""
+
+    contributes: bool | None
+    hint: str | None
+
+
+class CachedRustStacktraceResult(NamedTuple):
+    """Stand-in for a `RustStacktraceResult` which came from the cache"""
+
+    contributes: bool | None
+    hint: str | None
+
+
+def _get_cached_enhancement_results(cache_key: tuple[Any, ...]) -> tuple[Any, ...] | None:
+    with ENHANCEMENT_RESULTS_CACHE_LOCK:
+        results = ENHANCEMENT_RESULTS_CACHE.get(cache_key)
+
+    metrics.incr(
+        "grouping.enhancements.results_cache",
+        tags={"operation": cache_key[0], "result": "hit" if results is not None else "miss"},
+        sample_rate=0.01,
+    )
+    return results
+
+
+def _set_cached_enhancement_results(cache_key: tuple[Any, ...], results: tuple[Any, ...]) -> None:
+    with ENHANCEMENT_RESULTS_CACHE_LOCK:
+        try:
+            ENHANCEMENT_RESULTS_CACHE[cache_key] = results
+        except ValueError:
+            # The stacktrace alone is bigger than the entire cache
+            pass
+
+
 def _can_use_hint(
     variant_name: str,
     frame_component: FrameGroupingComponent,
@@ -463,11 +510,24 @@ class Enhancements:
         match_frames: list[Any] = [create_match_frame(frame, platform) for frame in frames]
         rust_exception_data = make_rust_exception_data(exception_data)
 
+        cache_key = self._get_results_cache_key(
+            "get_in_app", match_frames, rust_exception_data, platform
+        )
+        cached_results = _get_cached_enhancement_results(cache_key) if cache_key else None
+
         with metrics.timer("grouping.enhancements.get_in_app") as metrics_timer_tags:
             metrics_timer_tags["split"] = False
-            category_and_in_app_results = self.rust_enhancements.apply_modifications_to_frames(
-                match_frames, rust_exception_data
-            )
+            metrics_timer_tags["cached"] = cached_results is not None
+            if cached_results is not None:
+                (category_and_in_app_results,) = cached_results
+            else:
+                category_and_in_app_results = self.rust_enhancements.apply_modifications_to_frames(
+                    match_frames, rust_exception_data
+                )
+                if cache_key:
+                    _set_cached_enhancement_results(
+                        cache_key, (tuple(category_and_in_app_results),)
+                    )
 
         if self.run_split_enhancements:
             with metrics.timer("grouping.enhancements.get_in_app") as metrics_timer_tags:
@@ -532,16 +592,48 @@ class Enhancements:
             # TODO: Fix this type to list[MatchFrame] once it's fixed in ophio
             match_frames: list[Any] = [create_match_frame(frame, platform) for frame in frames]
 
-            rust_frames = [RustFrame(contributes=c.contributes) for c in frame_components]
             rust_exception_data = make_rust_exception_data(exception_data)
 
-            # Modify the rust frames by applying +group/-group rules and getting hints for both those
-            # changes and the `in_app` changes applied by earlier in the ingestion process by
-            # `apply_category_and_updated_in_app_to_frames`. Also, get `hint` and `contributes` values
-            # for the overall stacktrace (returned in `rust_results`).
-            rust_stacktrace_results = self.rust_enhancements.assemble_stacktrace_component(
-                match_frames, rust_exception_data, rust_frames
+            # The incoming `contributes` values are an input to the rules, so they're part of the key
+            cache_key = self._get_results_cache_key(
+                "get_contributes_and_hint",
+                match_frames,
+                rust_exception_data,
+                platform,
+                tuple(c.contributes for c in frame_components),
             )
+            cached_results = _get_cached_enhancement_results(cache_key) if cache_key else None
+            metrics_timer_tags["cached"] = cached_results is not None
+
+            rust_frames: list[Any]
+            rust_stacktrace_results: RustStacktraceResult | CachedRustStacktraceResult
+            if cached_results is not None:
+                cached_frame_results, rust_stacktrace_results = cached_results
+                rust_frames = list(cached_frame_results)
+            else:
+                rust_frames = [RustFrame(contributes=c.contributes) for c in frame_components]
+
+                # Modify the rust frames by applying +group/-group rules and getting hints for both
+                # those changes and the `in_app` changes applied by earlier in the ingestion process
+                # by `apply_category_and_updated_in_app_to_frames`. Also, get `hint` and
+                # `contributes` values for the overall stacktrace (returned in `rust_results`).
+                rust_stacktrace_results = self.rust_enhancements.assemble_stacktrace_component(
+                    match_frames, rust_exception_data, rust_frames
+                )
+
+                if cache_key:
+                    _set_cached_enhancement_results(
+                        cache_key,
+                        (
+                            tuple(
+                                CachedRustFrame(rust_frame.contributes, rust_frame.hint)
+                                for rust_frame in rust_frames
+                            ),
+                            CachedRustStacktraceResult(
+                                rust_stacktrace_results.contributes, rust_stacktrace_results.hint
+                            ),
+                        ),
+                    )
 
         if self.run_split_enhancements:
             with metrics.timer(
@@ -692,6 +784,38 @@ class Enhancements:
 
         return stacktrace_component
 
+    @cached_property
+    def results_cache_key(self) -> str:
+        """Identifies these enhancements in `ENHANCEMENT_RESULTS_CACHE` keys"""
+        return md5_text(self.base64_string).hexdigest()
+
+    def _get_results_cache_key(
+        self,
+        operation: str,
+        match_frames: list[Any],
+        rust_exception_data: RustExceptionData,
+        platform: str | None,
+        *extra: Any,
+    ) -> tuple[Any, ...] | None:
+        """
+        Build the key under which the results of running the given operation on the given frames are
+        cached, or return None if the results shouldn't be cached.
+        """
+        # The split enhancements experiment compares results as it goes, so always run it for real
+        if self.run_split_enhancements or not match_frames:
+            return None
+        if not options.get("grouping.enhancements.results_cache_enabled"):
+            return None
+
+        return (
+            operation,
+            self.results_cache_key,
+            platform,
+            tuple(tuple(match_frame.values()) for match_frame in match_frames),
+            tuple(rust_exception_data.values()),
+            *extra,
+        )
+
     def _to_config_structure(self) -> list[Any]:
         # TODO: Can we switch this to a tuple so we can type it more exactly?
         return [
@@ -752,7 +876,11 @@ class Enhancements:
                     {"split": config_structure[0] == 3, "source": "base64_string"}
                 )
 
-                return cls._from_config_structure(config_structure, rust_enhancements)
+                enhancements = cls._from_config_structure(config_structure, rust_enhancements)
+                # The incoming string already identifies the rules, so there's no need to
+                # re-serialize them in order to key the results cache
+                enhancements.results_cache_key = md5_text(bytes_str).hexdigest()
+                return enhancements
 
             except (LookupError, AttributeError, TypeError, ValueError) as e:
                 raise ValueError("invalid stack trace rule config: %s" % e)
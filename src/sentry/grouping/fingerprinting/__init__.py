@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import inspect
 import logging
-from collections.abc import Generator, Mapping, Sequence
+from collections.abc import Generator, Iterator, Mapping, Sequence
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple, NotRequired, Self, TypedDict, TypeVar
 
@@ -32,6 +33,14 @@ VERSION = 1
 
 CONFIGS_DIR: Path = Path(__file__).with_name("configs")
 
+# Characters which give a pattern glob semantics. A pattern containing none of them can only ever
+# match a value equal to it.
+GLOB_SPECIAL_CHARS = frozenset("*?[]{}\\")
+
+# Keys whose values are matched case-sensitively and without path normalization, meaning a literal
+# pattern on one of them is a plain equality check. (Tags are matched the same way.)
+EXACT_MATCH_KEYS = frozenset(["type", "module", "function"])
+
 # Grammar is defined in EBNF syntax.
 fingerprinting_grammar = Grammar(
     r"""
@@ -273,13 +282,17 @@ class FingerprintingRules:
                 base_rules = FINGERPRINTING_BASES.get(base, [])
                 yield from base_rules
 
+    @cached_property
+    def compiled(self) -> CompiledFingerprintingRules:
+        return CompiledFingerprintingRules(list(self.iter_rules()))
+
     def get_fingerprint_values_for_event(
         self, event: Mapping[str, object]
     ) -> None | FingerprintRuleMatch:
         if not (self.bases or self.rules):
             return None
         event_datastore = EventDatastore(event)
-        for rule in self.iter_rules():
+        for rule in self.compiled.iter_candidate_rules(event_datastore):
             match = rule.test_for_match_with_event(event_datastore)
             if match is not None:
                 return FingerprintRuleMatch(rule, match.fingerprint, match.attributes)
@@ -416,6 +429,20 @@ class FingerprintMatcher:
             return "release"
         return "frames"
 
+    @property
+    def literal_pattern(self) -> str | None:
+        """
+        The pattern, if this matcher can only ever match event values exactly equal to it, or None
+        if matching requires negation, glob or path semantics, or case folding.
+        """
+        if self.negated:
+            return None
+        if self.key not in EXACT_MATCH_KEYS and not self.key.startswith("tags."):
+            return None
+        if GLOB_SPECIAL_CHARS.intersection(self.pattern):
+            return None
+        return self.pattern
+
     def matches(self, event_values: dict[str, Any]) -> bool:
         match_found = self._positive_match(event_values)
         return not match_found if self.negated else match_found
@@ -505,14 +532,28 @@ class FingerprintRule:
         self.attributes = attributes
         self.is_builtin = is_builtin
 
-    def test_for_match_with_event(
-        self, event_datastore: EventDatastore
-    ) -> None | FingerprintWithAttributes:
+    @cached_property
+    def matchers_by_match_type(self) -> dict[str, list[FingerprintMatcher]]:
         matchers_by_match_type: dict[str, list[FingerprintMatcher]] = {}
         for matcher in self.matchers:
             matchers_by_match_type.setdefault(matcher.match_type, []).append(matcher)
+        return matchers_by_match_type
+
+    @cached_property
+    def literal_requirement(self) -> FingerprintMatcher | None:
+        """
+        A matcher which only matches one exact value, if the rule has one. The rule can't match any
+        event which doesn't contain that value, which lets `CompiledFingerprintingRules` skip it.
+        """
+        for matcher in self.matchers:
+            if matcher.literal_pattern is not None:
+                return matcher
+        return None
 
-        for match_type, matchers in matchers_by_match_type.items():
+    def test_for_match_with_event(
+        self, event_datastore: EventDatastore
+    ) -> None | FingerprintWithAttributes:
+        for match_type, matchers in self.matchers_by_match_type.items():
             for event_values in event_datastore.get_values(match_type):
                 if all(matcher.matches(event_values) for matcher in matchers):
                     break
@@ -562,6 +603,53 @@ class FingerprintRule:
         ).rstrip()
 
 
+class CompiledFingerprintingRules:
+    """
+    An index over an ordered list of fingerprinting rules, used to avoid testing every rule against
+    every event.
+
+    Rules which require an exact value for some key (`function:main`, `type:ValueError`,
+    `tags.server_name:web-1`, and the like) are indexed by that key and value, so that for a given
+    event only the rules whose required value actually appears in the event, plus the rules which
+    can't be indexed, get tested. Candidates are always returned in the original rule order, so the
+    first matching rule wins just as it would without the index.
+    """
+
+    def __init__(self, rules: Sequence[FingerprintRule]) -> None:
+        self.rules = rules
+        self.unindexed_rule_indices: list[int] = []
+        # key -> value -> indices of the rules requiring that value
+        self.rule_indices_by_literal: dict[str, dict[str, list[int]]] = {}
+        self.match_types_by_key: dict[str, str] = {}
+
+        for index, rule in enumerate(rules):
+            matcher = rule.literal_requirement
+            pattern = matcher.literal_pattern if matcher else None
+            if matcher is None or pattern is None:
+                self.unindexed_rule_indices.append(index)
+                continue
+
+            rule_indices_by_value = self.rule_indices_by_literal.setdefault(matcher.key, {})
+            rule_indices_by_value.setdefault(pattern, []).append(index)
+            self.match_types_by_key[matcher.key] = matcher.match_type
+
+    def iter_candidate_rules(self, event_datastore: EventDatastore) -> Iterator[FingerprintRule]:
+        if not self.rule_indices_by_literal:
+            yield from self.rules
+            return
+
+        candidate_indices = set(self.unindexed_rule_indices)
+
+        for key, rule_indices_by_value in self.rule_indices_by_literal.items():
+            event_values = event_datastore.get_values(self.match_types_by_key[key])
+            for value in {values.get(key) for values in event_values}:
+                if value is not None:
+                    candidate_indices.update(rule_indices_by_value.get(value, ()))
+
+        for index in sorted(candidate_indices):
+            yield self.rules[index]
+
+
 class FingerprintingVisitor(NodeVisitorBase):
     visit_empty = lambda *a: None
     unwrapped_exceptions = (InvalidFingerprintingConfig,)
@@ -209,13 +209,63 @@ def find_grouphash_with_group(
     return None
 
 
+def bulk_get_or_create_grouphashes(
+    project: Project, hashes: Iterable[str]
+) -> dict[str, tuple[GroupHash, bool]]:
+    """
+    Fetch the `GroupHash` records for all of the given hash values with a single query, creating
+    any which don't yet exist with a single bulk insert.
+
+    Returns a mapping of hash value to a tuple of the corresponding grouphash and whether or not it
+    was created by this call.
+    """
+    hash_values = set(hashes)
+    if not hash_values:
+        return {}
+
+    grouphashes_by_hash: dict[str, tuple[GroupHash, bool]] = {
+        grouphash.hash: (grouphash, False)
+        for grouphash in GroupHash.objects.filter(
+            project=project, hash__in=hash_values
+        ).select_related("_metadata")
+    }
+
+    missing_hashes = hash_values - grouphashes_by_hash.keys()
+    if missing_hashes:
+        GroupHash.objects.bulk_create(
+            [GroupHash(project=project, hash=hash_value) for hash_value in missing_hashes],
+            ignore_conflicts=True,
+        )
+        # With `ignore_conflicts`, the created objects don't get their ids populated, and some of
+        # the rows may have been inserted by a concurrent process, so read them back. Either way,
+        # they didn't exist when we looked, so we treat them as new (the metadata handling guards
+        # against the race on its own).
+        for grouphash in GroupHash.objects.filter(
+            project=project, hash__in=missing_hashes
+        ).select_related("_metadata"):
+            grouphashes_by_hash[grouphash.hash] = (grouphash, True)
+
+    metrics.distribution("grouping.grouphashes.bulk_lookup_size", len(hash_values))
+    metrics.distribution("grouping.grouphashes.bulk_created", len(missing_hashes))
+
+    return grouphashes_by_hash
+
+
 def get_or_create_grouphashes(
     event: Event,
     project: Project,
     variants: dict[str, BaseVariant],
     hashes: Iterable[str],
     grouping_config: str,
+    prefetched_grouphashes: dict[str, tuple[GroupHash, bool]] | None = None,
 ) -> list[GroupHash]:
+    """
+    Get or create the `GroupHash` records for the given hashes, in the same order as the hashes.
+
+    If `prefetched_grouphashes` (as returned by `bulk_get_or_create_grouphashes`) is passed, it's
+    used instead of querying the database. Entries are marked as no longer new once they've been
+    handled, so that other events in the same batch sharing a hash don't also treat it as new.
+    """
     is_secondary = grouping_config == project.get_option("sentry:secondary_grouping_config")
     grouphashes: list[GroupHash] = []
 
@@ -228,10 +278,16 @@ def get_or_create_grouphashes(
                 "hash", flat=True
             )
         )
-        hashes = filter(lambda hash_value: hash_value in existing_hashes, hashes)
+        hashes = [hash_value for hash_value in hashes if hash_value in existing_hashes]
+    else:
+        hashes = list(hashes)
+
+    if prefetched_grouphashes is None:
+        prefetched_grouphashes = bulk_get_or_create_grouphashes(project, hashes)
 
     for hash_value in hashes:
-        grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
+        grouphash, created = prefetched_grouphashes[hash_value]
+        prefetched_grouphashes[hash_value] = (grouphash, False)
 
         if should_handle_grouphash_metadata(project, created):
             try:
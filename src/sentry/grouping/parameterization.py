@@ -181,6 +181,76 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
 
+# Every one of the default patterns needs at least one of these characters in order to match, with
+# the exception of hashes and uuids made up entirely of the letters a-f, which always contain a run
+# of at least 8 such letters. Content containing neither (plain prose, mostly) can skip the regex.
+_REGEX_TRIGGER_CHARS = frozenset("0123456789@.:=")
+_HEX_LETTER_RUN_RE = re.compile(r"[a-fA-F]{8}")
+
+# Results for content longer than this aren't cached, since long messages are unlikely to repeat
+_MAX_CACHED_CONTENT_LENGTH = 1024
+
+
+def _could_match_default_regexes(content: str) -> bool:
+    return bool(
+        not _REGEX_TRIGGER_CHARS.isdisjoint(content) or _HEX_LETTER_RUN_RE.search(content)
+    )
+
+
+@lru_cache(maxsize=64)
+def _make_regex_from_patterns(pattern_keys: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Takes list of pattern keys and returns a compiled regex pattern that matches any of them.
+
+    @param pattern_keys: A list of keys to match in the _parameterization_regex_components dict.
+    @returns: A compiled regex pattern that matches any of the given keys.
+    @raises: KeyError on pattern key not in the _parameterization_regex_components dict
+
+    The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
+    so we can use newlines and indentation for better legibility in patterns above.
+    """
+
+    return re.compile(
+        rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
+    )
+
+
+def _parametrize_w_regex(
+    pattern_keys: tuple[str, ...], content: str
+) -> tuple[str, tuple[tuple[str, int], ...]]:
+    """
+    Replace all matches of the combined regex for the given pattern keys with placeholders.
+
+    @returns: The parameterized content, along with the number of replacements made for each key.
+    """
+    if not pattern_keys or not _could_match_default_regexes(content):
+        return content, ()
+
+    matches_counter: defaultdict[str, int] = defaultdict(int)
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        # Every pattern is wrapped in exactly one named group, which is always the last group to
+        # close, so `lastgroup` is the key of the matched pattern. For example, given the match
+        # `0x40000015`, this returns '<hex>' as a replacement for the original value in the string.
+        key = match.lastgroup
+        if key is None:
+            # Shouldn't happen, but fall back to looking through all the groups just in case
+            for key, value in match.groupdict().items():
+                if value is not None:
+                    break
+            else:
+                return ""
+        matches_counter[key] += 1
+        return f"<{key}>"
+
+    parameterized = _make_regex_from_patterns(pattern_keys).sub(_handle_regex_match, content)
+    return parameterized, tuple(matches_counter.items())
+
+
+# Messages from the same log statement tend to arrive over and over again, often with the same
+# values, so keep a bounded cache of already-parameterized content
+_parametrize_w_regex_cached = lru_cache(maxsize=4096)(_parametrize_w_regex)
+
 
 @dataclasses.dataclass
 class ParameterizationCallable:
@@ -245,6 +315,13 @@ class _UniqueId:
             token_str[0] == "<" and token_str[-1] == ">"
         ):  # Don't replace already-parameterized tokens
             return False
+        return _UniqueId._is_probably_uniq_id_by_token_ratio(token_str)
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _is_probably_uniq_id_by_token_ratio(token_str: str) -> bool:
+        # Tokenizing is by far the most expensive part of the check, and the same words show up in
+        # message after message, so the result is cached per token
         token_length_ratio = _UniqueId.num_tokens_from_string(token_str) / len(token_str)
         if (
             len(token_str) > _UniqueId.TOKEN_LENGTH_LONG
@@ -281,50 +358,36 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._regex_pattern_keys = tuple(regex_pattern_keys)
+        self._parameterization_regex = self._make_regex_from_patterns(self._regex_pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
 
     @staticmethod
     def _make_regex_from_patterns(pattern_keys: Sequence[str]) -> re.Pattern[str]:
-        """
-        Takes list of pattern keys and returns a compiled regex pattern that matches any of them.
-
-        @param pattern_keys: A list of keys to match in the _parameterization_regex_components dict.
-        @returns: A compiled regex pattern that matches any of the given keys.
-        @raises: KeyError on pattern key not in the _parameterization_regex_components dict
-
-        The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
-        so we can use newlines and indentation for better legibility in patterns above.
-        """
-
-        return re.compile(
-            rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
-        )
+        return _make_regex_from_patterns(tuple(pattern_keys))
 
     def parametrize_w_regex(self, content: str) -> str:
         """
         Replace all matches of the given regex in the content with a placeholder string.
 
+        Results for short content are cached across calls (and across `Parameterizer` instances
+        using the same pattern keys), with the match counts replayed into `matches_counter`.
+
         @param content: The string to replace matches in.
-        @param parameterization_regex: The compiled regex pattern to match.
-        @param match_callback: An optional callback function to call with the key of the matched pattern.
 
         @returns: The content with all matches replaced with placeholders.
         """
+        if len(content) > _MAX_CACHED_CONTENT_LENGTH:
+            parameterized, counts = _parametrize_w_regex(self._regex_pattern_keys, content)
+        else:
+            parameterized, counts = _parametrize_w_regex_cached(self._regex_pattern_keys, content)
 
-        def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+        for key, count in counts:
+            self.matches_counter[key] += count
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        return parameterized
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+import io
+import struct
+from collections.abc import Mapping, Sequence
 from datetime import datetime, timedelta
 from threading import local
-from typing import Any
+from typing import IO, Any
 
 import sentry_sdk
 from django.core.cache import BaseCache, InvalidCacheBackendError, caches
@@ -28,6 +30,86 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Nodes in the segmented format start with this magic, followed by a header
+# listing the key and length of each segment. The first byte can never start
+# a JSON or pickle payload, and the second one is the version of the format.
+SEGMENTED_MAGIC = b"\x00\x02"
+
+_SEGMENT_COUNT = struct.Struct(">H")
+_SEGMENT_KEY_LENGTH = struct.Struct(">H")
+_SEGMENT_LENGTH = struct.Struct(">I")
+
+
+def encode_segments(segments: Sequence[tuple[str | None, bytes]]) -> bytes:
+    """
+    Encode a node in the segmented format, where the default payload is the
+    segment with the `None` key:
+
+        magic | count (u16) | count * (key length (u16) | key | length (u32)) | segments
+
+    >>> encode_segments([(None, b'{"stacktrace":{}}'), ("unprocessed", b"{}")])
+    b'\x00\x02\x00\x02\x00\x00\x00\x00\x00\x11\x00\x0bunprocessed...{"stacktrace":{}}{}'
+    """
+    header = [SEGMENTED_MAGIC, _SEGMENT_COUNT.pack(len(segments))]
+    for key, segment in segments:
+        # Those keys should be statically known identifiers in the app, such as
+        # "unprocessed_event". There is really no reason to allow anything but
+        # ASCII here.
+        encoded_key = key.encode("ascii") if key is not None else b""
+        header.append(_SEGMENT_KEY_LENGTH.pack(len(encoded_key)))
+        header.append(encoded_key)
+        header.append(_SEGMENT_LENGTH.pack(len(segment)))
+
+    return b"".join(header + [segment for _, segment in segments])
+
+
+def _read_exactly(fileobj: IO[bytes], size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = fileobj.read(size)
+        if not chunk:
+            raise ValueError("Unexpected end of segmented node")
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def read_segment(fileobj: IO[bytes], subkey: str | None) -> bytes | None:
+    """
+    Read the segment of `subkey` from a node in the segmented format, whose
+    magic has already been read from `fileobj`. Only the header and the bytes
+    up to the end of the segment are read, and segments before the requested
+    one are skipped without being copied when `fileobj` is seekable.
+    """
+    wanted_key = subkey.encode("ascii") if subkey is not None else b""
+
+    (count,) = _SEGMENT_COUNT.unpack(_read_exactly(fileobj, _SEGMENT_COUNT.size))
+    offset = 0
+    found = None
+    for _ in range(count):
+        (key_length,) = _SEGMENT_KEY_LENGTH.unpack(
+            _read_exactly(fileobj, _SEGMENT_KEY_LENGTH.size)
+        )
+        key = _read_exactly(fileobj, key_length)
+        (length,) = _SEGMENT_LENGTH.unpack(_read_exactly(fileobj, _SEGMENT_LENGTH.size))
+        if key == wanted_key:
+            found = (offset, length)
+        elif found is None:
+            offset += length
+
+    if found is None:
+        return None
+
+    offset, length = found
+    if offset:
+        if fileobj.seekable():
+            fileobj.seek(offset, io.SEEK_CUR)
+        else:
+            _read_exactly(fileobj, offset)
+
+    return _read_exactly(fileobj, length)
+
 
 class NodeStorage(local, Service):
     """
@@ -72,7 +154,10 @@ class NodeStorage(local, Service):
         "get_multi",
         "set",
         "set_bytes",
+        "set_bytes_multi",
+        "set_multi",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -100,6 +185,12 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if value.startswith(SEGMENTED_MAGIC):
+            fileobj = io.BytesIO(value)
+            fileobj.seek(len(SEGMENTED_MAGIC))
+            segment = read_segment(fileobj, subkey)
+            return json_loads(segment) if segment is not None else None
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -130,6 +221,14 @@ class NodeStorage(local, Service):
     def _get_bytes(self, id: str) -> bytes | None:
         raise NotImplementedError
 
+    def _get_bytes_for_subkey(self, id: str, subkey: str | None) -> bytes | None:
+        """
+        Fetch the bytes required to decode `subkey` of a node. Backends that
+        support range reads can override this to only fetch the segment of
+        `subkey` from nodes in the segmented format.
+        """
+        return self._get_bytes(id)
+
     @metrics.wraps("nodestore.get.duration")
     def get(self, id: str, subkey: str | None = None) -> Any:
         """
@@ -147,7 +246,7 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            bytes_data = self._get_bytes_for_subkey(id, subkey)
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
@@ -215,7 +314,18 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        When the `nodestore.segmented-encoding.enabled` option is set, nodes
+        are instead encoded in the segmented format (see `encode_segments`),
+        which lets a single subkey be read without scanning the whole node.
         """
+        if options.get("nodestore.segmented-encoding.enabled"):
+            segments = [(None, json_dumps(data.pop(None)).encode("utf8"))]
+            for key, value in data.items():
+                if key is not None:
+                    segments.append((key, json_dumps(value).encode("utf8")))
+            return encode_segments(segments)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -234,6 +344,26 @@ class NodeStorage(local, Service):
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
 
+    def set_bytes_multi(self, items: dict[str, bytes], ttl: timedelta | None = None) -> None:
+        """
+        Set the raw bytes of multiple nodes at once.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_bytes_multi({'key1': b"{'foo': 'bar'}", 'key2': b"{'foo': 'baz'}"})
+        """
+        for data in items.values():
+            metrics.distribution("nodestore.set_bytes", len(data))
+        metrics.distribution("nodestore.set_bytes_multi.num_items", len(items))
+        return self._set_bytes_multi(items, ttl)
+
+    def _set_bytes_multi(self, items: dict[str, bytes], ttl: timedelta | None = None) -> None:
+        # This implementation can/should be overridden by backends which
+        # support batched writes.
+        for item_id, data in items.items():
+            self._set_bytes(item_id, data, ttl)
+
     def set(self, item_id: str, data: Mapping[str, Any], ttl: timedelta | None = None) -> None:
         """
         Set value for `item_id`. Note that this deletes existing subkeys for `item_id` as
@@ -267,6 +397,42 @@ class NodeStorage(local, Service):
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
 
+    def set_multi(self, items: dict[str, Mapping[str, Any]], ttl: timedelta | None = None) -> None:
+        """
+        Set values for multiple nodes at once. Like `set`, this deletes any
+        existing subkeys of those nodes.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        return self.set_subkeys_multi(
+            {item_id: {None: data} for item_id, data in items.items()}, ttl
+        )
+
+    @sentry_sdk.tracing.trace
+    def set_subkeys_multi(
+        self,
+        items: dict[str, dict[str | None, Mapping[str, Any]]],
+        ttl: timedelta | None = None,
+    ) -> None:
+        """
+        Set values and subkeys for multiple nodes at once, with a single
+        batched write to the backend and a single batched cache update.
+
+        >>> nodestore.set_subkeys_multi({
+        ...    'key1': {None: {'foo': 'bar'}, "reprocessing": {'foo': 'bam'}},
+        ...    'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        if not items:
+            return
+
+        cache_items = {item_id: data.get(None) for item_id, data in items.items()}
+        bytes_items = {item_id: self._encode(data) for item_id, data in items.items()}
+        self.set_bytes_multi(bytes_items, ttl=ttl)
+        # set cache only after encoding and write to nodestore has succeeded
+        if options.get("nodestore.set-subkeys.enable-set-cache-item"):
+            self._set_cache_items({item_id: data for item_id, data in cache_items.items() if data})
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
 
@@ -76,6 +76,10 @@ class BigtableNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         self.store.set(id, data, ttl)
 
+    @sentry_sdk.tracing.trace
+    def _set_bytes_multi(self, items: dict[str, bytes], ttl: timedelta | None = None) -> None:
+        self.store.set_many(list(items.items()), ttl)
+
     def delete(self, id: str) -> None:
         if self.skip_deletes:
             return
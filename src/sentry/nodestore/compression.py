@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import functools
+import io
+import zlib
+from collections.abc import Mapping, Sequence
+from typing import IO
+
+import zstandard
+
+from sentry.utils import metrics
+
+# Every zstd frame starts with this magic number, which is what tells new
+# payloads apart from legacy zlib streams (always starting with 0x78 for the
+# default window size) and from uncompressed JSON or pickle payloads.
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+CODECS = ("zlib", "zstd")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_dictionary(path: str) -> zstandard.ZstdCompressionDict:
+    with open(path, "rb") as f:
+        dictionary = zstandard.ZstdCompressionDict(f.read())
+
+    if not dictionary.dict_id():
+        # Frames only record the ID of the dictionary they were compressed
+        # with, which raw content dictionaries don't have. Without it we could
+        # not pick the right dictionary when decompressing.
+        raise ValueError(f"{path!r} is not a trained zstd dictionary")
+
+    return dictionary
+
+
+def train_dictionary(samples: Sequence[bytes], dict_size: int = 110 * 1024) -> bytes:
+    """
+    Train a zstd dictionary from a sample of encoded node payloads, for
+    example the default payloads of recent events of a single platform.
+
+    The returned bytes can be written to a file and configured through the
+    `compression_dictionaries` option of the nodestore backend.
+    """
+    return zstandard.train_dictionary(dict_size, list(samples)).as_bytes()
+
+
+class NodeCompressor:
+    """
+    Compresses and decompresses node payloads.
+
+    Compressed payloads are self-describing: zstd frames carry the ID of the
+    dictionary they were compressed with, if any. Decompression therefore
+    never depends on how the compressor is currently configured, and nodes
+    written with older codecs or dictionaries (including zlib-compressed
+    nodes) stay readable as long as their dictionary is still configured.
+
+    :param codec: The codec used to compress new payloads, either "zlib" or
+        "zstd".
+    :param level: The zstd compression level.
+    :param dictionaries: A mapping of platform name to the path of a trained
+        zstd dictionary. Payloads of events of that platform are compressed
+        with the dictionary when using zstd.
+    """
+
+    def __init__(
+        self,
+        codec: str = "zlib",
+        level: int = 3,
+        dictionaries: Mapping[str, str] | None = None,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f'"codec" must be one of {CODECS!r}')
+
+        self.codec = codec
+        self.level = level
+
+        self._dictionaries = {
+            platform: _load_dictionary(path) for platform, path in (dictionaries or {}).items()
+        }
+        self._dictionaries_by_id = {
+            dictionary.dict_id(): dictionary for dictionary in self._dictionaries.values()
+        }
+
+        # Compression contexts are reused across calls, which is safe because
+        # nodestore backends are thread-local.
+        self._compressors: dict[str | None, zstandard.ZstdCompressor] = {}
+        self._decompressors: dict[int, zstandard.ZstdDecompressor] = {}
+
+    def _get_compressor(self, platform: str | None) -> zstandard.ZstdCompressor:
+        compressor = self._compressors.get(platform)
+        if compressor is None:
+            dictionary = self._dictionaries.get(platform) if platform else None
+            compressor = self._compressors[platform] = zstandard.ZstdCompressor(
+                level=self.level, dict_data=dictionary
+            )
+        return compressor
+
+    def _get_decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id:
+                try:
+                    dictionary = self._dictionaries_by_id[dict_id]
+                except KeyError:
+                    raise ValueError(f"Unknown zstd dictionary: {dict_id}")
+            else:
+                dictionary = None
+            decompressor = self._decompressors[dict_id] = zstandard.ZstdDecompressor(
+                dict_data=dictionary
+            )
+        return decompressor
+
+    def compress(self, data: bytes, platform: str | None = None) -> bytes:
+        if self.codec == "zstd":
+            if platform not in self._dictionaries:
+                platform = None
+            rv = self._get_compressor(platform).compress(data)
+        else:
+            platform = None
+            rv = zlib.compress(data)
+
+        if rv:
+            metrics.distribution(
+                "nodestore.compression.ratio",
+                len(data) / len(rv),
+                tags={"codec": self.codec, "dictionary": platform or "none"},
+            )
+        return rv
+
+    def stream_reader(self, data: bytes) -> IO[bytes]:
+        """
+        Return a file-like object to read the decompressed payload from. zstd
+        frames are decompressed incrementally, so that reading only a prefix
+        of the payload only decompresses that prefix.
+        """
+        if data.startswith(ZSTD_MAGIC):
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            return self._get_decompressor(dict_id).stream_reader(data)
+
+        return io.BytesIO(self.decompress(data))
+
+    def decompress(self, data: bytes) -> bytes:
+        if data.startswith(ZSTD_MAGIC):
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            return self._get_decompressor(dict_id).decompress(data)
+
+        # zlib streams start with a two byte header whose checksum makes it
+        # a multiple of 31.
+        if data[:1] == b"\x78" and len(data) > 1 and int.from_bytes(data[:2], "big") % 31 == 0:
+            return zlib.decompress(data)
+
+        # Uncompressed payload
+        return data
@@ -1,32 +1,83 @@
 from __future__ import annotations
 
+import base64
 import logging
 import math
 import pickle
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.nodestore.base import SEGMENTED_MAGIC, NodeStorage, json_loads, read_segment
+from sentry.nodestore.compression import NodeCompressor
 
 from .models import Node
 
 logger = logging.getLogger("sentry")
 
 
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
 class DjangoNodeStorage(NodeStorage):
+    """
+    A Postgres-based backend for storing node data.
+
+    Nodes are compressed when encoded, and stored base64-encoded as the
+    column is a text column.
+
+    :param compression: The codec used to compress new nodes, either "zlib" or
+        "zstd". Nodes are always decompressed based on their own format, so
+        this can be changed at any time.
+    :param compression_level: The zstd compression level.
+    :param compression_dictionaries: A mapping of platform to the path of a
+        trained zstd dictionary used to compress events of that platform.
+
+    >>> DjangoNodeStorage(
+    ...     compression="zstd",
+    ...     compression_dictionaries={"python": "/etc/sentry/nodestore/python.dict"},
+    ... )
+    """
+
+    def __init__(
+        self,
+        compression: str = "zlib",
+        compression_level: int = 3,
+        compression_dictionaries: Mapping[str, str] | None = None,
+    ) -> None:
+        self.compressor = NodeCompressor(
+            codec=compression, level=compression_level, dictionaries=compression_dictionaries
+        )
+
     def delete(self, id: str) -> None:
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
 
+    def _encode(self, data: dict[str | None, Mapping[str, Any]]) -> bytes:
+        default = data.get(None)
+        platform = default.get("platform") if isinstance(default, Mapping) else None
+        return self.compressor.compress(
+            NodeStorage._encode(self, data),
+            platform=platform if isinstance(platform, str) else None,
+        )
+
     def _decode(self, value: bytes | None, subkey: str | None) -> Any | None:
         if value is None:
             return None
 
         try:
+            reader = self.compressor.stream_reader(value)
+            magic = reader.read(len(SEGMENTED_MAGIC))
+            if magic == SEGMENTED_MAGIC:
+                # Only decompress the node up to the end of the requested segment
+                segment = read_segment(reader, subkey)
+                return json_loads(segment) if segment is not None else None
+
+            value = magic + reader.read()
             if value.startswith(b"{"):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
@@ -41,19 +92,34 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id: str) -> bytes | None:
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return base64.b64decode(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: base64.b64decode(n.data) for n in Node.objects.filter(id__in=id_list)}
 
     def delete_multi(self, id_list: list[str]) -> None:
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+        create_or_update(
+            Node, id=id, values={"data": _b64encode(data), "timestamp": timezone.now()}
+        )
+
+    def _set_bytes_multi(self, items: dict[str, bytes], ttl: timedelta | None = None) -> None:
+        now = timezone.now()
+        # A single multi-row upsert rather than one `create_or_update` per node
+        Node.objects.bulk_create(
+            [
+                Node(id=item_id, data=_b64encode(data), timestamp=now)
+                for item_id, data in items.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["data", "timestamp"],
+        )
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
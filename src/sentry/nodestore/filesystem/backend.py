@@ -1,9 +1,10 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from django.conf import settings
 
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.base import SEGMENTED_MAGIC, NodeStorage, encode_segments, read_segment
 
 
 class FileSystemNodeStorage(NodeStorage):
@@ -26,10 +27,25 @@ class FileSystemNodeStorage(NodeStorage):
         with open(self.node_path(id), "rb") as file:
             return file.read()
 
+    def _get_bytes_for_subkey(self, id: str, subkey: str | None) -> bytes:
+        with open(self.node_path(id), "rb") as file:
+            magic = file.read(len(SEGMENTED_MAGIC))
+            if magic != SEGMENTED_MAGIC:
+                return magic + file.read()
+
+            # Seek to the requested segment and only read that one
+            segment = read_segment(file, subkey)
+            return encode_segments([(subkey, segment)] if segment is not None else [])
+
     def _set_bytes(self, id: str, data: bytes, ttl: timedelta | None = None) -> None:
         with open(self.node_path(id), "wb") as file:
             file.write(data)
 
+    def _set_bytes_multi(self, items: dict[str, bytes], ttl: timedelta | None = None) -> None:
+        with ThreadPoolExecutor(max_workers=min(len(items), 8) or 1) as executor:
+            # Consume the results so any exception is raised here
+            list(executor.map(lambda item: self._set_bytes(item[0], item[1], ttl), items.items()))
+
     def delete(self, id: str) -> None:
         os.remove(self.node_path(id))
 
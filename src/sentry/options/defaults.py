@@ -756,6 +756,13 @@ register("snuba.search.max-pre-snuba-candidates", default=5000, flags=FLAG_AUTOM
 register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Size chunks of post-filtered searches by the observed ratio of Snuba results that pass
+# the Postgres filters, instead of growing them by `snuba.search.chunk-growth-rate`.
+register("snuba.search.adaptive-chunk-sizing", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# When there are more than `snuba.search.max-pre-snuba-candidates` candidates, fetch up to this
+# many candidate IDs from Postgres to intersect with Snuba results in memory instead of
+# post-filtering every chunk in Postgres. Disabled unless larger than the pre-Snuba maximum.
+register("snuba.search.max-streamed-candidates", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -896,6 +903,15 @@ register(
 )
 
 
+# Seconds for which the issue stream caches the stats and seen stats of individual
+# groups. Disabled when 0.
+register(
+    "issues.stream.stats-cache-ttl",
+    default=0,
+    type=Int,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for issue priority
 register(
     "issues.priority.enabled",
@@ -1178,6 +1194,14 @@ register("relay.static_auth", default={}, flags=FLAG_NOSTORE)
 # Example value: [{"project_id": 42}, {"project_id": 123}]
 register("relay.drop-transaction-metrics", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Recompute only the affected sections of cached project configs for invalidation triggers
+# listed in `sentry.tasks.relay.PARTIAL_INVALIDATION_TRIGGERS`.
+register(
+    "relay.project-config.partial-invalidation.enabled",
+    default=True,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Relay should emit a usage metric to track total spans.
 register("relay.span-usage-metric", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -2008,6 +2032,15 @@ register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Encode new nodes in the segmented format, which allows reading a single subkey
+# without decoding the whole node. Only enable once all readers support it.
+register("nodestore.segmented-encoding.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# === Buffer related runtime options ===
+
+# Flush batches of buffered increments together, draining each Redis shard in
+# one pipeline and coalescing updates of the same model into bulk updates.
+register("buffer.batched-flush.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # === Backpressure related runtime options ===
 
@@ -2894,6 +2927,12 @@ register(
     default=0.0,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+register(
+    "grouping.enhancements.results_cache_enabled",
+    type=Bool,
+    default=True,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 
 # Restrict uptime issue creation for specific host provider identifiers. Items
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from dataclasses import dataclass
 from time import time
 from typing import TYPE_CHECKING, Any
 
@@ -28,11 +31,31 @@ def _bucket_start_time(bucket_number: int, window: int) -> int:
     return bucket_number * window
 
 
+@dataclass
+class _Lease:
+    """A block of counter values claimed from redis for one rate limit key."""
+
+    # The next counter value to hand out, and the last one of the block.
+    next_value: int
+    last_value: int
+    reset_time: int
+
+
 class RedisRateLimiter(RateLimiter):
     def __init__(self, **options: Any) -> None:
         cluster_key = settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER
         self.client = redis.redis_clusters.get(cluster_key)
 
+        # In lease mode, each process increments the counter in redis by
+        # `lease_size` at once and serves checks from that block locally. The
+        # counter in redis always covers every value handed out, so a limit
+        # can never be exceeded across processes. Instead, up to `lease_size -
+        # 1` unused values per process and window may be rejected too early.
+        self.lease_size = int(options.get("lease_size", 1))
+        self._leases: dict[str, _Lease] = {}
+        self._leases_lock = threading.Lock()
+        self._leases_pid = os.getpid()
+
     def _construct_redis_key(
         self,
         key: str,
@@ -102,11 +125,19 @@ class RedisRateLimiter(RateLimiter):
         request_time = time()
         if window is None or window == 0:
             window = self.window
-        redis_key = self._construct_redis_key(key, project=project, window=window)
+        redis_key = self._construct_redis_key(
+            key, project=project, window=window, request_time=request_time
+        )
 
         expiration = window - int(request_time % window)
         # Reset Time = next time bucket's start time
         reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
+
+        if self.lease_size > 1:
+            return self._is_limited_with_lease(
+                redis_key, limit, request_time, expiration, reset_time
+            )
+
         try:
             pipe = self.client.pipeline()
             pipe.incr(redis_key)
@@ -121,6 +152,56 @@ class RedisRateLimiter(RateLimiter):
 
         return result > limit, result, reset_time
 
+    def _is_limited_with_lease(
+        self, redis_key: str, limit: int, request_time: float, expiration: int, reset_time: int
+    ) -> tuple[bool, int, int]:
+        with self._leases_lock:
+            if self._leases_pid != os.getpid():
+                # Leases inherited from a parent process are also used there.
+                self._leases = {}
+                self._leases_pid = os.getpid()
+
+            lease = self._leases.get(redis_key)
+            if lease is not None and lease.next_value <= lease.last_value:
+                result = lease.next_value
+                lease.next_value += 1
+                return result > limit, result, reset_time
+
+        # Claim a new block without holding the lock, so that checks of other
+        # keys are not blocked on the round trip to redis.
+        try:
+            pipe = self.client.pipeline()
+            pipe.incrby(redis_key, self.lease_size)
+            pipe.expire(redis_key, expiration)
+            last_value = pipe.execute()[0]
+        except (RedisError, IndexError):
+            logger.exception("Failed to retrieve current rate limit value from redis")
+            return False, 0, reset_time
+
+        lease = _Lease(
+            next_value=last_value - self.lease_size + 1,
+            last_value=last_value,
+            reset_time=reset_time,
+        )
+        with self._leases_lock:
+            # Keys contain the time bucket, so leases of past windows are
+            # never used again.
+            self._leases = {k: v for k, v in self._leases.items() if v.reset_time > request_time}
+
+            # Another thread may have installed a block for this key in the
+            # meantime. Keep using it while it has values left, the rest of
+            # this block is then left unused.
+            current = self._leases.get(redis_key)
+            if current is None or current.next_value > current.last_value:
+                self._leases[redis_key] = lease
+
+            result = lease.next_value
+            lease.next_value += 1
+
+        return result > limit, result, reset_time
+
     def reset(self, key: str, project: Project | None = None, window: int | None = None) -> None:
         redis_key = self._construct_redis_key(key, project=project, window=window)
+        with self._leases_lock:
+            self._leases.pop(redis_key, None)
         self.client.delete(redis_key)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+from collections import defaultdict
 from collections.abc import Sequence
 from typing import Any
 
@@ -118,6 +120,21 @@ class SlidingWindowRateLimiter(Service):
         self.use_quotas(requests, grants, timestamp)
         return grants
 
+    def check_and_use_quotas_bulk(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
+    ) -> Sequence[GrantedQuota]:
+        """
+        Check and consume the quotas of many independent requests at once, for
+        example one request per message in a batch.
+
+        As opposed to `check_and_use_quotas`, requests are resolved as if they
+        were made one after another: quota granted to a request is no longer
+        available to subsequent requests in the same call, even if they share
+        the same prefix. Grants are returned in the order of `requests`. See
+        `check_within_quotas` for parameters.
+        """
+        return [self.check_and_use_quotas([request], timestamp)[0] for request in requests]
+
 
 class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
     def __init__(self, **options: Any) -> None:
@@ -158,3 +175,76 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         timestamp: Timestamp,
     ) -> None:
         return self.impl.use_quotas(requests, grants, timestamp)
+
+    def check_and_use_quotas_bulk(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
+    ) -> Sequence[GrantedQuota]:
+        if timestamp is None:
+            timestamp = int(time.time())
+        else:
+            timestamp = int(timestamp)
+
+        # For every request and quota, the keys of all granules within the
+        # window. The first key is the current granule that usage is added to.
+        request_keys: list[list[list[str]]] = []
+        for request in requests:
+            assert request.quotas
+            request_keys.append(
+                [
+                    [
+                        self.impl._build_redis_key(request=request, quota=quota, granule=granule)
+                        for granule in quota.iter_window(timestamp)
+                    ]
+                    for quota in request.quotas
+                ]
+            )
+
+        # The pipeline groups commands by node in cluster mode, so this is a
+        # single round trip per node regardless of the number of requests.
+        keys_to_fetch = list(
+            {key: None for quota_keys in request_keys for keys in quota_keys for key in keys}
+        )
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys_to_fetch:
+                pipeline.get(key)
+            counts: dict[str, int] = {
+                key: int(value or 0) for key, value in zip(keys_to_fetch, pipeline.execute())
+            }
+
+        grants = []
+        keys_to_incr: dict[str, int] = defaultdict(int)
+        keys_ttl: dict[str, int] = {}
+
+        for request, quota_keys in zip(requests, request_keys):
+            granted_quota = request.requested
+            reached_quotas = []
+
+            for quota, keys in zip(request.quotas, quota_keys):
+                used_quota = sum(counts[key] for key in keys)
+                remaining_quota = max(0, quota.limit - used_quota)
+                if remaining_quota < granted_quota:
+                    granted_quota = remaining_quota
+                    reached_quotas.append(quota)
+
+            # Account for the granted quota locally so that subsequent requests
+            # for the same keys see it without another round trip.
+            if granted_quota > 0:
+                for quota, keys in zip(request.quotas, quota_keys):
+                    counts[keys[0]] += granted_quota
+                    keys_to_incr[keys[0]] += granted_quota
+                    keys_ttl[keys[0]] = quota.window_seconds
+
+            grants.append(
+                GrantedQuota(
+                    prefix=request.prefix, granted=granted_quota, reached_quotas=reached_quotas
+                )
+            )
+
+        if keys_to_incr:
+            with self.client.pipeline(transaction=False) as pipeline:
+                for key, value in keys_to_incr.items():
+                    pipeline.incrby(key, value)
+                    pipeline.expire(key, keys_ttl[key])
+                pipeline.execute()
+
+        return grants
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import uuid
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timezone
 from typing import Any, Literal, NotRequired, TypedDict
 
@@ -1051,10 +1051,7 @@ def _get_project_config(
         if exposed_features := get_exposed_features(project):
             config["features"] = exposed_features
 
-    # NOTE: Omitting dynamicSampling because of a failure increases the number
-    # of events forwarded by Relay, because dynamic sampling will stop filtering
-    # anything.
-    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
+    _add_sampling_config(config, project)
 
     # Rules to replace high cardinality transaction names
     add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
@@ -1087,8 +1084,7 @@ def _get_project_config(
             project,
         )
 
-        if metric_extraction := get_metric_extraction_config(project):
-            config["metricExtraction"] = metric_extraction
+    _add_metric_extraction_config(config, project)
 
     config["sessionMetrics"] = {
         "version": (
@@ -1125,6 +1121,63 @@ def _get_project_config(
     return ProjectConfig(project, **cfg)
 
 
+def _add_sampling_config(config: MutableMapping[str, Any], project: Project) -> None:
+    # NOTE: Omitting dynamicSampling because of a failure increases the number
+    # of events forwarded by Relay, because dynamic sampling will stop filtering
+    # anything.
+    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
+
+
+def _add_metric_extraction_config(config: MutableMapping[str, Any], project: Project) -> None:
+    if _should_extract_transaction_metrics(project):
+        if metric_extraction := get_metric_extraction_config(project):
+            config["metricExtraction"] = metric_extraction
+
+
+#: Sections of the project config that can be recomputed without rebuilding the
+#: rest of the config, see :func:`update_project_config`. Each section is named
+#: after the only key it sets in ``config``.
+_SECTION_BUILDERS: Mapping[str, Callable[[MutableMapping[str, Any], Project], None]] = {
+    "sampling": _add_sampling_config,
+    "metricExtraction": _add_metric_extraction_config,
+}
+
+PROJECT_CONFIG_SECTIONS = frozenset(_SECTION_BUILDERS)
+
+
+def update_project_config(
+    project: Project, previous: Mapping[str, Any], sections: Collection[str]
+) -> ProjectConfig:
+    """Recomputes some sections of a previously computed project config.
+
+    All other parts of the config are reused from ``previous``, so this must
+    only be used if the inputs to those parts have not changed since.
+    :param project: The project the config belongs to.
+    :param previous: The project config as returned by ``to_dict``, typically
+        read from the project config cache.
+    :param sections: The sections to recompute, see ``PROJECT_CONFIG_SECTIONS``.
+    :return: a ProjectConfig object with a new revision
+    """
+    with sentry_sdk.isolation_scope() as scope:
+        scope.set_tag("project", project.id)
+        with (
+            sentry_sdk.start_transaction(name="update_project_config"),
+            metrics.timer("relay.config.update_project_config.duration"),
+        ):
+            if project.status != ObjectStatus.ACTIVE:
+                return ProjectConfig(project, disabled=True)
+
+            now = datetime.now(timezone.utc)
+            cfg = {**previous, "lastFetch": now, "lastChange": now, "rev": uuid.uuid4().hex}
+            config = cfg["config"] = {**previous["config"]}
+
+            for section in sections:
+                config.pop(section, None)
+                _SECTION_BUILDERS[section](config, project)
+
+            return ProjectConfig(project, **cfg)
+
+
 class _ConfigBase:
     """
     Base class for configuration objects
@@ -2,16 +2,34 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "get_delta")
 
     def __init__(self, **options):
         pass
 
-    def set_many(self, configs):
-        pass
+    def set_many(self, configs, expected_revisions=None):
+        """
+        Stores the given project configs.
+
+        If ``expected_revisions`` maps a public key to a revision, its config
+        is only stored if the cached config still has that revision. Returns
+        the public keys whose configs were not stored for that reason.
+        """
+        return []
 
     def delete_many(self, public_keys):
         pass
 
     def get(self, public_key):
         raise NotImplementedError()
+
+    def get_delta(self, public_key, revision):
+        """
+        Returns the delta from the given revision to the current revision of a
+        project config as a dict with ``baseRev``, ``rev`` and ``patch``, see
+        :mod:`sentry.relay.projectconfig_cache.delta`.
+
+        Returns ``None`` if no such delta is available, in which case the full
+        config needs to be served.
+        """
+        return None
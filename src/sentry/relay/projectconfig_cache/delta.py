@@ -0,0 +1,71 @@
+"""
+Deltas between two revisions of a project config.
+
+A delta is a JSON merge patch (RFC 7386) that turns the config of one revision
+into the config of the next revision. Keys mapped to ``None`` are removed,
+objects are merged recursively, and all other values replace the previous
+value. Since ``None`` cannot be expressed as a value in a merge patch, no delta
+is created for configs that set a changed key to ``None``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+
+class _InexpressibleChange(Exception):
+    pass
+
+
+def _contains_none(value: Any) -> bool:
+    if isinstance(value, Mapping):
+        return any(v is None or _contains_none(v) for v in value.values())
+    return False
+
+
+def _create_patch(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any]:
+    patch: dict[str, Any] = {key: None for key in old.keys() - new.keys()}
+
+    for key, value in new.items():
+        previous = old.get(key)
+        if key in old and previous == value:
+            continue
+
+        if isinstance(value, Mapping) and isinstance(previous, Mapping):
+            patch[key] = _create_patch(previous, value)
+        elif value is None or _contains_none(value):
+            raise _InexpressibleChange(key)
+        else:
+            patch[key] = value
+
+    return patch
+
+
+def create_delta(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any] | None:
+    """
+    Creates a merge patch that turns ``old`` into ``new``, or returns ``None``
+    if the change cannot be expressed as a merge patch.
+
+    Both configs must be JSON-compatible, i.e. as they are read from the cache.
+    """
+    try:
+        return _create_patch(old, new)
+    except _InexpressibleChange:
+        return None
+
+
+def apply_delta(old: Mapping[str, Any], patch: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Applies a merge patch created by :func:`create_delta` to ``old``.
+    """
+    result = dict(old)
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, Mapping):
+            previous = result.get(key)
+            result[key] = apply_delta(previous if isinstance(previous, Mapping) else {}, value)
+        else:
+            result[key] = value
+    return result
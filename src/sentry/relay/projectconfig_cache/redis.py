@@ -5,6 +5,7 @@ from typing import Any
 import zstandard
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
+from sentry.relay.projectconfig_cache.delta import create_delta
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
 
@@ -13,6 +14,15 @@ COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
 logger = logging.getLogger(__name__)
 
+# Replaces a config only if it is still the exact value it was computed from.
+SET_IF_UNCHANGED_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    redis.call("setex", KEYS[1], ARGV[2], ARGV[3])
+    return 1
+end
+return 0
+"""
+
 
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
@@ -22,6 +32,10 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get_binary(read_cluster_key)
 
+        # Whether to store the delta from the previous revision alongside each
+        # config. This requires reading the previous config on every write.
+        self.store_deltas = options.get("store_deltas", True)
+
         super().__init__(**options)
 
     def validate(self):
@@ -33,20 +47,111 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_rev_key(self, public_key):
         return f"{self.__get_redis_key(public_key)}.rev"
 
-    def set_many(self, configs: dict[str, Mapping[str, Any]]):
+    def __get_redis_delta_key(self, public_key):
+        return f"{self.__get_redis_key(public_key)}.delta"
+
+    def __decode(self, value: bytes) -> Any:
+        try:
+            rv = zstandard.decompress(value).decode()
+        except (TypeError, zstandard.ZstdError):
+            # assume raw json
+            rv = value.decode()
+        return json.loads(rv)
+
+    def __get_raw_configs(self, public_keys: list[str]) -> list[bytes | None]:
+        # Note: Those are multiple pipelines, one per cluster node.
+        with self.cluster.pipeline(transaction=False) as p:
+            for public_key in public_keys:
+                p.get(self.__get_redis_key(public_key))
+            return p.execute()
+
+    def __make_delta(self, previous: Any, config: Any) -> bytes | None:
+        if not isinstance(previous, dict) or not isinstance(config, dict):
+            return None
+
+        base_rev, rev = previous.get("rev"), config.get("rev")
+        if not base_rev or not rev or base_rev == rev:
+            return None
+
+        patch = create_delta(previous, config)
+        if patch is None:
+            return None
+
+        serialized = json.dumps({"baseRev": base_rev, "rev": rev, "patch": patch}).encode()
+        metrics.distribution(
+            "relay.projectconfig_cache.delta_uncompressed_size", len(serialized), unit="byte"
+        )
+        return zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+
+    def set_many(
+        self,
+        configs: dict[str, Mapping[str, Any]],
+        expected_revisions: Mapping[str, str | None] | None = None,
+    ) -> list[str]:
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
+        expected_revisions = {
+            public_key: rev
+            for public_key, rev in (expected_revisions or {}).items()
+            if public_key in configs
+        }
+
+        raw_previous: dict[str, bytes | None] = {}
+        if self.store_deltas or expected_revisions:
+            public_keys = list(configs if self.store_deltas else expected_revisions)
+            raw_previous = dict(zip(public_keys, self.__get_raw_configs(public_keys)))
+        previous_configs = {
+            public_key: value and self.__decode(value) for public_key, value in raw_previous.items()
+        }
+
+        serialized_configs = {
+            public_key: json.dumps(config).encode() for public_key, config in configs.items()
+        }
+        compressed_configs = {
+            public_key: zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            for public_key, serialized in serialized_configs.items()
+        }
+
+        # Conditional writes compare the cached config with the exact value it
+        # was read as, so the revision check and the write are atomic.
+        conflicts = []
+        conditional = []
+        for public_key, rev in expected_revisions.items():
+            previous = previous_configs.get(public_key)
+            if isinstance(previous, dict) and previous.get("rev") == rev:
+                conditional.append(public_key)
+            else:
+                conflicts.append(public_key)
+        if conditional:
+            with self.cluster.pipeline(transaction=False) as p:
+                for public_key in conditional:
+                    p.eval(
+                        SET_IF_UNCHANGED_SCRIPT,
+                        1,
+                        self.__get_redis_key(public_key),
+                        raw_previous[public_key],
+                        REDIS_CACHE_TIMEOUT,
+                        compressed_configs[public_key],
+                    )
+                written = p.execute()
+            conflicts.extend(public_key for public_key, ok in zip(conditional, written) if not ok)
+        if conflicts:
+            metrics.incr("relay.projectconfig_cache.write_conflict", amount=len(conflicts))
 
         # Note: Those are multiple pipelines, one per cluster node.
         p = self.cluster.pipeline(transaction=False)
         for public_key, config in configs.items():
-            serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            if public_key in conflicts:
+                continue
+
+            serialized = serialized_configs[public_key]
+            compressed = compressed_configs[public_key]
             metrics.distribution(
                 "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
             )
             metrics.distribution("relay.projectconfig_cache.size", len(compressed), unit="byte")
 
-            p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            if public_key not in expected_revisions:
+                p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
             # Update the revision after updating the config, while not strictly necessary
             # this means when the reader is checking the revision before reading the key
             # the revision won't be updated already while the project config is still the old.
@@ -57,31 +162,67 @@ class RedisProjectConfigCache(ProjectConfigCache):
             # made transactional.
             if rev := config.get("rev"):
                 p.setex(self.__get_redis_rev_key(public_key), REDIS_CACHE_TIMEOUT, rev)
+            else:
+                # Don't report a previous revision as current, see `get_delta`.
+                p.delete(self.__get_redis_rev_key(public_key))
+
+            if self.store_deltas:
+                # The previous config is compared in its serialized form, which
+                # is also how requesters have received it.
+                delta = self.__make_delta(previous_configs.get(public_key), json.loads(serialized))
+                if delta is not None:
+                    p.setex(self.__get_redis_delta_key(public_key), REDIS_CACHE_TIMEOUT, delta)
+                else:
+                    p.delete(self.__get_redis_delta_key(public_key))
 
         p.execute()
+        return conflicts
 
     def delete_many(self, public_keys):
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
+                # Without a config, neither its revision nor delta may be served.
+                p.delete(self.__get_redis_rev_key(public_key))
+                p.delete(self.__get_redis_delta_key(public_key))
             return_values = p.execute()
 
         metrics.incr(
-            "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
+            "relay.projectconfig_cache.write",
+            amount=sum(return_values[::3]),
+            tags={"action": "delete"},
         )
 
     def get(self, public_key):
         rv_b = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv_b is not None:
-            try:
-                rv = zstandard.decompress(rv_b).decode()
-            except (TypeError, zstandard.ZstdError):
-                # assume raw json
-                rv = rv_b.decode()
-            return json.loads(rv)
+            return self.__decode(rv_b)
         return None
 
+    def get_delta(self, public_key, revision):
+        with self.cluster_read.pipeline(transaction=False) as p:
+            p.get(self.__get_redis_rev_key(public_key))
+            p.get(self.__get_redis_delta_key(public_key))
+            rev_b, delta_b = p.execute()
+
+        if rev_b is None:
+            return None
+
+        rev = rev_b.decode()
+        if rev == revision:
+            return {"baseRev": revision, "rev": rev, "patch": {}}
+
+        if delta_b is None:
+            return None
+
+        # The revision key is best effort, see `set_many`, so make sure the
+        # delta leads to the latest known revision.
+        delta = self.__decode(delta_b)
+        if delta["baseRev"] != revision or delta["rev"] != rev:
+            return None
+        return delta
+
     def get_rev(self, public_key) -> str | None:
         if value := self.cluster_read.get(self.__get_redis_rev_key(public_key)):
             return value.decode()
@@ -1,3 +1,6 @@
+import functools
+from collections.abc import Iterable
+
 from django.conf import settings
 
 from sentry.utils.services import LazyServiceWrapper
@@ -25,3 +28,28 @@ invalidation = LazyServiceWrapper(
         **settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE_OPTIONS,
     },
 )
+
+
+def get_partial_invalidation(
+    sections: Iterable[str],
+) -> LazyServiceWrapper[ProjectConfigDebounceCache]:
+    """
+    Returns the debounce cache for partial invalidations of the given config
+    sections. Partial invalidations of different sections are debounced
+    separately, and never debounce full invalidations.
+    """
+    return _get_partial_invalidation(":".join(sorted(sections)))
+
+
+@functools.cache
+def _get_partial_invalidation(
+    sections_key: str,
+) -> LazyServiceWrapper[ProjectConfigDebounceCache]:
+    return LazyServiceWrapper(
+        ProjectConfigDebounceCache,
+        settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE,
+        {
+            "key_prefix": f"relayconfig-partial-invalidation-dedup:{sections_key}",
+            **settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE_OPTIONS,
+        },
+    )
@@ -0,0 +1,46 @@
+-- Apply multiple buffer increments, possibly for different models, at once.
+-- This is equivalent to running the pipeline of `RedisBuffer.incr` for each
+-- of them, but takes a single round trip and atomically updates the pending
+-- set together with the buffered hashes.
+--
+-- KEYS = {pending_key, key_1, ..., key_n}
+-- ARGV = {key_expire, timestamp, <increment for key_1>, ..., <increment for key_n>}
+--
+-- where each increment is encoded as:
+--
+--   model, filters, num_columns, num_sets,
+--   column_field_1, amount_1, ..., column_field_m, amount_m,
+--   set_field_1, set_value_1, ..., set_field_k, set_value_k
+assert(#KEYS >= 1, "provide at least the pending set key")
+
+local pending_key = KEYS[1]
+local key_expire = tonumber(ARGV[1])
+local timestamp = ARGV[2]
+
+local arg = 3
+for i = 2, #KEYS do
+    local key = KEYS[i]
+    local num_columns = tonumber(ARGV[arg + 2])
+    local num_sets = tonumber(ARGV[arg + 3])
+
+    redis.call("HSETNX", key, "m", ARGV[arg])
+    redis.call("HSETNX", key, "f", ARGV[arg + 1])
+    arg = arg + 4
+
+    for _ = 1, num_columns do
+        redis.call("HINCRBY", key, ARGV[arg], ARGV[arg + 1])
+        arg = arg + 2
+    end
+
+    for _ = 1, num_sets do
+        redis.call("HSET", key, ARGV[arg], ARGV[arg + 1])
+        arg = arg + 2
+    end
+
+    redis.call("EXPIRE", key, key_expire)
+    redis.call("ZADD", pending_key, timestamp, key)
+end
+
+assert(arg == #ARGV + 1, "incorrect number of arguments provided")
+
+return #KEYS - 1
@@ -1,28 +1,35 @@
 --[[
 
-Add a span to the span buffer.
+Add a subsegment of spans to the span buffer. All spans of a subsegment belong
+to the same project and trace, and share the same top-most parent span ID (see
+`SpansBuffer._group_by_parent`).
 
 KEYS:
 - "project_id:trace_id" -- just for redis-cluster routing, all keys that the script uses are sharded like this/have this hashtag.
 
 ARGS:
-- payload -- str
-- is_root_span -- bool
-- span_id -- str
 - parent_span_id -- str
 - set_timeout -- int
+- is_root_span, span_id, payload -- bool, str, bytes -- repeated for each span in the subsegment
 
 ]]--
 
 local project_and_trace = KEYS[1]
 
-local is_root_span = ARGV[1] == "true"
-local span_id = ARGV[2]
-local parent_span_id = ARGV[3]
-local set_timeout = tonumber(ARGV[4])
+local parent_span_id = ARGV[1]
+local set_timeout = tonumber(ARGV[2])
 
-local span_key = string.format("span-buf:s:{%s}:%s", project_and_trace, span_id)
 local main_redirect_key = string.format("span-buf:sr:{%s}", project_and_trace)
+local parent_key = string.format("span-buf:s:{%s}:%s", project_and_trace, parent_span_id)
+
+-- SADD in chunks to stay below the maximum number of arguments of `unpack`.
+local payloads = {}
+for i = 3, #ARGV, 3 do
+    table.insert(payloads, ARGV[i + 2])
+end
+for i = 1, #payloads, 1000 do
+    redis.call("sadd", parent_key, unpack(payloads, i, math.min(i + 999, #payloads)))
+end
 
 local set_span_id = parent_span_id
 local redirect_depth = 0
@@ -37,26 +44,34 @@ for i = 0, 10000 do  -- theoretically this limit means that segment trees of dep
     set_span_id = new_set_span
 end
 
-redis.call("hset", main_redirect_key, span_id, set_span_id)
-redis.call("expire", main_redirect_key, set_timeout)
-
 local set_key = string.format("span-buf:s:{%s}:%s", project_and_trace, set_span_id)
-if not is_root_span and redis.call("scard", span_key) > 0 then
-    redis.call("sunionstore", set_key, set_key, span_key)
-    redis.call("unlink", span_key)
+local has_root_span_key = string.format("span-buf:hrs:%s", set_key)
+local has_root_span = redis.call("get", has_root_span_key) == "1"
+
+for i = 3, #ARGV, 3 do
+    local is_root_span = ARGV[i] == "true"
+    local span_id = ARGV[i + 1]
+
+    redis.call("hset", main_redirect_key, span_id, set_span_id)
+
+    local span_key = string.format("span-buf:s:{%s}:%s", project_and_trace, span_id)
+    if not is_root_span and redis.call("scard", span_key) > 0 then
+        redis.call("sunionstore", set_key, set_key, span_key)
+        redis.call("unlink", span_key)
+    end
+
+    has_root_span = has_root_span or is_root_span
 end
+redis.call("expire", main_redirect_key, set_timeout)
 
-local parent_key = string.format("span-buf:s:{%s}:%s", project_and_trace, parent_span_id)
 if set_span_id ~= parent_span_id and redis.call("scard", parent_key) > 0 then
     redis.call("sunionstore", set_key, set_key, parent_key)
     redis.call("unlink", parent_key)
 end
 redis.call("expire", set_key, set_timeout)
 
-local has_root_span_key = string.format("span-buf:hrs:%s", set_key)
-local has_root_span = redis.call("get", has_root_span_key) == "1" or is_root_span
 if has_root_span then
     redis.call("setex", has_root_span_key, set_timeout, "1")
 end
 
-return {redirect_depth, span_key, set_key, has_root_span}
+return {redirect_depth, set_key, has_root_span}
@@ -5,7 +5,9 @@ import functools
 import logging
 import time
 from abc import ABCMeta, abstractmethod
-from collections.abc import Mapping, Sequence
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum, auto
@@ -14,6 +16,7 @@ from math import floor
 from typing import Any, TypedDict, cast
 
 import sentry_sdk
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 from snuba_sdk import (
@@ -164,6 +167,75 @@ def get_search_filter(
     return found_val
 
 
+# How long observed post-filter selectivities are kept to size the first chunk
+# of later searches.
+SELECTIVITY_HINT_TTL = 60 * 60
+# Chunks are sized for slightly more results than needed, since the selectivity
+# is only an estimate.
+CHUNK_SIZE_HEADROOM = 1.2
+
+
+def _get_selectivity_hint_key(
+    projects: Sequence[Project], search_filters: Sequence[SearchFilter] | None
+) -> str:
+    hashable = json.dumps(
+        [sorted(p.id for p in projects), sorted(str(sf) for sf in search_filters or ())]
+    )
+    return f"snuba.search.selectivity:{md5(hashable.encode('utf-8')).hexdigest()}"
+
+
+def estimate_chunk_size(needed: int, selectivity: float, limit: int, max_chunk_size: int) -> int:
+    """
+    Returns the number of Snuba results that likely yield ``needed`` results
+    after post-filtering them in Postgres, given the ratio of Snuba results
+    that pass the Postgres filters.
+    """
+    estimate = int(needed / selectivity * CHUNK_SIZE_HEADROOM)
+    return min(max(estimate, limit), max_chunk_size)
+
+
+# Number of candidate IDs fetched from Postgres per query when streaming them.
+CANDIDATE_BLOCK_SIZE = 10000
+
+
+def fetch_sorted_candidate_ids(
+    group_queryset: BaseQuerySet, max_candidates: int
+) -> array[int] | None:
+    """
+    Fetches the IDs of all groups matching ``group_queryset`` in blocks ordered
+    by ID and returns them as a compact sorted array, or ``None`` if there are
+    more than ``max_candidates`` of them.
+    """
+    candidate_ids: array[int] = array("q")
+    last_id = None
+    while True:
+        queryset = group_queryset.using_replica().order_by("id")
+        if last_id is not None:
+            queryset = queryset.filter(id__gt=last_id)
+        block = list(queryset.values_list("id", flat=True)[:CANDIDATE_BLOCK_SIZE])
+        candidate_ids.extend(block)
+        if len(candidate_ids) > max_candidates:
+            return None
+        if len(block) < CANDIDATE_BLOCK_SIZE:
+            return candidate_ids
+        last_id = block[-1]
+
+
+def intersect_sorted_candidate_ids(
+    candidate_ids: array[int], group_ids: Iterable[int]
+) -> list[int]:
+    """
+    Returns the ``group_ids`` contained in the sorted ``candidate_ids``,
+    preserving their order.
+    """
+    result = []
+    for group_id in group_ids:
+        index = bisect_left(candidate_ids, group_id)
+        if index < len(candidate_ids) and candidate_ids[index] == group_id:
+            result.append(group_id)
+    return result
+
+
 def group_categories_from_search_filters(
     search_filters: Sequence[SearchFilter], organization: Organization, actor: User | RpcUser
 ) -> set[int]:
@@ -889,6 +961,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             span.set_data("Result Size", len(group_ids))
         metrics.distribution("snuba.search.num_candidates", len(group_ids))
         too_many_candidates = False
+        streamed_candidate_ids = None
         if not group_ids:
             # no matches could possibly be found from this point on
             metrics.incr("snuba.search.no_candidates", skip_internal=False)
@@ -906,12 +979,38 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             too_many_candidates = True
             group_ids = []
 
+            # Rather than running the queryset against every chunk of Snuba
+            # results, stream all candidate IDs out of Postgres once if there
+            # aren't too many of them, and intersect the chunks in memory.
+            max_streamed_candidates = options.get("snuba.search.max-streamed-candidates")
+            if max_streamed_candidates > max_candidates:
+                with sentry_sdk.start_span(op="snuba_group_query_streamed") as span:
+                    streamed_candidate_ids = fetch_sorted_candidate_ids(
+                        group_queryset, max_streamed_candidates
+                    )
+                    span.set_data("Max Candidates", max_streamed_candidates)
+                metrics.incr(
+                    "snuba.search.streamed_candidates",
+                    tags={"too_many": streamed_candidate_ids is None},
+                    skip_internal=False,
+                )
+
         sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
         chunk_limit = limit
         offset = 0
         num_chunks = 0
+
+        # When post-filtering, chunks are sized by the observed ratio of Snuba
+        # results that pass the Postgres filters. The first chunk uses the ratio
+        # observed by an earlier search with the same projects and filters.
+        selectivity: float | None = None
+        selectivity_hint_key = None
+        if not group_ids and options.get("snuba.search.adaptive-chunk-sizing"):
+            selectivity_hint_key = _get_selectivity_hint_key(projects, search_filters)
+            selectivity = cache.get(selectivity_hint_key)
+        num_post_filtered = 0
         hits = self.calculate_hits(
             group_ids,
             too_many_candidates,
@@ -950,9 +1049,15 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         while (time.time() - time_start) < max_time:
             num_chunks += 1
 
-            # grow the chunk size on each iteration to account for huge projects
-            # and weird queries, up to a max size
-            chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
+            if selectivity is not None:
+                # size the chunk to likely satisfy the query in one go
+                chunk_limit = estimate_chunk_size(
+                    limit - len(paginator_results.results), selectivity, limit, max_chunk_size
+                )
+            else:
+                # grow the chunk size on each iteration to account for huge projects
+                # and weird queries, up to a max size
+                chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
             # but if we have group_ids always query for at least that many items
             chunk_limit = max(chunk_limit, len(group_ids))
 
@@ -993,9 +1098,15 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             else:
                 # pre-filtered candidates were *not* passed down to Snuba,
                 # so we need to do post-filtering to verify Sentry DB predicates
-                filtered_group_ids = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).values_list("id", flat=True)
+                filtered_group_ids: Iterable[int]
+                if streamed_candidate_ids is not None:
+                    filtered_group_ids = intersect_sorted_candidate_ids(
+                        streamed_candidate_ids, [gid for gid, _ in snuba_groups]
+                    )
+                else:
+                    filtered_group_ids = group_queryset.filter(
+                        id__in=[gid for gid, _ in snuba_groups]
+                    ).values_list("id", flat=True)
 
                 group_to_score = dict(snuba_groups)
                 for group_id in filtered_group_ids:
@@ -1010,6 +1121,12 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                     result_group_ids.add(group_id)
                     result_groups.append((group_id, group_score))
 
+                if selectivity_hint_key is not None:
+                    # Smoothed so that chunks without any matches don't result
+                    # in a selectivity of 0.
+                    num_post_filtered += len(snuba_groups)
+                    selectivity = (len(result_groups) + 1) / (num_post_filtered + 1)
+
             # break the query loop for one of three reasons:
             # * we started with Postgres candidates and so only do one Snuba query max
             # * the paginator is returning enough results to satisfy the query (>= the limit)
@@ -1043,6 +1160,9 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             paginator_results.prev.has_results = True
 
         metrics.distribution("snuba.search.num_chunks", num_chunks)
+        if selectivity_hint_key is not None and selectivity is not None and num_post_filtered:
+            metrics.distribution("snuba.search.selectivity", selectivity)
+            cache.set(selectivity_hint_key, selectivity, SELECTIVITY_HINT_TTL)
 
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
+from typing import Any
 
 from django.conf import settings
 from django.core.cache import caches
@@ -33,6 +37,8 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+_INDEXER_LOCAL_CACHE_EVICTIONS_METRIC = "sentry_metrics.indexer.local_cache.evictions"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -43,13 +49,101 @@ NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
 
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
+REVERSE_RESOLVE_CACHE_NAMESPACE = "rev"
+
+
+class LocalIndexerCache:
+    """
+    A bounded, in-process LRU cache that sits in front of the shared indexer
+    cache. Entries expire after `ttl` seconds so that deletions in the shared
+    cache or the database are picked up eventually.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, namespace: str, keys: Collection[str]) -> dict[str, Any]:
+        now = time.monotonic()
+        found: dict[str, Any] = {}
+
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get((namespace, key))
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._entries[(namespace, key)]
+                    continue
+                self._entries.move_to_end((namespace, key))
+                found[key] = value
+
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true", "namespace": namespace},
+            amount=len(found),
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false", "namespace": namespace},
+            amount=len(keys) - len(found),
+        )
+        return found
+
+    def set_many(self, namespace: str, key_values: Mapping[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        evicted = 0
+
+        with self._lock:
+            for key, value in key_values.items():
+                self._entries[(namespace, key)] = (expires_at, value)
+                self._entries.move_to_end((namespace, key))
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+
+        if evicted:
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_EVICTIONS_METRIC,
+                tags={"namespace": namespace},
+                amount=evicted,
+            )
+
+    def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop((namespace, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    def __init__(
+        self,
+        cache_name: str,
+        partition_key: str,
+        local_cache_size: int = 0,
+        local_cache_ttl: int = 60,
+    ):
+        """
+        :param local_cache_size: The maximum number of entries kept in an
+            in-process cache in front of `cache_name`. The shared cache is only
+            consulted for keys that miss locally. 0 disables the local cache.
+        :param local_cache_ttl: How long, in seconds, entries are kept in the
+            local cache.
+        """
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self.local_cache = (
+            LocalIndexerCache(local_cache_size, local_cache_ttl) if local_cache_size > 0 else None
+        )
 
     @property
     def randomized_ttl(self) -> int:
@@ -131,15 +225,29 @@ class StringIndexerCache:
         return int(result)
 
     def get(self, namespace: str, key: str) -> int | None:
+        if self.local_cache is not None:
+            local_results = self.local_cache.get_many(namespace, [key])
+            if key in local_results:
+                return local_results[key]
+
+        result: int | None
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
-            result = self.cache.get(
-                self._make_namespaced_cache_key(namespace, key), version=self.version
+            result = self._validate_result(
+                self.cache.get(
+                    self._make_namespaced_cache_key(namespace, key), version=self.version
+                )
             )
-            return self._validate_result(result)
-        return self.cache.get(self._make_cache_key(key), version=self.version)
+        else:
+            result = self.cache.get(self._make_cache_key(key), version=self.version)
+
+        if self.local_cache is not None and result is not None:
+            self.local_cache.set_many(namespace, {key: result})
+        return result
 
     def set(self, namespace: str, key: str, value: int) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set_many(namespace, {key: value})
         self.cache.set(
             key=self._make_cache_key(key),
             value=value,
@@ -156,6 +264,19 @@ class StringIndexerCache:
             )
 
     def get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, int | None]:
+        if self.local_cache is None:
+            return self._get_many(namespace, keys)
+
+        keys = list(keys)
+        local_results = self.local_cache.get_many(namespace, keys)
+        if len(local_results) == len(keys):
+            return local_results
+
+        results = self._get_many(namespace, [key for key in keys if key not in local_results])
+        self.local_cache.set_many(namespace, {k: v for k, v in results.items() if v is not None})
+        return {key: local_results[key] if key in local_results else results[key] for key in keys}
+
+    def _get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, int | None]:
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             cache_keys = {self._make_namespaced_cache_key(namespace, key): key for key in keys}
@@ -176,6 +297,8 @@ class StringIndexerCache:
             return self._format_results(keys, results)
 
     def set_many(self, namespace: str, key_values: Mapping[str, int]) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set_many(namespace, key_values)
         cache_key_values = {self._make_cache_key(k): v for k, v in key_values.items()}
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
@@ -190,12 +313,16 @@ class StringIndexerCache:
             )
 
     def delete(self, namespace: str, key: str) -> None:
+        if self.local_cache is not None:
+            self.local_cache.delete_many(namespace, [key])
         self.cache.delete(self._make_cache_key(key), version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
             self.cache.delete(self._make_namespaced_cache_key(namespace, key), version=self.version)
 
     def delete_many(self, namespace: str, keys: Sequence[str]) -> None:
+        if self.local_cache is not None:
+            self.local_cache.delete_many(namespace, keys)
         self.cache.delete_many([self._make_cache_key(key) for key in keys], version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
@@ -298,12 +425,39 @@ class CachingIndexer(StringIndexer):
 
     @metric_path_key_compatible_rev_resolve
     def reverse_resolve(self, use_case_id: UseCaseID, org_id: int, id: int) -> str | None:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        local_cache = self.cache.local_cache
+        if local_cache is None:
+            return self.indexer.reverse_resolve(use_case_id, org_id, id)
+
+        key = f"{use_case_id.value}:{org_id}:{id}"
+        result = local_cache.get_many(REVERSE_RESOLVE_CACHE_NAMESPACE, [key]).get(key)
+        if result is None:
+            result = self.indexer.reverse_resolve(use_case_id, org_id, id)
+            if result is not None:
+                local_cache.set_many(REVERSE_RESOLVE_CACHE_NAMESPACE, {key: result})
+        return result
 
     def bulk_reverse_resolve(
         self, use_case_id: UseCaseID, org_id: int, ids: Collection[int]
     ) -> Mapping[int, str]:
-        return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+        local_cache = self.cache.local_cache
+        if local_cache is None:
+            return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+
+        keys = {id: f"{use_case_id.value}:{org_id}:{id}" for id in ids}
+        local_results = local_cache.get_many(REVERSE_RESOLVE_CACHE_NAMESPACE, keys.values())
+        results = {id: local_results[key] for id, key in keys.items() if key in local_results}
+
+        missing_ids = [id for id in keys if id not in results]
+        if missing_ids:
+            indexer_results = self.indexer.bulk_reverse_resolve(use_case_id, org_id, missing_ids)
+            local_cache.set_many(
+                REVERSE_RESOLVE_CACHE_NAMESPACE,
+                {keys[id]: string for id, string in indexer_results.items()},
+            )
+            results.update(indexer_results)
+
+        return results
 
     def resolve_shared_org(self, string: str) -> int | None:
         raise NotImplementedError(
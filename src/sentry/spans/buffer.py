@@ -30,14 +30,17 @@ Segments are flushed out to `buffered-spans` topic under two conditions:
 * If the segment has a root span, it is flushed out after `span_buffer_root_timeout` seconds of inactivity.
 * Otherwise, it is flushed out after `span_buffer_timeout` seconds of inactivity.
 
-Now how does that look like in Redis? For each incoming span, we:
+Now how does that look like in Redis? Incoming spans are first grouped into
+subsegments by their top-most parent span within the batch. For each
+subsegment, `add-buffer.lua` is called once and:
 
-1. Try to figure out what the name of the respective span buffer is (`set_key` in `add-buffer.lua`)
-  a. We look up any "redirects" from the span buffer's parent_span_id (hashmap at "span-buf:sr:{project_id:trace_id}") to another key.
+1. Tries to figure out what the name of the respective span buffer is (`set_key` in `add-buffer.lua`)
+  a. We look up any "redirects" from the subsegment's parent_span_id (hashmap at "span-buf:sr:{project_id:trace_id}") to another key.
   b. Otherwise we use "span-buf:s:{project_id:trace_id}:span_id"
-2. Rename any span buffers keyed under the span's own span ID to `set_key`, merging their contents.
-3. Add the ingested span's payload to the set under `set_key`.
-4. To a "global queue", we write the set's key, sorted by timeout.
+2. Renames any span buffers keyed under the spans' own span IDs to `set_key`, merging their contents.
+3. Adds the ingested spans' payloads to the set under `set_key`.
+
+Then, to a "global queue", we write the set's key, sorted by timeout.
 
 Eventually, flushing cronjob looks at that global queue, and removes all timed
 out keys from it. Then fetches the sets associated with those keys, and deletes
@@ -64,7 +67,7 @@ Glossary for types of keys:
 from __future__ import annotations
 
 import itertools
-from collections.abc import MutableMapping, Sequence
+from collections.abc import Generator, MutableMapping, Sequence
 from typing import Any, NamedTuple
 
 import rapidjson
@@ -72,6 +75,7 @@ from django.conf import settings
 from django.utils.functional import cached_property
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
+from sentry.processing.backpressure.memory import ServiceMemory, iter_cluster_memory_usage
 from sentry.utils import metrics, redis
 
 # SegmentKey is an internal identifier used by the redis buffer that is also
@@ -89,6 +93,14 @@ def _segment_key_to_span_id(segment_key: SegmentKey) -> bytes:
     return parse_segment_key(segment_key)[2]
 
 
+def _is_segment_span_payload(segment_key: SegmentKey, payload: bytes) -> bool:
+    segment_span_id = _segment_key_to_span_id(segment_key)
+    # Only parse payloads that can contain the segment span ID
+    if segment_span_id not in payload:
+        return False
+    return rapidjson.loads(payload).get("span_id") == segment_span_id.decode("ascii")
+
+
 def parse_segment_key(segment_key: SegmentKey) -> tuple[bytes, bytes, bytes]:
     segment_key_parts = segment_key.split(b":")
     project_id = segment_key_parts[2][1:]
@@ -141,11 +153,22 @@ class SpansBuffer:
         span_buffer_timeout_secs: int = 60,
         span_buffer_root_timeout_secs: int = 10,
         redis_ttl: int = 3600,
+        max_segment_bytes: int = 0,
+        segment_page_size: int = 1000,
     ):
+        """
+        :param max_segment_bytes: The maximum total size of span payloads
+            flushed for a single segment. Spans beyond this size are dropped.
+            0 means no limit.
+        :param segment_page_size: The number of spans to read from a segment
+            per SSCAN call when flushing.
+        """
         self.assigned_shards = list(assigned_shards)
         self.span_buffer_timeout_secs = span_buffer_timeout_secs
         self.span_buffer_root_timeout_secs = span_buffer_root_timeout_secs
         self.redis_ttl = redis_ttl
+        self.max_segment_bytes = max_segment_bytes
+        self.segment_page_size = segment_page_size
         self.add_buffer_sha: str | None = None
 
     @cached_property
@@ -161,6 +184,8 @@ class SpansBuffer:
                 self.span_buffer_timeout_secs,
                 self.span_buffer_root_timeout_secs,
                 self.redis_ttl,
+                self.max_segment_bytes,
+                self.segment_page_size,
             ),
         )
 
@@ -177,17 +202,9 @@ class SpansBuffer:
         min_redirect_depth = float("inf")
         max_redirect_depth = float("-inf")
 
-        with metrics.timer("spans.buffer.process_spans.push_payloads"):
+        with metrics.timer("spans.buffer.process_spans.insert_spans"):
             trees = self._group_by_parent(spans)
 
-            with self.client.pipeline(transaction=False) as p:
-                for (project_and_trace, parent_span_id), subsegment in trees.items():
-                    set_key = f"span-buf:s:{{{project_and_trace}}}:{parent_span_id}"
-                    p.sadd(set_key, *[span.payload for span in subsegment])
-
-                p.execute()
-
-        with metrics.timer("spans.buffer.process_spans.insert_spans"):
             # Workaround to make `evalsha` work in pipelines. We load ensure the
             # script is loaded just before calling it below. This calls `SCRIPT
             # EXISTS` once per batch.
@@ -195,23 +212,28 @@ class SpansBuffer:
 
             with self.client.pipeline(transaction=False) as p:
                 for (project_and_trace, parent_span_id), subsegment in trees.items():
+                    span_args: list[str | bytes] = []
                     for span in subsegment:
-                        p.execute_command(
-                            "EVALSHA",
-                            add_buffer_sha,
-                            1,
-                            project_and_trace,
-                            "true" if span.is_segment_span else "false",
-                            span.span_id,
-                            parent_span_id,
-                            self.redis_ttl,
-                        )
-
+                        span_args.append("true" if span.is_segment_span else "false")
+                        span_args.append(span.span_id)
+                        span_args.append(span.payload)
                         is_root_span_count += int(span.is_segment_span)
-                        shard = self.assigned_shards[
-                            int(span.trace_id, 16) % len(self.assigned_shards)
-                        ]
-                        queue_keys.append(self._get_queue_key(shard))
+
+                    p.execute_command(
+                        "EVALSHA",
+                        add_buffer_sha,
+                        1,
+                        project_and_trace,
+                        parent_span_id,
+                        self.redis_ttl,
+                        *span_args,
+                    )
+
+                    # All spans of a subsegment belong to the same trace.
+                    shard = self.assigned_shards[
+                        int(subsegment[0].trace_id, 16) % len(self.assigned_shards)
+                    ]
+                    queue_keys.append(self._get_queue_key(shard))
 
                 results = p.execute()
 
@@ -221,31 +243,37 @@ class SpansBuffer:
 
             assert len(queue_keys) == len(results)
 
-            for queue_key, (redirect_depth, delete_item, add_item, has_root_span) in zip(
-                queue_keys, results
+            for ((project_and_trace, _), subsegment), queue_key, result in zip(
+                trees.items(), queue_keys, results
             ):
+                redirect_depth, add_item, has_root_span = result
                 min_redirect_depth = min(min_redirect_depth, redirect_depth)
                 max_redirect_depth = max(max_redirect_depth, redirect_depth)
 
                 delete_set = queue_deletes.setdefault(queue_key, set())
-                delete_set.add(delete_item)
+                zadd_items = queue_adds.setdefault(queue_key, {})
+
+                # The sets of all spans in the subsegment have been merged into
+                # the set at `add_item`.
+                for span in subsegment:
+                    delete_item = f"span-buf:s:{{{project_and_trace}}}:{span.span_id}".encode()
+                    delete_set.add(delete_item)
+                    if delete_item != add_item:
+                        zadd_items.pop(delete_item, None)
+
                 # if we are going to add this item, we should not need to
                 # delete it from redis
                 delete_set.discard(add_item)
 
-                # if the currently processed span is a root span, OR the buffer
-                # already had a root span inside, use a different timeout than
-                # usual.
+                # if the subsegment contains a root span, OR the buffer already
+                # had a root span inside, use a different timeout than usual.
                 if has_root_span:
-                    has_root_span_count += 1
+                    has_root_span_count += len(subsegment)
                     offset = self.span_buffer_root_timeout_secs
                 else:
                     offset = self.span_buffer_timeout_secs
 
-                zadd_items = queue_adds.setdefault(queue_key, {})
                 zadd_items[add_item] = now + offset
-                if delete_item != add_item:
-                    zadd_items.pop(delete_item, None)
 
             with self.client.pipeline(transaction=False) as p:
                 for queue_key, adds in queue_adds.items():
@@ -265,6 +293,21 @@ class SpansBuffer:
         metrics.gauge("spans.buffer.min_redirect_depth", min_redirect_depth)
         metrics.gauge("spans.buffer.max_redirect_depth", max_redirect_depth)
 
+    def get_memory_info(self) -> Generator[ServiceMemory]:
+        return iter_cluster_memory_usage(self.client)
+
+    def is_memory_exceeded(self, max_memory_percentage: float) -> bool:
+        """
+        Returns whether any of the Redis nodes uses more than
+        `max_memory_percentage` of its maximum memory.
+        """
+        if max_memory_percentage >= 1.0:
+            return False
+
+        return any(
+            memory.percentage > max_memory_percentage for memory in self.get_memory_info()
+        )
+
     def _ensure_script(self):
         if self.add_buffer_sha is not None:
             if self.client.script_exists(self.add_buffer_sha)[0]:
@@ -316,7 +359,12 @@ class SpansBuffer:
                 for shard in self.assigned_shards:
                     key = self._get_queue_key(shard)
                     p.zrangebyscore(
-                        key, 0, cutoff, start=0 if max_segments else None, num=max_segments or None
+                        key,
+                        0,
+                        cutoff,
+                        start=0 if max_segments else None,
+                        num=max_segments or None,
+                        withscores=True,
                     )
                     p.zcard(key)
                     queue_keys.append(key)
@@ -325,27 +373,35 @@ class SpansBuffer:
 
         segment_keys: list[tuple[QueueKey, SegmentKey]] = []
         queue_sizes = []
+        flush_lags = []
 
-        with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
-            with self.client.pipeline(transaction=False) as p:
-                # ZRANGEBYSCORE output
-                for queue_key, segment_span_ids in zip(queue_keys, result):
-                    # process return value of zrevrangebyscore
-                    for segment_key in segment_span_ids:
-                        segment_keys.append((queue_key, segment_key))
-                        p.smembers(segment_key)
+        # ZRANGEBYSCORE output
+        for queue_key, segment_span_ids in zip(queue_keys, result):
+            # process return value of zrevrangebyscore
+            for segment_key, _ in segment_span_ids:
+                segment_keys.append((queue_key, segment_key))
 
-                    # ZCARD output
-                    queue_sizes.append(next(result))
+            # How long the oldest segment has been waiting past its flush
+            # deadline.
+            flush_lags.append(cutoff - segment_span_ids[0][1] if segment_span_ids else 0)
 
-                segments = p.execute()
+            # ZCARD output
+            queue_sizes.append(next(result))
 
-        for shard_i, queue_size in zip(self.assigned_shards, queue_sizes):
+        with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
+            segments = self._load_segment_data([segment_key for _, segment_key in segment_keys])
+
+        for shard_i, queue_size, flush_lag in zip(self.assigned_shards, queue_sizes, flush_lags):
             metrics.timing(
                 "spans.buffer.flush_segments.queue_size",
                 queue_size,
                 tags={"shard_i": shard_i},
             )
+            metrics.timing(
+                "spans.buffer.flush_segments.flush_lag",
+                flush_lag,
+                tags={"shard_i": shard_i},
+            )
 
         return_segments = {}
 
@@ -394,6 +450,61 @@ class SpansBuffer:
 
         return return_segments
 
+    def _load_segment_data(self, segment_keys: list[SegmentKey]) -> list[set[bytes]]:
+        """
+        Loads the span payloads of the given segments.
+
+        Segment sets are paged through with SSCAN, so that Redis never has to
+        serialize a huge set at once. Small sets are read with a single call,
+        while the pages of all large sets are read in parallel until each of
+        them is exhausted. Payloads of a segment that exceed
+        `max_segment_bytes` are dropped, except for the segment span itself,
+        which is always kept.
+        """
+        payloads: list[set[bytes]] = [set() for _ in segment_keys]
+        sizes = [0] * len(segment_keys)
+        dropped_spans = [0] * len(segment_keys)
+        dropped_bytes = [0] * len(segment_keys)
+        cursors = {index: 0 for index in range(len(segment_keys))}
+
+        while cursors:
+            with self.client.pipeline(transaction=False) as p:
+                for index, cursor in cursors.items():
+                    p.sscan(segment_keys[index], cursor=cursor, count=self.segment_page_size)
+                pages = p.execute()
+
+            next_cursors = {}
+            for (index, _), (cursor, page) in zip(cursors.items(), pages):
+                segment_payloads = payloads[index]
+                for payload in page:
+                    # SSCAN may return the same member more than once.
+                    if payload in segment_payloads:
+                        continue
+
+                    if (
+                        self.max_segment_bytes
+                        and sizes[index] + len(payload) > self.max_segment_bytes
+                        and not _is_segment_span_payload(segment_keys[index], payload)
+                    ):
+                        dropped_spans[index] += 1
+                        dropped_bytes[index] += len(payload)
+                        continue
+
+                    sizes[index] += len(payload)
+                    segment_payloads.add(payload)
+
+                if cursor:
+                    next_cursors[index] = cursor
+
+            cursors = next_cursors
+
+        for num_spans, num_bytes in zip(dropped_spans, dropped_bytes):
+            if num_spans:
+                metrics.incr("spans.buffer.flush_segments.segment_size_exceeded", amount=num_spans)
+                metrics.timing("spans.buffer.flush_segments.segment_bytes_dropped", num_bytes)
+
+        return payloads
+
     def done_flush_segments(self, segment_keys: dict[SegmentKey, FlushedSegment]):
         metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segment_keys))
         with metrics.timer("spans.buffer.done_flush_segments"):
@@ -36,6 +36,9 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         max_flush_segments: int,
         input_block_size: int | None,
         output_block_size: int | None,
+        flusher_processes: int = 1,
+        max_memory_percentage: float = 1.0,
+        max_segment_bytes: int = 0,
         produce_to_pipe: Callable[[KafkaPayload], None] | None = None,
     ):
         super().__init__()
@@ -47,6 +50,9 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
         self.num_processes = num_processes
+        self.flusher_processes = flusher_processes
+        self.max_memory_percentage = max_memory_percentage
+        self.max_segment_bytes = max_segment_bytes
         self.produce_to_pipe = produce_to_pipe
 
         if self.num_processes != 1:
@@ -59,7 +65,10 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     ) -> ProcessingStrategy[KafkaPayload]:
         committer = CommitOffsets(commit)
 
-        buffer = SpansBuffer(assigned_shards=[p.index for p in partitions])
+        buffer = SpansBuffer(
+            assigned_shards=[p.index for p in partitions],
+            max_segment_bytes=self.max_segment_bytes,
+        )
 
         # patch onto self just for testing
         flusher: ProcessingStrategy[FilteredPayload | int]
@@ -69,6 +78,8 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             self.max_flush_segments,
             self.produce_to_pipe,
             next_step=committer,
+            max_memory_percentage=self.max_memory_percentage,
+            max_processes=self.flusher_processes,
         )
 
         if self.num_processes != 1:
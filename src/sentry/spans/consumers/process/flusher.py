@@ -6,7 +6,7 @@ from collections.abc import Callable
 import rapidjson
 from arroyo import Topic as ArroyoTopic
 from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_configuration
-from arroyo.processing.strategies.abstract import ProcessingStrategy
+from arroyo.processing.strategies.abstract import MessageRejected, ProcessingStrategy
 from arroyo.types import FilteredPayload, Message
 
 from sentry.conf.types.kafka_definition import Topic
@@ -14,19 +14,33 @@ from sentry.spans.buffer import SpansBuffer
 from sentry.utils import metrics
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
 
+# How often each flusher process samples the memory usage of the Redis nodes.
+MEMORY_CHECK_INTERVAL = 5
+
 
 class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
     """
-    A background thread that polls Redis for new segments to flush and to produce to Kafka.
+    Background processes that poll Redis for new segments to flush and to produce to Kafka.
 
     This is a processing step to be embedded into the consumer that writes to
     Redis. It takes and fowards integer messages that represent recently
     processed timestamps (from the producer timestamp of the incoming span
     message), which are then used as a clock to determine whether segments have expired.
 
+    The shards assigned to the consumer are distributed across up to
+    `max_processes` flusher processes, so that a backlog in one shard only
+    delays the segments of shards flushed by the same process. Processes that
+    die are restarted.
+
+    The flusher rejects messages, and thereby stops the consumer from adding
+    more spans to Redis, while any of its processes is falling behind or while
+    the memory usage of Redis exceeds `max_memory_percentage`.
+
     :param topic: The topic to send segments to.
     :param max_flush_segments: How many segments to flush at once in a single Redis call.
+    :param max_memory_percentage: The fraction of the maximum memory of the Redis nodes above which backpressure is applied.
     :param produce_to_pipe: For unit-testing, produce to this multiprocessing Pipe instead of creating a kafka consumer.
+    :param max_processes: The maximum number of flusher processes to start.
     """
 
     def __init__(
@@ -35,46 +49,78 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
         max_flush_segments: int,
         produce_to_pipe: Callable[[KafkaPayload], None] | None,
         next_step: ProcessingStrategy[FilteredPayload | int],
+        max_memory_percentage: float = 1.0,
+        max_processes: int = 1,
     ):
         self.buffer = buffer
         self.max_flush_segments = max_flush_segments
+        self.max_memory_percentage = max_memory_percentage
+        self.produce_to_pipe = produce_to_pipe
         self.next_step = next_step
 
         self.stopped = multiprocessing.Value("i", 0)
         self.current_drift = multiprocessing.Value("i", 0)
 
+        num_processes = max(1, min(max_processes, len(buffer.assigned_shards)))
+        self.process_shards = [
+            buffer.assigned_shards[i::num_processes] for i in range(num_processes)
+        ]
+        # Timestamps since which each process has been falling behind or
+        # has observed Redis exceeding the memory budget, or 0.
+        self.process_backpressure_since = [
+            multiprocessing.Value("i", 0) for _ in self.process_shards
+        ]
+        self.processes: list[multiprocessing.Process | threading.Thread] = [
+            self._create_process(i) for i in range(num_processes)
+        ]
+
+    def _create_process(self, process_index: int) -> multiprocessing.Process | threading.Thread:
         from sentry.utils.arroyo import _get_arroyo_subprocess_initializer
 
         make_process: Callable[..., multiprocessing.Process | threading.Thread]
-        if produce_to_pipe is None:
+        if self.produce_to_pipe is None:
             initializer = _get_arroyo_subprocess_initializer(None)
             make_process = multiprocessing.Process
         else:
             initializer = None
             make_process = threading.Thread
 
-        self.process = make_process(
+        buffer = SpansBuffer(
+            assigned_shards=self.process_shards[process_index],
+            span_buffer_timeout_secs=self.buffer.span_buffer_timeout_secs,
+            span_buffer_root_timeout_secs=self.buffer.span_buffer_root_timeout_secs,
+            redis_ttl=self.buffer.redis_ttl,
+            max_segment_bytes=self.buffer.max_segment_bytes,
+            segment_page_size=self.buffer.segment_page_size,
+        )
+
+        process = make_process(
             target=SpanFlusher.main,
             args=(
                 initializer,
                 self.stopped,
                 self.current_drift,
-                self.buffer,
+                self.process_backpressure_since[process_index],
+                buffer,
                 self.max_flush_segments,
-                produce_to_pipe,
+                self.max_memory_percentage,
+                self.produce_to_pipe,
             ),
             daemon=True,
         )
 
-        self.process.start()
+        process.start()
+        return process
 
     @staticmethod
     def main(
         initializer: Callable | None,
         stopped,
         current_drift,
+        backpressure_since,
         buffer: SpansBuffer,
         max_flush_segments: int,
+        max_memory_percentage: float,
         produce_to_pipe: Callable[[KafkaPayload], None] | None,
     ) -> None:
         try:
@@ -98,35 +144,53 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                 def produce(payload: KafkaPayload) -> None:
                     producer_futures.append(producer.produce(topic, payload))
 
+            memory_exceeded = False
+            next_memory_check = 0.0
+
             while not stopped.value:
+                if time.monotonic() >= next_memory_check:
+                    memory_exceeded = buffer.is_memory_exceeded(max_memory_percentage)
+                    next_memory_check = time.monotonic() + MEMORY_CHECK_INTERVAL
+
                 now = int(time.time()) + current_drift.value
                 flushed_segments = buffer.flush_segments(max_segments=max_flush_segments, now=now)
 
+                # If every shard returned a full batch of segments, more are
+                # likely ready to be flushed and this process is falling behind.
+                max_segments = max_flush_segments * len(buffer.assigned_shards)
+                is_behind = bool(max_segments) and len(flushed_segments) >= max_segments
+                if is_behind or memory_exceeded:
+                    if not backpressure_since.value:
+                        backpressure_since.value = int(time.time())
+                else:
+                    backpressure_since.value = 0
+
                 if not flushed_segments:
                     time.sleep(1)
                     continue
 
-                for _, flushed_segment in flushed_segments.items():
-                    if not flushed_segment.spans:
-                        # This is a bug, most likely the input topic is not
-                        # partitioned by trace_id so multiple consumers are writing
-                        # over each other. The consequence is duplicated segments,
-                        # worst-case.
-                        metrics.incr("sentry.spans.buffer.empty_segments")
-                        continue
+                with metrics.timer("spans.buffer.flusher.produce"):
+                    for _, flushed_segment in flushed_segments.items():
+                        if not flushed_segment.spans:
+                            # This is a bug, most likely the input topic is not
+                            # partitioned by trace_id so multiple consumers are writing
+                            # over each other. The consequence is duplicated segments,
+                            # worst-case.
+                            metrics.incr("sentry.spans.buffer.empty_segments")
+                            continue
 
-                    spans = [span.payload for span in flushed_segment.spans]
+                        spans = [span.payload for span in flushed_segment.spans]
 
-                    kafka_payload = KafkaPayload(
-                        None, rapidjson.dumps({"spans": spans}).encode("utf8"), []
-                    )
+                        kafka_payload = KafkaPayload(
+                            None, rapidjson.dumps({"spans": spans}).encode("utf8"), []
+                        )
 
-                    produce(kafka_payload)
+                        produce(kafka_payload)
 
-                for future in producer_futures:
-                    future.result()
+                    for future in producer_futures:
+                        future.result()
 
-                producer_futures.clear()
+                    producer_futures.clear()
 
                 buffer.done_flush_segments(flushed_segments)
 
@@ -135,12 +199,31 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
         except KeyboardInterrupt:
             pass
 
+    def _ensure_processes_alive(self) -> None:
+        if self.stopped.value:
+            return
+
+        for process_index, process in enumerate(self.processes):
+            if not process.is_alive():
+                metrics.incr("spans.buffer.flusher.process_restarted")
+                self.process_backpressure_since[process_index].value = 0
+                self.processes[process_index] = self._create_process(process_index)
+
     def poll(self) -> None:
+        self._ensure_processes_alive()
         self.next_step.poll()
 
     def submit(self, message: Message[FilteredPayload | int]) -> None:
+        # Update the clock before applying backpressure, so that the flushers
+        # keep catching up with the segments that are already buffered.
         if isinstance(message.payload, int):
             self.current_drift.value = message.payload - int(time.time())
+
+        for backpressure_since in self.process_backpressure_since:
+            if backpressure_since.value:
+                metrics.incr("spans.buffer.flusher.backpressure")
+                raise MessageRejected()
+
         self.next_step.submit(message)
 
     def terminate(self) -> None:
@@ -159,8 +242,11 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
 
         self.next_step.join(timeout)
 
-        while self.process.is_alive() and (deadline is None or deadline > time.time()):
+        while any(process.is_alive() for process in self.processes) and (
+            deadline is None or deadline > time.time()
+        ):
             time.sleep(0.1)
 
-        if isinstance(self.process, multiprocessing.Process):
-            self.process.terminate()
+        for process in self.processes:
+            if isinstance(process, multiprocessing.Process):
+                process.terminate()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Sequence
+from functools import cached_property
+from typing import overload
+
+from sentry.spans.consumers.process_segments.types import Span
+
+
+class SegmentColumns(Sequence[Span]):
+    """
+    Columnar view of the spans of a segment.
+
+    Timestamps and parent relationships are extracted from the span payloads
+    once when the columns are created, so that passes over the entire segment
+    work on compact arrays instead of repeatedly looking up values in the span
+    dicts. The spans remain accessible by index and are the source of truth for
+    everything else; enrichment still updates them in place.
+
+    Spans are identified by their index in the segment. If several spans share
+    the same ID, the first one represents that ID in the span tree.
+    """
+
+    def __init__(self, spans: list[Span]) -> None:
+        self.spans = spans
+        self.start = array("d", (span["start_timestamp_precise"] for span in spans))
+        self.end = array("d", (span["end_timestamp_precise"] for span in spans))
+
+        index_by_id: dict[str, int] = {}
+        for index, span in enumerate(spans):
+            index_by_id.setdefault(span["span_id"], index)
+
+        # The index of the span representing each span's ID in the tree, and of
+        # its parent, or -1 if the parent is not part of the segment.
+        self._node = array("l", (index_by_id[span["span_id"]] for span in spans))
+        self.parent = array(
+            "l", (index_by_id.get(span.get("parent_span_id") or "", -1) for span in spans)
+        )
+
+        self._children: list[list[int]] = [[] for _ in spans]
+        for index, parent in enumerate(self.parent):
+            if parent >= 0:
+                self._children[parent].append(index)
+
+    @classmethod
+    def of(cls, spans: Sequence[Span]) -> SegmentColumns:
+        if isinstance(spans, cls):
+            return spans
+        return cls(list(spans))
+
+    @cached_property
+    def ops(self) -> list[str]:
+        # Resolved lazily since ops are only guaranteed after `match_schemas`.
+        return [span["op"] for span in self.spans]
+
+    @overload
+    def __getitem__(self, index: int) -> Span: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Span]: ...
+
+    def __getitem__(self, index: int | slice) -> Span | list[Span]:
+        return self.spans[index]
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[Span]:
+        return iter(self.spans)
+
+    def get_children(self, index: int) -> list[int]:
+        """
+        Returns the indices of the direct children of the span at ``index``.
+        """
+        return self._children[self._node[index]]
+
+    def tree_order(self) -> list[int]:
+        """
+        Returns the indices of the spans in depth-first order of the span tree.
+
+        The traversal starts at the segment span and visits siblings in order of
+        their start timestamp. Spans that are not connected to the segment span
+        follow as separate trees, again ordered by start timestamp. Of several
+        spans sharing the same ID, only the first one is included.
+
+        This is the order in which performance issue detectors expect spans.
+        """
+
+        start = self.start
+        node = self._node
+        visited = bytearray(len(self.spans))
+        order: list[int] = []
+
+        def visit(root: int) -> None:
+            stack = [root]
+            while stack:
+                index = stack.pop()
+                if not visited[index]:
+                    order.append(index)
+                    visited[index] = 1
+
+                for child in sorted(self._children[index], key=start.__getitem__, reverse=True):
+                    # Skip spans reusing the ID of an earlier span.
+                    if not visited[child] and node[child] == child:
+                        stack.append(child)
+
+        segment_index = None
+        for index, span in enumerate(self.spans):
+            if span.get("is_segment"):
+                segment_index = self._node[index]
+        if segment_index is not None:
+            visit(segment_index)
+
+        # Catch all for orphan spans
+        nodes = [index for index, node_index in enumerate(node) if index == node_index]
+        for index in sorted(nodes, key=start.__getitem__):
+            if not visited[index]:
+                visit(index)
+
+        return order
@@ -1,5 +1,7 @@
+from collections.abc import Sequence
 from typing import Any, cast
 
+from sentry.spans.consumers.process_segments.columns import SegmentColumns
 from sentry.spans.consumers.process_segments.types import Span
 
 # Keys in `sentry_tags` that are shared across all spans in a segment. This list
@@ -56,7 +58,7 @@ def match_schemas(spans) -> None:
         span["op"] = sentry_tags.get("op") or DEFAULT_SPAN_OP
 
 
-def set_shared_tags(segment: Span, spans: list[Span]) -> None:
+def set_shared_tags(segment: Span, spans: Sequence[Span]) -> None:
     """
     Extracts tags from the segment span and materializes them into all spans.
     """
@@ -67,12 +69,13 @@ def set_shared_tags(segment: Span, spans: list[Span]) -> None:
     segment_tags = segment.get("sentry_tags", {})
     shared_tags = {k: v for k, v in segment_tags.items() if k in SHARED_TAG_KEYS}
 
+    columns = SegmentColumns.of(spans)
     is_mobile = segment_tags.get("mobile") == "true"
     mobile_start_type = _get_mobile_start_type(segment)
-    ttid_ts = _timestamp_by_op(spans, "ui.load.initial_display")
-    ttfd_ts = _timestamp_by_op(spans, "ui.load.full_display")
+    ttid_ts = _timestamp_by_op(columns, "ui.load.initial_display")
+    ttfd_ts = _timestamp_by_op(columns, "ui.load.full_display")
 
-    for span in spans:
+    for span, end in zip(columns, columns.end):
         span_tags = cast(dict[str, Any], span["sentry_tags"])
 
         if is_mobile:
@@ -84,9 +87,9 @@ def set_shared_tags(segment: Span, spans: list[Span]) -> None:
             if not span_tags.get("app_start_type") and mobile_start_type:
                 span_tags["app_start_type"] = mobile_start_type
 
-        if ttid_ts is not None and span["end_timestamp_precise"] <= ttid_ts:
+        if ttid_ts is not None and end <= ttid_ts:
             span_tags["ttid"] = "ttid"
-        if ttfd_ts is not None and span["end_timestamp_precise"] <= ttfd_ts:
+        if ttfd_ts is not None and end <= ttfd_ts:
             span_tags["ttfd"] = "ttfd"
 
         for key, value in shared_tags.items():
@@ -109,14 +112,14 @@ def _get_mobile_start_type(segment: Span) -> str | None:
     return None
 
 
-def _timestamp_by_op(spans: list[Span], op: str) -> float | None:
-    for span in spans:
-        if span["op"] == op:
-            return span["end_timestamp_precise"]
-    return None
+def _timestamp_by_op(spans: SegmentColumns, op: str) -> float | None:
+    try:
+        return spans.end[spans.ops.index(op)]
+    except ValueError:
+        return None
 
 
-def set_exclusive_time(spans: list[Span]) -> None:
+def set_exclusive_time(spans: Sequence[Span]) -> None:
     """
     Sets the exclusive time on all spans in the list.
 
@@ -124,19 +127,20 @@ def set_exclusive_time(spans: list[Span]) -> None:
     of all time intervals where no child span was active.
     """
 
-    span_map: dict[str, list[tuple[int, int]]] = {}
-    for span in spans:
-        if parent_span_id := span.get("parent_span_id"):
-            interval = (_us(span["start_timestamp_precise"]), _us(span["end_timestamp_precise"]))
-            span_map.setdefault(parent_span_id, []).append(interval)
+    columns = SegmentColumns.of(spans)
+    # microseconds to prevent rounding issues
+    starts_us = [_us(timestamp) for timestamp in columns.start]
+    ends_us = [_us(timestamp) for timestamp in columns.end]
 
-    for span in spans:
-        intervals = span_map.get(span["span_id"], [])
+    for index, span in enumerate(columns):
         # Sort by start ASC, end DESC to skip over nested intervals efficiently
-        intervals.sort(key=lambda x: (x[0], -x[1]))
+        intervals = sorted(
+            ((starts_us[child], ends_us[child]) for child in columns.get_children(index)),
+            key=lambda x: (x[0], -x[1]),
+        )
 
-        exclusive_time_us: int = 0  # microseconds to prevent rounding issues
-        start, end = _us(span["start_timestamp_precise"]), _us(span["end_timestamp_precise"])
+        exclusive_time_us: int = 0
+        start, end = starts_us[index], ends_us[index]
 
         # Progressively add time gaps before the next span and then skip to its end.
         for child_start, child_end in intervals:
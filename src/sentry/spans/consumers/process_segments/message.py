@@ -1,6 +1,5 @@
 import logging
 import uuid
-from copy import deepcopy
 from typing import Any, cast
 
 from django.core.exceptions import ValidationError
@@ -23,6 +22,7 @@ from sentry.receivers.onboarding import (
     record_first_transaction,
     record_release_received,
 )
+from sentry.spans.consumers.process_segments.columns import SegmentColumns
 from sentry.spans.consumers.process_segments.enrichment import (
     match_schemas,
     set_exclusive_time,
@@ -41,7 +41,7 @@ logger = logging.getLogger(__name__)
 def process_segment(unprocessed_spans: list[UnprocessedSpan]) -> list[Span]:
     segment_span, spans = _enrich_spans(unprocessed_spans)
     if segment_span is None:
-        return spans
+        return spans.spans
 
     try:
         with metrics.timer("spans.consumers.process_segments.get_project"):
@@ -54,7 +54,7 @@ def process_segment(unprocessed_spans: list[UnprocessedSpan]) -> list[Span]:
     _detect_performance_problems(segment_span, spans, project)
     _record_signals(segment_span, spans, project)
 
-    return spans
+    return spans.spans
 
 
 def _find_segment_span(spans: list[Span]) -> Span | None:
@@ -77,7 +77,9 @@ def _find_segment_span(spans: list[Span]) -> Span | None:
 
 
 @metrics.wraps("spans.consumers.process_segments.enrich_spans")
-def _enrich_spans(unprocessed_spans: list[UnprocessedSpan]) -> tuple[Span | None, list[Span]]:
+def _enrich_spans(
+    unprocessed_spans: list[UnprocessedSpan],
+) -> tuple[Span | None, SegmentColumns]:
     """
     Enriches all spans with data derived from the span tree and the segment.
 
@@ -85,23 +87,24 @@ def _enrich_spans(unprocessed_spans: list[UnprocessedSpan]) -> tuple[Span | None
     as inferring `exclusive_time`, as well as normalizations that need access to
     the segment, such as extracting shared or conditional attributes.
 
-    Returns the segment span, if any, and the list of enriched spans.
+    Returns the segment span, if any, and the enriched spans.
     """
 
     spans = cast(list[Span], unprocessed_spans)
     segment = _find_segment_span(spans)
 
     match_schemas(spans)
-    set_exclusive_time(spans)
+    columns = SegmentColumns(spans)
+    set_exclusive_time(columns)
     if segment:
-        set_shared_tags(segment, spans)
+        set_shared_tags(segment, columns)
 
     # Calculate grouping hashes for performance issue detection
     config = load_span_grouping_config()
     groupings = config.execute_strategy_standalone(spans)
     groupings.write_to_spans(spans)
 
-    return segment, spans
+    return segment, columns
 
 
 @metrics.wraps("spans.consumers.process_segments.create_models")
@@ -151,7 +154,9 @@ def _create_models(segment: Span, project: Project) -> None:
 
 
 @metrics.wraps("spans.consumers.process_segments.detect_performance_problems")
-def _detect_performance_problems(segment_span: Span, spans: list[Span], project: Project) -> None:
+def _detect_performance_problems(
+    segment_span: Span, spans: SegmentColumns, project: Project
+) -> None:
     if not options.get("standalone-spans.detect-performance-problems.enable"):
         return
 
@@ -198,7 +203,7 @@ def _detect_performance_problems(segment_span: Span, spans: list[Span], project:
         )
 
 
-def _build_shim_event_data(segment_span: Span, spans: list[Span]) -> dict[str, Any]:
+def _build_shim_event_data(segment_span: Span, spans: SegmentColumns) -> dict[str, Any]:
     sentry_tags = segment_span.get("sentry_tags", {})
 
     event: dict[str, Any] = {
@@ -234,19 +239,21 @@ def _build_shim_event_data(segment_span: Span, spans: list[Span]) -> dict[str, A
         event["contexts"]["profile"] = {"profile_id": profile_id, "type": "profile"}
 
     # Add legacy span attributes required only by issue detectors. As opposed to
-    # real event payloads, this also adds the segment span so detectors can run
-    # topological sorting on the span tree.
-    for span in spans:
-        event_span = cast(dict[str, Any], deepcopy(span))
-        event_span["start_timestamp"] = span["start_timestamp_precise"]
-        event_span["timestamp"] = span["end_timestamp_precise"]
+    # real event payloads, this also adds the segment span. Detectors expect
+    # spans in depth-first order of the span tree, like in transaction events.
+    # They don't modify spans, so a shallow copy is enough to add the legacy
+    # attributes without duplicating nested payloads.
+    for index in spans.tree_order():
+        event_span = cast(dict[str, Any], {**spans[index]})
+        event_span["start_timestamp"] = spans.start[index]
+        event_span["timestamp"] = spans.end[index]
         event["spans"].append(event_span)
 
     return event
 
 
 @metrics.wraps("spans.consumers.process_segments.record_signals")
-def _record_signals(segment_span: Span, spans: list[Span], project: Project) -> None:
+def _record_signals(segment_span: Span, spans: SegmentColumns, project: Project) -> None:
     # TODO: Make transaction name clustering work again
     # record_transaction_name_for_clustering(project, event.data)
 
@@ -46,11 +46,13 @@ class TagStorage(Service):
             "get_groups_user_counts",
             "get_generic_groups_user_counts",
             "get_group_tag_value_count",
+            "get_groups_tag_value_count",
             "get_top_group_tag_values",
             "get_first_release",
             "get_last_release",
             "get_release_tags",
             "get_group_tag_keys_and_top_values",
+            "get_groups_tag_keys_and_top_values",
             "get_tag_value_paginator",
             "get_group_tag_value_paginator",
             "get_tag_value_paginator_for_projects",
@@ -320,3 +322,38 @@ class TagStorage(Service):
                 tk.count = self.get_group_tag_value_count(group, environment_id, tk.key)
 
         return tag_keys
+
+    def get_groups_tag_value_count(
+        self, groups: Sequence[Group], environment_id, key: str, tenant_ids=None
+    ) -> dict[int, int]:
+        """
+        >>> get_groups_tag_value_count([group1, group2], 3, 'key1')
+        """
+        return {
+            group.id: self.get_group_tag_value_count(group, environment_id, key, tenant_ids)
+            for group in groups
+        }
+
+    def get_groups_tag_keys_and_top_values(
+        self,
+        groups: Sequence[Group],
+        environment_ids,
+        keys: list[str] | None = None,
+        value_limit=TOP_VALUES_DEFAULT_LIMIT,
+        tenant_ids=None,
+        **kwargs,
+    ):
+        """
+        >>> get_groups_tag_keys_and_top_values([group1, group2], [3], ['key1'])
+        """
+        return {
+            group.id: self.get_group_tag_keys_and_top_values(
+                group,
+                environment_ids,
+                keys=keys,
+                value_limit=value_limit,
+                tenant_ids=tenant_ids,
+                **kwargs,
+            )
+            for group in groups
+        }
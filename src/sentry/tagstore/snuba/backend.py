@@ -12,7 +12,19 @@ import sentry_sdk
 from dateutil.parser import parse as parse_datetime
 from django.core.cache import cache
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
-from snuba_sdk import Column, Condition, Direction, Entity, Function, Op, OrderBy, Query, Request
+from snuba_sdk import (
+    Column,
+    Condition,
+    Direction,
+    Entity,
+    Function,
+    Limit,
+    LimitBy,
+    Op,
+    OrderBy,
+    Query,
+    Request,
+)
 
 from sentry import features, options
 from sentry.api.paginator import SequencePaginator
@@ -45,7 +57,10 @@ from sentry.tagstore.types import GroupTagKey, GroupTagValue, TagKey, TagValue
 from sentry.utils import metrics, snuba
 from sentry.utils.hashlib import md5_text
 from sentry.utils.snuba import (
+    QueryOutsideGroupActivityError,
+    QueryOutsideRetentionError,
     _prepare_start_end,
+    bulk_snuba_queries,
     get_organization_id_from_project_ids,
     get_snuba_translators,
     nest_groups,
@@ -74,6 +89,12 @@ FUZZY_NUMERIC_KEYS = frozenset(
 )
 FUZZY_NUMERIC_DISTANCE = 50
 
+# Maximum number of groups whose tag keys and top values are fetched by a single
+# pair of Snuba queries. Batches are made smaller when the expected number of rows
+# per batch exceeds the row limit, and split further if a query hits the limit.
+BULK_GROUP_TAGS_BATCH_SIZE = 20
+BULK_GROUP_TAGS_ROW_LIMIT = 10000
+
 # Since all event types are currently stored together, we need to manually exclude transactions
 # when querying the events dataset. This condition can be dropped once we cut over to the errors
 # storage in Snuba.
@@ -746,6 +767,219 @@ class SnubaTagStorage(TagStorage):
 
         return keys_with_counts
 
+    def get_groups_tag_value_count(
+        self, groups: Sequence[Group], environment_id, key: str, tenant_ids=None
+    ) -> dict[int, int]:
+        """
+        Bulk version of ``get_group_tag_value_count``, running one query per
+        dataset instead of one per group.
+        """
+        tag = self.format_string.format(key)
+        counts = {group.id: 0 for group in groups}
+        for dataset, dataset_groups in self.__group_by_dataset(groups).items():
+            filters = {
+                "project_id": sorted({group.project_id for group in dataset_groups}),
+                "group_id": [group.id for group in dataset_groups],
+            }
+            if environment_id:
+                filters["environment"] = [environment_id]
+
+            result = snuba.query(
+                dataset=dataset,
+                groupby=["group_id"],
+                conditions=[[tag, "!=", ""]],
+                filter_keys=filters,
+                aggregations=[["count()", "", "count"]],
+                referrer="tagstore.get_groups_tag_value_count",
+                tenant_ids=tenant_ids,
+            )
+            counts.update(result)
+        return counts
+
+    def get_groups_tag_keys_and_top_values(
+        self,
+        groups: Sequence[Group],
+        environment_ids: list[int],
+        keys: list[str] | None = None,
+        value_limit: int = TOP_VALUES_DEFAULT_LIMIT,
+        tenant_ids=None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        **kwargs,
+    ) -> dict[int, set[GroupTagKey]]:
+        """
+        Bulk version of ``get_group_tag_keys_and_top_values``.
+
+        Rather than querying every group separately, the tag key totals and the
+        top values of batches of groups are each fetched by one query grouped by
+        group, using ``LIMIT BY`` to keep ``value_limit`` values per group and
+        key. All queries are sent to Snuba together and go through the query
+        cache, so repeated summaries of the same groups are shared. A batch whose
+        query returns as many rows as the row limit is split and queried again.
+        """
+        if not groups:
+            return {}
+        if kwargs.get("conditions") or kwargs.get("aggregations"):
+            # Legacy conditions and aggregations are only supported per group
+            return super().get_groups_tag_keys_and_top_values(
+                groups,
+                environment_ids,
+                keys=keys,
+                value_limit=value_limit,
+                tenant_ids=tenant_ids,
+                start=start,
+                end=end,
+                **kwargs,
+            )
+
+        batch_size = BULK_GROUP_TAGS_BATCH_SIZE
+        if keys is not None:
+            rows_per_group = max(len(keys) * value_limit, 1)
+            batch_size = max(min(batch_size, BULK_GROUP_TAGS_ROW_LIMIT // rows_per_group), 1)
+        pending = [
+            (dataset, dataset_groups[i : i + batch_size])
+            for dataset, dataset_groups in self.__group_by_dataset(groups).items()
+            for i in range(0, len(dataset_groups), batch_size)
+        ]
+
+        keys_by_group: dict[int, dict[str, GroupTagKey]] = defaultdict(dict)
+        top_values: dict[tuple[int, str], list[GroupTagValue]] = defaultdict(list)
+        while pending:
+            batches = []
+            requests = []
+            for dataset, batch in pending:
+                batch_requests = self.__get_groups_tag_keys_and_top_values_requests(
+                    dataset, batch, environment_ids, keys, value_limit, tenant_ids, start, end
+                )
+                if batch_requests is not None:
+                    batches.append((dataset, batch))
+                    requests.extend(batch_requests)
+            if not requests:
+                break
+
+            results = bulk_snuba_queries(
+                requests, referrer="tagstore.get_groups_tag_keys_and_top_values", use_cache=True
+            )
+
+            pending = []
+            for (dataset, batch), totals_result, values_result in zip(
+                batches, results[::2], results[1::2]
+            ):
+                truncated = (
+                    len(totals_result["data"]) >= BULK_GROUP_TAGS_ROW_LIMIT
+                    or len(values_result["data"]) >= BULK_GROUP_TAGS_ROW_LIMIT
+                )
+                if truncated and len(batch) > 1:
+                    middle = len(batch) // 2
+                    pending.extend([(dataset, batch[:middle]), (dataset, batch[middle:])])
+                    continue
+                if truncated:
+                    metrics.incr("tagstore.get_groups_tag_keys_and_top_values.truncated")
+
+                for row in totals_result["data"]:
+                    group_id, key = row["group_id"], row[self.key_column]
+                    keys_by_group[group_id][key] = GroupTagKey(
+                        group_id=group_id, key=key, count=row["count"]
+                    )
+                for row in values_result["data"]:
+                    group_id, key = row["group_id"], row[self.key_column]
+                    top_values[group_id, key].append(
+                        GroupTagValue(
+                            group_id=group_id,
+                            key=key,
+                            value=row[self.value_column],
+                            times_seen=row["count"],
+                            first_seen=parse_datetime(row["first_seen"]),
+                            last_seen=parse_datetime(row["last_seen"]),
+                        )
+                    )
+
+        result: dict[int, set[GroupTagKey]] = {}
+        for group in groups:
+            tag_keys = keys_by_group.get(group.id, {})
+            for key, keyobj in tag_keys.items():
+                keyobj.top_values = tuple(top_values.get((group.id, key), ()))
+            result[group.id] = set(tag_keys.values())
+        return result
+
+    def __get_groups_tag_keys_and_top_values_requests(
+        self,
+        dataset: Dataset,
+        groups: Sequence[Group],
+        environment_ids: list[int],
+        keys: list[str] | None,
+        value_limit: int,
+        tenant_ids,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> list[Request] | None:
+        """
+        Build the tag key totals and top values queries for a batch of groups,
+        or return None if the batch has no data within retention.
+        """
+        project_ids = sorted({group.project_id for group in groups})
+        group_ids = [group.id for group in groups]
+        organization_id = get_organization_id_from_project_ids(project_ids)
+        try:
+            batch_start, batch_end = _prepare_start_end(start, end, organization_id, group_ids)
+        except (QueryOutsideRetentionError, QueryOutsideGroupActivityError):
+            return None
+
+        key_column = Column(self.key_column)
+        value_column = Column(self.value_column)
+        where = [
+            Condition(Column("project_id"), Op.IN, project_ids),
+            Condition(Column("group_id"), Op.IN, group_ids),
+            Condition(Column("timestamp"), Op.GTE, batch_start),
+            Condition(Column("timestamp"), Op.LT, batch_end),
+        ]
+        translated_params = _translate_filter_keys(project_ids, group_ids, environment_ids)
+        if translated_params.get("environment"):
+            where.append(Condition(Column("environment"), Op.IN, translated_params["environment"]))
+        if keys is not None:
+            where.append(Condition(key_column, Op.IN, keys))
+
+        count = Function("count", [], "count")
+        totals_query = Query(
+            match=Entity(dataset.value),
+            select=[Column("group_id"), key_column, count],
+            where=where,
+            groupby=[Column("group_id"), key_column],
+            limit=Limit(BULK_GROUP_TAGS_ROW_LIMIT),
+        )
+        values_query = Query(
+            match=Entity(dataset.value),
+            select=[
+                Column("group_id"),
+                key_column,
+                value_column,
+                count,
+                Function("min", [Column(SEEN_COLUMN)], "first_seen"),
+                Function("max", [Column(SEEN_COLUMN)], "last_seen"),
+            ],
+            where=where,
+            groupby=[Column("group_id"), key_column, value_column],
+            orderby=[OrderBy(Column("count"), Direction.DESC)],
+            limitby=LimitBy([Column("group_id"), key_column], value_limit),
+            limit=Limit(BULK_GROUP_TAGS_ROW_LIMIT),
+        )
+        return [
+            Request(
+                dataset=dataset.value,
+                app_id="tagstore",
+                query=query,
+                tenant_ids=tenant_ids or {"organization_id": organization_id},
+            )
+            for query in (totals_query, values_query)
+        ]
+
+    def __group_by_dataset(self, groups: Sequence[Group]) -> dict[Dataset, list[Group]]:
+        groups_by_dataset: dict[Dataset, list[Group]] = defaultdict(list)
+        for group in groups:
+            dataset, _ = self.apply_group_filters(group, {})
+            groups_by_dataset[dataset].append(group)
+        return groups_by_dataset
+
     def get_release_tags(self, organization_id, project_ids, environment_id, versions):
         filters = {"project_id": project_ids}
         if environment_id:
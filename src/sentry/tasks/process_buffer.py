@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import logging
-from typing import Any
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
 
 import sentry_sdk
 from django.apps import apps
@@ -11,6 +14,9 @@ from sentry.taskworker.namespaces import buffer_tasks
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.lock import Lock
 
+if TYPE_CHECKING:
+    from sentry.buffer.base import BufferedIncr
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,6 +120,26 @@ def buffer_incr(model, *args, **kwargs):
     )
 
 
+def buffer_incr_many(incrs: Sequence[BufferedIncr]) -> None:
+    """
+    Apply multiple buffer increments at once via `buffer.incr_many`, e.g. all
+    increments for one event, which lets the buffer apply them in a single
+    round trip.
+
+    When `settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK` is set, this falls back
+    to one `buffer_incr` task per increment.
+    """
+    if settings.SENTRY_BUFFER_INCR_AS_CELERY_TASK:
+        for incr in incrs:
+            buffer_incr(incr.model, incr.columns, incr.filters, incr.extra, incr.signal_only)
+        return
+
+    if incrs:
+        from sentry import buffer
+
+        buffer.backend.incr_many(incrs)
+
+
 @instrumented_task(
     name="sentry.tasks.process_buffer.buffer_incr_task",
     queue="buffers.incr",
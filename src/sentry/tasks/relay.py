@@ -4,6 +4,7 @@ import time
 import sentry_sdk
 from django.db import router, transaction
 
+from sentry import options
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -15,6 +16,18 @@ from sentry.utils.sdk import set_current_event_project
 
 logger = logging.getLogger(__name__)
 
+#: Invalidation triggers that only affect some sections of the project config,
+#: see :func:`sentry.relay.config.update_project_config`. Cached configs are
+#: updated in place for these instead of being computed from scratch.
+PARTIAL_INVALIDATION_TRIGGERS: dict[str, list[str]] = {
+    "alerts:create-on-demand-metric": ["metricExtraction"],
+    "dashboards:create-on-demand-metric": ["metricExtraction"],
+    "dynamic_sampling:boost_release": ["sampling"],
+    "dynamic_sampling:custom_rule_upsert": ["sampling"],
+    "dynamic_sampling_boost_low_volume_projects": ["sampling"],
+    "dynamic_sampling_boost_low_volume_transactions": ["sampling"],
+}
+
 
 # The time_limit here should match the `debounce_ttl` of the projectconfig_debounce_cache
 # service.
@@ -109,11 +122,17 @@ def validate_args(organization_id=None, project_id=None, public_key=None):
         raise TypeError("Must provide exactly one of organzation_id, project_id or public_key")
 
 
-def compute_configs(organization_id=None, project_id=None, public_key=None):
+def compute_configs(
+    organization_id=None, project_id=None, public_key=None, sections=None, base_revisions=None
+):
     """Computes all configs for the org, project or single public key.
 
     You must only provide one single argument, not all.
 
+    :param sections: If given, only these sections of cached configs are recomputed and
+       the rest is reused.  Configs that are not cached are computed in full.
+    :param base_revisions: If given, the revision of the cached config each partially
+       recomputed config is based on is recorded in this dict, keyed by public key.
     :returns: A dict mapping all affected public keys to their config.  The dict will not
        contain keys which should be retained in the cache unchanged.
     """
@@ -138,9 +157,11 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                     # If we find the config in the cache it means it was active.  As such we want to
                     # recalculate it.  If the config was not there at all, we leave it and avoid the
                     # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
+                    if (cached := projectconfig_cache.backend.get(key.public_key)) is not None:
+                        configs[key.public_key] = _compute_projectkey_config(
+                            key, cached, sections, base_revisions
+                        )
+                        action = "update" if sections else "recompute"
                     else:
                         action = "not-cached"
                     metrics.incr(
@@ -154,9 +175,11 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                 # If we find the config in the cache it means it was active.  As such we want to
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
-                if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
+                if (cached := projectconfig_cache.backend.get(key.public_key)) is not None:
+                    configs[key.public_key] = _compute_projectkey_config(
+                        key, cached, sections, base_revisions
+                    )
+                    action = "update" if sections else "recompute"
                 else:
                     action = "not-cached"
                     metrics.incr(
@@ -177,7 +200,8 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
             # bug was fixed in https://github.com/getsentry/sentry/pull/35671
             configs[public_key] = {"disabled": True}
         else:
-            configs[public_key] = compute_projectkey_config(key)
+            cached = projectconfig_cache.backend.get(public_key) if sections else None
+            configs[public_key] = _compute_projectkey_config(key, cached, sections, base_revisions)
 
     else:
         raise TypeError("One of the arguments must not be None")
@@ -185,16 +209,32 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
-def compute_projectkey_config(key):
+def _compute_projectkey_config(key, previous, sections, base_revisions):
+    config = compute_projectkey_config(key, previous=previous, sections=sections)
+    if base_revisions is not None and _is_updatable(previous, sections) and "config" in config:
+        base_revisions[key.public_key] = previous.get("rev")
+    return config
+
+
+def _is_updatable(previous, sections):
+    return bool(sections and previous and not previous.get("disabled") and "config" in previous)
+
+
+def compute_projectkey_config(key, previous=None, sections=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param previous: A previously computed config for the key, which is updated instead
+       of computing a new config if ``sections`` is given.
+    :param sections: The sections of ``previous`` to recompute.
     :returns: A dict with the project config.
     """
     from sentry.models.projectkey import ProjectKeyStatus
-    from sentry.relay.config import get_project_config
+    from sentry.relay.config import get_project_config, update_project_config
 
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
+    elif _is_updatable(previous, sections):
+        return update_project_config(key.project, previous, sections).to_dict()
     else:
         return get_project_config(key.project, project_keys=[key]).to_dict()
 
@@ -211,7 +251,12 @@ def compute_projectkey_config(key):
     ),
 )
 def invalidate_project_config(
-    organization_id=None, project_id=None, public_key=None, trigger="invalidated", **kwargs
+    organization_id=None,
+    project_id=None,
+    public_key=None,
+    trigger="invalidated",
+    sections=None,
+    **kwargs,
 ):
     """Task which re-computes an invalidated project config.
 
@@ -231,10 +276,19 @@ def invalidate_project_config(
 
     Both these mean that an outdated version of the project config could still end up in the
     cache.  These will be addressed in the future using config revisions tracked in Redis.
+
+    If ``sections`` is given, only those sections of cached configs are recomputed.  Such
+    partial invalidations are debounced separately, see
+    :func:`_schedule_partial_invalidate_project_config`.
     """
-    # Make sure we start by deleting the deduplication key so that new invalidation triggers
-    # can schedule a new message while we already started computing the project config.
-    projectconfig_debounce_cache.invalidation.mark_task_done(
+    # Make sure we start by deleting the deduplication key so that new invalidation
+    # triggers can schedule a new message while we already started computing the
+    # project config.
+    if sections:
+        debounce_cache = projectconfig_debounce_cache.get_partial_invalidation(sections)
+    else:
+        debounce_cache = projectconfig_debounce_cache.invalidation
+    debounce_cache.mark_task_done(
         organization_id=organization_id, project_id=project_id, public_key=public_key
     )
 
@@ -249,10 +303,28 @@ def invalidate_project_config(
     sentry_sdk.set_tag("trigger", trigger)
     sentry_sdk.set_context("kwargs", kwargs)
 
+    base_revisions: dict[str, str | None] = {}
     updated_configs = compute_configs(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
+        organization_id=organization_id,
+        project_id=project_id,
+        public_key=public_key,
+        sections=sections,
+        base_revisions=base_revisions,
+    )
+    # Partially recomputed configs reuse parts of the cached config, which may have been
+    # replaced by a full recompute in the meantime.  They are only written if the cached
+    # config is still the one they are based on, otherwise the config is computed in full.
+    conflicts = projectconfig_cache.backend.set_many(
+        updated_configs, expected_revisions=base_revisions
     )
-    projectconfig_cache.backend.set_many(updated_configs)
+    if conflicts:
+        metrics.incr(
+            "relay.projectconfig_cache.invalidation.partial_conflict", amount=len(conflicts)
+        )
+        recomputed_configs = {}
+        for conflicting_key in conflicts:
+            recomputed_configs.update(compute_configs(public_key=conflicting_key))
+        projectconfig_cache.backend.set_many(recomputed_configs)
 
 
 @sentry_sdk.tracing.trace
@@ -361,6 +433,18 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["organization_id"] = org_id
 
+    sections = PARTIAL_INVALIDATION_TRIGGERS.get(trigger)
+    if sections and options.get("relay.project-config.partial-invalidation.enabled"):
+        _schedule_partial_invalidate_project_config(
+            trigger=trigger,
+            sections=sections,
+            check_debounce_keys=check_debounce_keys,
+            organization_id=organization_id,
+            project_id=project_id,
+            public_key=public_key,
+        )
+        return
+
     if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys):
         # If this task is already in the queue, do not schedule another task.
         metrics.incr(
@@ -387,3 +471,47 @@ def _schedule_invalidate_project_config(
     projectconfig_debounce_cache.invalidation.debounce(
         organization_id=organization_id, project_id=project_id, public_key=public_key
     )
+
+
+def _schedule_partial_invalidate_project_config(
+    *,
+    trigger,
+    sections,
+    check_debounce_keys,
+    organization_id=None,
+    project_id=None,
+    public_key=None,
+):
+    # Partial invalidations are debounced separately per set of sections, and do not
+    # debounce full invalidations.  Otherwise, a full invalidation could be dropped in
+    # favor of a pending task that only recomputes some sections.  A pending full
+    # invalidation does recompute all sections though, so it debounces partial ones.
+    debounce_cache = projectconfig_debounce_cache.get_partial_invalidation(sections)
+    if any(
+        cache.is_debounced(**check_debounce_keys)
+        for cache in (projectconfig_debounce_cache.invalidation, debounce_cache)
+    ):
+        metrics.incr(
+            "relay.projectconfig_cache.skipped",
+            tags={"reason": "debounce", "update_reason": trigger, "task": "partial_invalidation"},
+        )
+        return
+
+    metrics.incr(
+        "relay.projectconfig_cache.scheduled",
+        tags={"update_reason": trigger, "task": "partial_invalidation"},
+    )
+
+    invalidate_project_config.apply_async(
+        kwargs={
+            "project_id": project_id,
+            "organization_id": organization_id,
+            "public_key": public_key,
+            "trigger": trigger,
+            "sections": sections,
+        },
+    )
+
+    debounce_cache.debounce(
+        organization_id=organization_id, project_id=project_id, public_key=public_key
+    )
@@ -199,21 +199,30 @@ class RedisTSDB(BaseTSDB):
         """
         model_key = self.get_model_key(key)
 
-        if isinstance(model_key, int):
-            vnode = model_key % self.vnodes
-        else:
-            vnode = _crc32(force_bytes(model_key)) % self.vnodes
-
         return (
-            "{prefix}{model}:{epoch}:{vnode}".format(
-                prefix=self.prefix,
-                model=model.value,
-                epoch=self.normalize_to_rollup(timestamp, rollup),
-                vnode=vnode,
-            ),
+            self.make_counter_hash_key(model, rollup, timestamp, self.get_vnode(model_key)),
             self.add_environment_parameter(model_key, environment_id),
         )
 
+    def make_counter_hash_key(
+        self, model: TSDBModel, rollup: int, timestamp: float | datetime, vnode: int
+    ) -> str:
+        """
+        Make the hash key that holds the counters of all keys in ``vnode``.
+        """
+        return "{prefix}{model}:{epoch}:{vnode}".format(
+            prefix=self.prefix,
+            model=model.value,
+            epoch=self.normalize_to_rollup(timestamp, rollup),
+            vnode=vnode,
+        )
+
+    def get_vnode(self, model_key: int | str) -> int:
+        if isinstance(model_key, int):
+            return model_key % self.vnodes
+        else:
+            return _crc32(force_bytes(model_key)) % self.vnodes
+
     def get_model_key(self, key: int | str | bytes) -> int | str:
         # We specialize integers so that a pure int-map can be optimized by
         # Redis, whereas long strings (say tag values) will store in a more
@@ -340,28 +349,35 @@ class RedisTSDB(BaseTSDB):
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        _series = [to_datetime(item) for item in series]
+
+        # Counters of keys in the same vnode share a hash for each rollup
+        # interval, so they can be read with a single HMGET per interval and
+        # vnode rather than one HGET per interval and key.
+        fields_by_vnode: dict[int, tuple[list[int], list[str | int]]] = defaultdict(
+            lambda: ([], [])
+        )
+        for index, key in enumerate(keys):
+            model_key = self.get_model_key(key)
+            indices, fields = fields_by_vnode[self.get_vnode(model_key)]
+            indices.append(index)
+            fields.append(self.add_environment_parameter(model_key, environment_id))
 
         results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in _series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (int(timestamp.timestamp()), key, client.hget(hash_key, hash_field))
-                    )
+            for position, timestamp in enumerate(series):
+                for vnode, (indices, fields) in fields_by_vnode.items():
+                    hash_key = self.make_counter_hash_key(model, rollup, timestamp, vnode)
+                    results.append((position, indices, client.hmget(hash_key, fields)))
 
-        results_by_key: dict[TSDBKey, dict[int, int]] = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        # Fill a dense row of counts per key, indexed by position in the series
+        counts = [[0] * len(series) for _ in keys]
+        for position, indices, promise in results:
+            for index, count in zip(indices, promise.value):
+                if count is not None:
+                    counts[index][position] = int(count)
 
-        output = {}
-        for key, points in results_by_key.items():
-            output[key] = sorted(points.items())
-        return output
+        return {key: list(zip(series, counts[index])) for index, key in enumerate(keys)}
 
     def merge(
         self,
@@ -382,27 +398,41 @@ class RedisTSDB(BaseTSDB):
             if not durable:
                 manager = SuppressionWrapper(manager)
 
+            # The counters of all sources in the same vnode are read and
+            # deleted with a single command per rollup interval.
+            fields_by_vnode: dict[int, tuple[list[int | None], list[str | int]]] = defaultdict(
+                lambda: ([], [])
+            )
+            for source in sources:
+                model_key = self.get_model_key(source)
+                environments, fields = fields_by_vnode[self.get_vnode(model_key)]
+                for environment_id in _environment_ids:
+                    environments.append(environment_id)
+                    fields.append(self.add_environment_parameter(model_key, environment_id))
+
             with manager as client:
-                data: dict[int, dict[datetime, dict[int | None, list[rb.Promise]]]] = {}
+                data: dict[int, dict[datetime, list[tuple[list[int | None], rb.Promise]]]] = {}
                 for rollup, series in rollups.items():
                     data[rollup] = {}
                     for _timestamp in series:
-                        results = data[rollup][_timestamp] = defaultdict(list)
-                        for source in sources:
-                            for environment_id in _environment_ids:
-                                source_hash_key, source_hash_field = self.make_counter_key(
-                                    model, rollup, _timestamp, source, environment_id
-                                )
-                                results[environment_id].append(
-                                    client.hget(source_hash_key, source_hash_field)
-                                )
-                                client.hdel(source_hash_key, source_hash_field)
+                        results = data[rollup][_timestamp] = []
+                        for vnode, (environments, fields) in fields_by_vnode.items():
+                            source_hash_key = self.make_counter_hash_key(
+                                model, rollup, _timestamp, vnode
+                            )
+                            results.append((environments, client.hmget(source_hash_key, fields)))
+                            client.hdel(source_hash_key, *fields)
 
             with cluster.map() as client:
                 for rollup, _series in data.items():
                     for _timestamp, _results in _series.items():
-                        for environment_id, promises in _results.items():
-                            total = sum(int(p.value) for p in promises if p.value)
+                        totals: dict[int | None, int] = defaultdict(int)
+                        for environments, promise in _results:
+                            for environment_id, value in zip(environments, promise.value):
+                                if value:
+                                    totals[environment_id] += int(value)
+
+                        for environment_id, total in totals.items():
                             if total:
                                 (
                                     destination_hash_key,
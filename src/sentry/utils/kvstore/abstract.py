@@ -48,6 +48,19 @@ class KVStorage(ABC, Generic[K, V]):
         """
         raise NotImplementedError
 
+    def set_many(self, items: Sequence[tuple[K, V]], ttl: timedelta | None = None) -> None:
+        """
+        Set multiple values in the store, overwriting any data that already
+        existed at those keys.
+
+        This operation is not guaranteed to be atomic and may result in only
+        a subset of keys being set if an error occurs.
+        """
+        # This implementation can/should be overridden by concrete subclasses
+        # to improve performance using batched operations where possible.
+        for key, value in items:
+            self.set(key, value, ttl)
+
     @abstractmethod
     def delete(self, key: K) -> None:
         """
@@ -93,6 +93,16 @@ class PerformanceDetector(ABC):
     def visit_span(self, span: Span) -> None:
         raise NotImplementedError
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        """
+        The op prefixes of the spans this detector acts on. Spans with any other op are not
+        passed to `visit_span`, which detectors must only declare if they ignore those spans
+        anyway. `None` means that every span is visited.
+
+        See `run_detectors_on_data` in `performance_detection.py` for more context.
+        """
+        return None
+
     def on_complete(self) -> None:
         pass
 
@@ -54,6 +54,9 @@ class NPlusOneAPICallsExperimentalDetector(PerformanceDetector):
         # See https://develop.sentry.dev/backend/issue-platform/#releasing-your-issue-type
         return True
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        return tuple(self.settings.get("allowed_span_ops") or ()) or None
+
     def visit_span(self, span: Span) -> None:
         if not NPlusOneAPICallsExperimentalDetector.is_span_eligible(span):
             return
@@ -41,6 +41,15 @@ class SlowDBQueryDetector(PerformanceDetector):
 
         self.stored_problems = {}
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        prefixes: list[str] = []
+        for setting in self.settings:
+            allowed_span_ops = setting.get("allowed_span_ops", [])
+            if not allowed_span_ops:
+                return None
+            prefixes.extend(allowed_span_ops)
+        return tuple(prefixes)
+
     def visit_span(self, span: Span) -> None:
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
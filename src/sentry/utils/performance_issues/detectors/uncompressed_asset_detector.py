@@ -39,6 +39,9 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
         self.stored_problems = {}
         self.any_compression = False
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        return tuple(self.settings.get("allowed_span_ops") or ()) or None
+
     def visit_span(self, span: Span) -> None:
         op = span.get("op", None)
         description = span.get("description", "")
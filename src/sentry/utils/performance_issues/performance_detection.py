@@ -349,15 +349,6 @@ def _detect_performance_problems(
     with sentry_sdk.start_span(op="function", name="get_detection_settings"):
         detection_settings = get_detection_settings(project.id)
 
-    if standalone:
-        # The performance detectors expect the span list to be ordered/flattened in the way they
-        # are structured in the tree. This is an implicit assumption in the performance detectors.
-        # So we build a tree and flatten it depth first.
-        # TODO: See if we can update the detectors to work without this assumption so we can
-        # just pass it a list of spans.
-        tree, segment_id = build_tree(data.get("spans", []))
-        data = {**data, "spans": flatten_tree(tree, segment_id)}
-
     with sentry_sdk.start_span(op="initialize", name="PerformanceDetector"):
         detectors: list[PerformanceDetector] = [
             detector_class(detection_settings, data)
@@ -365,11 +356,8 @@ def _detect_performance_problems(
             if detector_class.is_detection_allowed_for_system()
         ]
 
-    for detector in detectors:
-        with sentry_sdk.start_span(
-            op="function", name=f"run_detector_on_data.{detector.type.value}"
-        ):
-            run_detector_on_data(detector, data)
+    with sentry_sdk.start_span(op="function", name="run_detectors_on_data"):
+        run_detectors_on_data(detectors, data)
 
     with sentry_sdk.start_span(op="function", name="report_metrics_for_detectors"):
         # Metrics reporting only for detection, not created issues.
@@ -427,61 +415,34 @@ def run_detector_on_data(detector: PerformanceDetector, data: dict[str, Any]) ->
     detector.on_complete()
 
 
-def build_tree(spans: Sequence[dict[str, Any]]) -> tuple[dict[str, Any], str | None]:
-    span_tree: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
-    segment_id = None
-
-    for span in spans:
-        span_id = span["span_id"]
-        is_root = span["is_segment"]
-        if is_root:
-            segment_id = span_id
-        if span_id not in span_tree:
-            span_tree[span_id] = (span, [])
-
-    for span, _ in span_tree.values():
-        parent_id = span.get("parent_span_id")
-        if parent_id is not None and parent_id in span_tree:
-            _, children = span_tree[parent_id]
-            children.append(span)
-
-    return span_tree, segment_id
-
-
-def dfs(
-    visited: set[str], flattened_spans: list[dict[str, Any]], tree: dict[str, Any], span_id: str
-) -> None:
-    stack = [span_id]
-
-    while len(stack):
-        span_id = stack.pop()
-
-        span, children = tree[span_id]
-
-        if span_id not in visited:
-            flattened_spans.append(span)
-            tree.pop(span_id)
-            visited.add(span_id)
-
-        for child in sorted(children, key=lambda span: span["start_timestamp"], reverse=True):
-            if child["span_id"] not in visited:
-                stack.append(child["span_id"])
-
-
-def flatten_tree(tree: dict[str, Any], segment_id: str | None) -> list[dict[str, Any]]:
-    visited: set[str] = set()
-    flattened_spans: list[dict[str, Any]] = []
-
-    if segment_id:
-        dfs(visited, flattened_spans, tree, segment_id)
-
-    # Catch all for orphan spans
-    remaining = sorted(tree.items(), key=lambda span: span[1][0]["start_timestamp"])
-    for span_id, _ in remaining:
-        if span_id not in visited:
-            dfs(visited, flattened_spans, tree, span_id)
-
-    return flattened_spans
+def run_detectors_on_data(detectors: Sequence[PerformanceDetector], data: dict[str, Any]) -> None:
+    """
+    Run all detectors in a single pass over the spans of the event, which is equivalent to
+    calling `run_detector_on_data` for each of them. Every span is only passed to the detectors
+    whose op prefixes match its op (see `PerformanceDetector.get_span_op_prefixes`).
+    """
+    eligible_detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    op_prefixes = [detector.get_span_op_prefixes() for detector in eligible_detectors]
+
+    # Transactions usually only contain a handful of distinct ops, so the detectors interested
+    # in each op are only resolved the first time it is seen.
+    detectors_by_op: dict[str, list[PerformanceDetector]] = {}
+
+    for span in data.get("spans", []):
+        op = span.get("op") or ""
+        op_detectors = detectors_by_op.get(op)
+        if op_detectors is None:
+            op_detectors = detectors_by_op[op] = [
+                detector
+                for detector, prefixes in zip(eligible_detectors, op_prefixes)
+                if prefixes is None or op.startswith(prefixes)
+            ]
+
+        for detector in op_detectors:
+            detector.visit_span(span)
+
+    for detector in eligible_detectors:
+        detector.on_complete()
 
 
 # Reports metrics and creates spans for detection
@@ -41,6 +41,8 @@ from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +60,9 @@ SAFE_FUNCTION_RE = re.compile(r"-?[a-zA-Z_][a-zA-Z0-9_]*$")
 # doesn't include new lines,
 QUOTED_LITERAL_RE = re.compile(r"^'[\s\S]*'$")
 
+# Matches datetime literals in serialized SnQL queries
+DATETIME_LITERAL_RE = re.compile(r"toDateTime\('([^']+)'\)")
+
 MEASUREMENTS_KEY_RE = re.compile(r"^measurements\.([a-zA-Z0-9-_.]+)$")
 # Matches span op breakdown field
 SPAN_OP_BREAKDOWNS_FIELD_RE = re.compile(r"^spans\.([a-zA-Z0-9-_.]+)$")
@@ -1076,16 +1081,132 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(snuba_requests, use_cache=use_cache)
 
 
-def get_cache_key(query: Request) -> str:
+def _bucket_datetime_literal(match: re.Match[str], time_bucket: int) -> str:
+    try:
+        value = datetime.fromisoformat(match.group(1))
+    except ValueError:
+        return match.group(0)
+
+    timestamp = value.replace(tzinfo=timezone.utc).timestamp()
+    bucketed = datetime.fromtimestamp(timestamp - timestamp % time_bucket, timezone.utc)
+    return f"toDateTime('{bucketed.replace(tzinfo=None).isoformat()}')"
+
+
+def get_cache_key(query: Request, time_bucket: int = 0) -> str:
+    """
+    Returns the key under which results of the query are cached.
+
+    If ``time_bucket`` is given, datetime literals in the query are truncated to
+    multiples of that many seconds, so that queries for relative time ranges
+    issued within the same bucket share a key.
+    """
     if isinstance(query, Request):
         hashable = str(query)
     else:
         hashable = json.dumps(query)
 
+    if time_bucket > 0:
+        hashable = DATETIME_LITERAL_RE.sub(
+            lambda match: _bucket_datetime_literal(match, time_bucket), hashable
+        )
+
     # sqc - Snuba Query Cache
     return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
+def _acquire_query_leases(
+    to_query: list[tuple[int, SnubaRequest, str | None]],
+) -> tuple[
+    list[Lock],
+    list[tuple[int, SnubaRequest, str | None]],
+    list[tuple[int, SnubaRequest, str | None, Lock]],
+]:
+    """
+    Tries to acquire a short lease for the cache key of every query, so that
+    only one worker at a time sends identical queries to Snuba.
+
+    Returns the acquired leases, the queries that should be run, and the
+    queries for which another worker holds the lease.
+    """
+    from sentry.locks import locks
+
+    leases = []
+    leading = []
+    waiting = []
+    for query_pos, snuba_request, cache_key in to_query:
+        lease = locks.get(
+            f"{cache_key}:lease",
+            duration=settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS,
+            name="snuba_query_cache",
+        )
+        try:
+            lease.acquire()
+        except UnableToAcquireLock:
+            waiting.append((query_pos, snuba_request, cache_key, lease))
+        else:
+            leases.append(lease)
+            leading.append((query_pos, snuba_request, cache_key))
+
+    return leases, leading, waiting
+
+
+def _wait_for_cached_results(
+    waiting: list[tuple[int, SnubaRequest, str | None, Lock]],
+) -> tuple[list[tuple[int, Any]], list[tuple[int, SnubaRequest, str | None]]]:
+    """
+    Polls the cache for the results of queries that another worker is running.
+
+    Returns the cached results, and the queries that need to be run because the
+    other worker released its lease without caching a result or took too long.
+    """
+    results = []
+    deadline = time.monotonic() + settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS
+    delay = 0.05
+
+    while waiting:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+        cache_data = cache.get_many([cache_key for _, _, cache_key, _ in waiting])
+        still_waiting = []
+        for query_pos, snuba_request, cache_key, lease in waiting:
+            if (cached_result := cache_data.get(cache_key)) is not None:
+                results.append((query_pos, json.loads(cached_result)))
+            else:
+                still_waiting.append((query_pos, snuba_request, cache_key, lease))
+        waiting = still_waiting
+
+        if time.monotonic() >= deadline:
+            break
+        if waiting and not any(lease.locked() for _, _, _, lease in waiting):
+            break
+
+    metrics.incr("snuba.query_cache.coalesced", amount=len(results))
+    return results, [
+        (query_pos, snuba_request, cache_key)
+        for query_pos, snuba_request, cache_key, _ in waiting
+    ]
+
+
+def _run_and_cache_queries(
+    to_query: list[tuple[int, SnubaRequest, str | None]],
+) -> list[tuple[int, Any]]:
+    if not to_query:
+        return []
+
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query])
+    for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
+        if opt_cache_key:
+            cache.set(
+                opt_cache_key,
+                json.dumps(result),
+                settings.SENTRY_SNUBA_CACHE_TTL_SECONDS,
+            )
+        results.append((query_pos, result))
+    return results
+
+
 def _apply_cache_and_build_results(
     snuba_requests: Sequence[SnubaRequest],
     use_cache: bool | None = False,
@@ -1107,7 +1228,8 @@ def _apply_cache_and_build_results(
 
     if use_cache:
         cache_keys = [
-            get_cache_key(snuba_request.request) for _, snuba_request in snuba_requests_list
+            get_cache_key(snuba_request.request, settings.SENTRY_SNUBA_CACHE_TIME_BUCKET_SECONDS)
+            for _, snuba_request in snuba_requests_list
         ]
         cache_data = cache.get_many(cache_keys)
         for (query_pos, snuba_request), cache_key in zip(snuba_requests_list, cache_keys):
@@ -1123,16 +1245,25 @@ def _apply_cache_and_build_results(
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key,
-                    json.dumps(result),
-                    settings.SENTRY_SNUBA_CACHE_TTL_SECONDS,
-                )
-            results.append((query_pos, result))
+    if use_cache and to_query and settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS > 0:
+        # Identical queries from concurrent requests are only sent to Snuba
+        # once, the other workers wait for the result to be cached.
+        leases, leading, waiting = _acquire_query_leases(to_query)
+        # Leading queries are run and cached, and their leases released,
+        # before waiting for other workers. Otherwise two workers holding
+        # leases the other one waits for would stall each other.
+        try:
+            results.extend(_run_and_cache_queries(leading))
+        finally:
+            for lease in leases:
+                lease.release()
+
+        if waiting:
+            cached_results, timed_out = _wait_for_cached_results(waiting)
+            results.extend(cached_results)
+            results.extend(_run_and_cache_queries(timed_out))
+    else:
+        results.extend(_run_and_cache_queries(to_query))
 
     # Sort so that we get the results back in the original param list order
     results.sort()
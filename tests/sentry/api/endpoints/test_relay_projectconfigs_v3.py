@@ -20,13 +20,15 @@ def disable_auto_on_commit():
 
 @pytest.fixture
 def call_endpoint(client, relay, private_key, default_projectkey):
-    def inner(public_keys=None, global_=False):
+    def inner(public_keys=None, global_=False, revisions=None):
         path = reverse("sentry-api-0-relay-projectconfigs") + "?version=3"
 
         if public_keys is None:
             public_keys = [str(default_projectkey.public_key)]
 
         body = {"publicKeys": public_keys, "no_cache": False}
+        if revisions is not None:
+            body["revisions"] = revisions
         if global_ is not None:
             body.update({"global": global_})
         raw_json, signature = private_key.pack(body)
@@ -166,3 +168,29 @@ def test_return_project_and_global_config(
         "global": {"global_mock_config": True},
         "global_status": "ready",
     }
+
+
+@django_db_all
+def test_return_delta_for_known_revision(
+    monkeypatch, call_endpoint, default_projectkey, single_mock_proj_cached
+):
+    def get_delta(public_key, revision):
+        if public_key == "unchanged":
+            return {"baseRev": revision, "rev": revision, "patch": {}}
+        if public_key == "changed" and revision == "rev1":
+            return {"baseRev": revision, "rev": "rev2", "patch": {"rev": "rev2"}}
+        return None
+
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.backend.get_delta", get_delta)
+
+    result, status_code = call_endpoint(
+        public_keys=["unchanged", "changed", "must_exist"],
+        revisions=["rev1", "rev1", "unknown"],
+    )
+    assert status_code < 400
+    assert result == {
+        "configs": {"must_exist": {"is_mock_config": True}},
+        "pending": [],
+        "unchanged": ["unchanged"],
+        "deltas": {"changed": {"rev": "rev2"}},
+    }
@@ -10,6 +10,7 @@ from sentry.issues.grouptype import GroupCategory, ProfileFileIOGroupType
 from sentry.models.environment import Environment
 from sentry.testutils.cases import BaseMetricsTestCase, PerformanceIssueTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, freeze_time
+from sentry.testutils.helpers.options import override_options
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 
@@ -82,3 +83,25 @@ class StreamGroupSerializerTestCase(
         assert serialized["issueType"] == str(ProfileFileIOGroupType.slug)
         assert [stat[1] for stat in serialized["stats"]["24h"][:-1]] == [0] * 23
         assert serialized["stats"]["24h"][-1][1] == 1
+
+    @freeze_time(before_now(days=1).replace(hour=13, minute=30, second=0, microsecond=0))
+    @override_options({"issues.stream.stats-cache-ttl": 60})
+    def test_stats_cache(self):
+        group = self.create_performance_issue().group
+        other_group = self.create_group(project=self.project)
+        serializer = StreamGroupSerializerSnuba(stats_period="24h", organization_id=1)
+
+        with mock.patch.object(
+            serializer, "_query_tsdb", wraps=serializer._query_tsdb
+        ) as query_tsdb:
+            serialized = serialize(group, serializer=serializer, request=self.make_request())
+            assert serialized["stats"]["24h"][-1][1] == 1
+            assert query_tsdb.call_count == 1
+
+            # Cached groups are not queried again
+            serialized = serialize(
+                [group, other_group], serializer=serializer, request=self.make_request()
+            )
+            assert serialized[0]["stats"]["24h"][-1][1] == 1
+            assert query_tsdb.call_count == 2
+            assert query_tsdb.call_args[0][0] == [other_group]
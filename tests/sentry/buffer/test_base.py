@@ -4,7 +4,7 @@ from unittest import mock
 from django.utils import timezone
 from pytest import raises
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.models.group import Group
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -42,6 +42,46 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters)
         assert Group.objects.get(id=group.id).times_seen == group.times_seen + 1
 
+    def test_process_many(self):
+        group = Group.objects.create(project=Project(id=1))
+        group_2 = Group.objects.create(project=Project(id=1))
+        release_project = ReleaseProject.objects.create(project=self.project, release=self.release)
+        the_date = timezone.now() + timedelta(days=5)
+
+        with mock.patch.object(
+            Group.objects, "bulk_update", wraps=Group.objects.bulk_update
+        ) as bulk_update:
+            self.buf.process_many(
+                [
+                    BufferedIncr(Group, {"times_seen": 1}, {"id": group.id}),
+                    BufferedIncr(
+                        Group, {"times_seen": 2}, {"id": group_2.id}, {"last_seen": the_date}
+                    ),
+                    # Deleted groups are skipped
+                    BufferedIncr(Group, {"times_seen": 2}, {"id": 0}),
+                    BufferedIncr(ReleaseProject, {"new_groups": 1}, {"id": release_project.id}),
+                ]
+            )
+
+        # One update per set of updated columns
+        assert bulk_update.call_count == 2
+
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen + 1
+        reload = Group.objects.get(id=group_2.id)
+        assert reload.times_seen == group_2.times_seen + 2
+        assert reload.last_seen == the_date
+        assert ReleaseProject.objects.get(id=release_project.id).new_groups == 1
+
+    @mock.patch("sentry.buffer.base.process_incr")
+    def test_incr_many(self, process_incr):
+        self.buf.incr_many(
+            [
+                BufferedIncr(Group, {"times_seen": 1}, {"id": 1}),
+                BufferedIncr(ReleaseProject, {"new_groups": 1}, {"id": 2}),
+            ]
+        )
+        assert process_incr.apply_async.call_count == 2
+
     def test_process_saves_data_without_existing_row(self):
         columns = {"new_groups": 1}
         filters = {"project_id": self.project.id, "release_id": self.release.id}
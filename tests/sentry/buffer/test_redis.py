@@ -10,6 +10,7 @@ import pytest
 from django.utils import timezone
 
 from sentry import options
+from sentry.buffer.base import BufferedIncr
 from sentry.buffer.redis import (
     BufferHookEvent,
     RedisBuffer,
@@ -21,6 +22,7 @@ from sentry.models.group import Group
 from sentry.models.project import Project
 from sentry.rules.processing.buffer_processing import process_buffer
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY
+from sentry.testutils.helpers import override_options
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
@@ -146,6 +148,43 @@ class TestRedisBuffer:
         group = Group.objects.get_from_cache(id=default_group.id)
         assert group.times_seen == orig_times_seen + times_seen_incr
 
+    @django_db_all
+    @freeze_time()
+    def test_process_batched_flush(self, default_project, task_runner):
+        groups = [
+            Group.objects.create(project=default_project, times_seen=1),
+            Group.objects.create(project=default_project, times_seen=1),
+        ]
+        # Make sure groups are stored in the cache
+        for group in groups:
+            Group.objects.get_from_cache(id=group.id)
+
+        self.buf.incr_batch_size = 10
+        for i, group in enumerate(groups):
+            self.buf.incr(Group, {"times_seen": i + 1}, {"pk": group.id})
+
+        with (
+            override_options({"buffer.batched-flush.enabled": True}),
+            mock.patch.object(self.buf, "_process_single_incr") as process_single_incr,
+            task_runner(),
+            mock.patch("sentry.buffer.backend", self.buf),
+        ):
+            self.buf.process_pending()
+
+        assert process_single_incr.call_count == 0
+        assert Group.objects.get_from_cache(id=groups[0].id).times_seen == 2
+        assert Group.objects.get_from_cache(id=groups[1].id).times_seen == 3
+
+        # The buffered keys have been drained
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+        assert self.buf.get(Group, ["times_seen"], {"pk": groups[0].id}) == {"times_seen": 0}
+
+        # and their locks released
+        for group in groups:
+            key = self.buf._make_key(Group, {"pk": group.id})
+            assert client.get(self.buf._make_lock_key(key)) is None
+
     def test_get(self):
         model = mock.Mock()
         model.__name__ = "Mock"
@@ -211,6 +250,38 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    def test_incr_many(self):
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        other_model = mock.Mock()
+        other_model.__name__ = "OtherMock"
+        filters = {"pk": 1}
+
+        self.buf.incr_many(
+            [
+                BufferedIncr(model, {"times_seen": 1}, filters),
+                BufferedIncr(model, {"times_seen": 2}, filters, {"foo": "bar"}),
+                BufferedIncr(other_model, {"times_seen": 3}, filters, signal_only=True),
+            ]
+        )
+
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 3}
+        assert self.buf.get(other_model, ["times_seen"], filters=filters) == {"times_seen": 3}
+
+        # The buffered hashes are identical to the ones written by `incr`
+        key = self.buf._make_key(model, filters=filters)
+        other_key = self.buf._make_key(other_model, filters=filters)
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        other_result = _hgetall_decode_keys(client, other_key, self.buf.is_redis_cluster)
+        assert set(result) == {"m", "f", "i+times_seen", "e+foo"}
+        assert set(other_result) == {"m", "f", "i+times_seen", "s"}
+
+        pending = client.zrange("b:p", 0, -1)
+        if not self.buf.is_redis_cluster:
+            pending = [k.decode("utf-8") for k in pending]
+        assert sorted(pending) == sorted([key, other_key])
+
     def group_rule_data_by_project_id(self, buffer, project_ids):
         project_ids_to_rule_data = defaultdict(list)
         for proj_id in project_ids:
@@ -2853,6 +2853,74 @@ class ReleaseIssueTest(TestCase):
             first_seen=self.timestamp + 100,
         )
 
+    def test_buffer_increments_applied_together(self) -> None:
+        event1 = self.make_release_event(
+            release_version=self.release.version,
+            environment_name=self.environment1.name,
+            project_id=self.project.id,
+            checksum="a" * 32,
+            timestamp=self.timestamp,
+        )
+        with (
+            mock.patch("sentry.buffer.backend.incr") as incr,
+            mock.patch("sentry.buffer.backend.incr_many") as incr_many,
+        ):
+            self.make_release_event(
+                release_version=self.release.version,
+                environment_name=self.environment2.name,
+                project_id=self.project.id,
+                checksum="a" * 32,
+                timestamp=self.timestamp + 100,
+            )
+
+        # The group's `times_seen` and the new group environment's release
+        # counter are applied by a single call.
+        assert not [call for call in incr.call_args_list if call.args[0] is Group]
+        assert incr_many.call_count == 1
+        incrs = incr_many.call_args[0][0]
+        assert {(incr.model, tuple(incr.filters.items())) for incr in incrs} == {
+            (Group, (("id", event1.group_id),)),
+            (
+                ReleaseProjectEnvironment,
+                (
+                    ("project_id", self.project.id),
+                    ("release_id", self.release.id),
+                    ("environment_id", self.environment2.id),
+                ),
+            ),
+        }
+
+    def test_buffer_increments_applied_on_error(self) -> None:
+        event1 = self.make_release_event(
+            release_version=self.release.version,
+            environment_name=self.environment1.name,
+            project_id=self.project.id,
+            checksum="a" * 32,
+            timestamp=self.timestamp,
+        )
+        with (
+            mock.patch("sentry.buffer.backend.incr_many") as incr_many,
+            mock.patch(
+                "sentry.event_manager._get_or_create_release_associated_models",
+                side_effect=RuntimeError,
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            self.make_release_event(
+                release_version=self.release.version,
+                environment_name=self.environment1.name,
+                project_id=self.project.id,
+                checksum="a" * 32,
+                timestamp=self.timestamp + 100,
+            )
+
+        # The event was assigned to the group, so its `times_seen` increment
+        # is still applied.
+        assert incr_many.call_count == 1
+        assert [(incr.model, incr.filters) for incr in incr_many.call_args[0][0]] == [
+            (Group, {"id": event1.group_id})
+        ]
+
 
 @apply_feature_flag_on_cls("organizations:dynamic-sampling")
 class DSLatestReleaseBoostTest(TestCase):
@@ -10,6 +10,7 @@ import pytest
 from sentry.grouping.component import FrameGroupingComponent, StacktraceGroupingComponent
 from sentry.grouping.enhancer import (
     ENHANCEMENT_BASES,
+    ENHANCEMENT_RESULTS_CACHE,
     Enhancements,
     is_valid_profiling_action,
     is_valid_profiling_matcher,
@@ -21,6 +22,7 @@ from sentry.grouping.enhancer.matchers import ReturnValueCache, _cached, create_
 from sentry.grouping.enhancer.parser import parse_enhancements
 from sentry.grouping.enhancer.rules import EnhancementRule
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 
 
 def convert_to_dict(obj: object) -> object | dict[str, Any]:
@@ -183,6 +185,44 @@ def test_flipflop_inapp():
     assert frames[0]["in_app"] is False
 
 
+def test_results_cache_reuses_in_app_results():
+    ENHANCEMENT_RESULTS_CACHE.clear()
+    enhancements = Enhancements.from_rules_text("function:fetch_dogs +app")
+    rust_enhancements_spy = mock.Mock(wraps=enhancements.rust_enhancements)
+
+    with mock.patch.object(enhancements, "rust_enhancements", rust_enhancements_spy):
+        for _ in range(2):
+            frames: list[dict[str, Any]] = [{"function": "fetch_dogs"}, {"function": "nap"}]
+            enhancements.apply_category_and_updated_in_app_to_frames(frames, "python", {})
+
+            assert frames[0]["in_app"] is True
+            assert "in_app" not in frames[1]
+
+        # A different stacktrace isn't a cache hit
+        frames = [{"function": "fetch_cats"}]
+        enhancements.apply_category_and_updated_in_app_to_frames(frames, "python", {})
+        assert "in_app" not in frames[0]
+
+    assert rust_enhancements_spy.apply_modifications_to_frames.call_count == 2
+
+
+def test_results_cache_can_be_disabled():
+    ENHANCEMENT_RESULTS_CACHE.clear()
+    enhancements = Enhancements.from_rules_text("function:fetch_dogs +app")
+    rust_enhancements_spy = mock.Mock(wraps=enhancements.rust_enhancements)
+
+    with (
+        override_options({"grouping.enhancements.results_cache_enabled": False}),
+        mock.patch.object(enhancements, "rust_enhancements", rust_enhancements_spy),
+    ):
+        for _ in range(2):
+            frames: list[dict[str, Any]] = [{"function": "fetch_dogs"}]
+            enhancements.apply_category_and_updated_in_app_to_frames(frames, "python", {})
+
+    assert rust_enhancements_spy.apply_modifications_to_frames.call_count == 2
+    assert len(ENHANCEMENT_RESULTS_CACHE) == 0
+
+
 def test_basic_path_matching():
     js_rule = Enhancements.from_rules_text("path:**/test.js +app").rules[0]
 
@@ -639,6 +679,12 @@ class AssembleStacktraceComponentTest(TestCase):
     DummyRustExceptionData = dict[str, bytes | None]
     DummyMatchFrame = dict[str, Any]
 
+    @pytest.fixture(autouse=True)
+    def disable_results_cache(self):
+        # These tests swap in fake rust results, which mustn't end up in (or come from) the cache
+        with override_options({"grouping.enhancements.results_cache_enabled": False}):
+            yield
+
     class MockRustEnhancements:
         def __init__(
             self,
@@ -4,7 +4,11 @@ import pytest
 
 from sentry.db.models.fields.node import NodeData
 from sentry.grouping.api import get_default_grouping_config_dict
-from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+from sentry.grouping.fingerprinting import (
+    EventDatastore,
+    FingerprintingRules,
+    InvalidFingerprintingConfig,
+)
 from sentry.grouping.utils import resolve_fingerprint_values
 from sentry.grouping.variants import BaseVariant
 from sentry.testutils.pytest.fixtures import InstaSnapshotter, django_db_all
@@ -274,6 +278,46 @@ def test_variable_resolution() -> None:
         ], f"Entry {fingerprint_entry} resolved incorrectly"
 
 
+def test_compiled_rules_only_test_candidate_rules() -> None:
+    rules = FingerprintingRules.from_config_string(
+        """
+type:DatabaseUnavailable                        -> DatabaseUnavailable
+function:assertion_failed module:foo            -> AssertionFailed, foo
+tags.server_name:web-1                          -> web-1
+type:*Error                                     -> some-error
+!type:ValueError                                -> not-a-value-error
+"""
+    )
+    compiled = rules.compiled
+    assert compiled.unindexed_rule_indices == [3, 4]
+    assert compiled.rule_indices_by_literal == {
+        "type": {"DatabaseUnavailable": [0]},
+        "function": {"assertion_failed": [1]},
+        "tags.server_name": {"web-1": [2]},
+    }
+
+    event = {
+        "exception": {"values": [{"type": "DatabaseUnavailable", "value": "dogs"}]},
+        "tags": [["server_name", "web-2"]],
+    }
+    candidate_rules = list(compiled.iter_candidate_rules(EventDatastore(event)))
+    assert [rule.fingerprint for rule in candidate_rules] == [
+        ["DatabaseUnavailable"],
+        ["some-error"],
+        ["not-a-value-error"],
+    ]
+
+    match = rules.get_fingerprint_values_for_event(event)
+    assert match is not None
+    assert match.fingerprint == ["DatabaseUnavailable"]
+
+    match = rules.get_fingerprint_values_for_event(
+        {"exception": {"values": [{"type": "ValueError", "value": "cats"}]}}
+    )
+    assert match is not None
+    assert match.fingerprint == ["some-error"]
+
+
 @with_fingerprint_input("input")
 @django_db_all  # because of `options` usage
 def test_event_hash_variant(insta_snapshot: InstaSnapshotter, input: FingerprintInput) -> None:
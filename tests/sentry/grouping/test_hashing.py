@@ -8,6 +8,7 @@ from sentry.grouping.api import GroupingConfig
 from sentry.grouping.ingest.hashing import (
     _calculate_event_grouping,
     _calculate_secondary_hashes,
+    bulk_get_or_create_grouphashes,
     get_or_create_grouphashes,
 )
 from sentry.grouping.variants import BaseVariant
@@ -201,3 +202,39 @@ class SecondaryGroupingTest(TestCase):
                 legacy_config_hash,
                 default_config_hash,
             }
+
+
+class BulkGetOrCreateGrouphashesTest(TestCase):
+    def test_creates_only_missing_grouphashes(self) -> None:
+        existing_grouphash = GroupHash.objects.create(project=self.project, hash="dogs")
+
+        grouphashes = bulk_get_or_create_grouphashes(self.project, ["dogs", "are", "great", "are"])
+
+        assert set(grouphashes.keys()) == {"dogs", "are", "great"}
+        assert grouphashes["dogs"] == (existing_grouphash, False)
+        assert grouphashes["are"][1] is True
+        assert grouphashes["great"][1] is True
+        assert all(grouphash.id for grouphash, _ in grouphashes.values())
+        assert GroupHash.objects.filter(project=self.project).count() == 3
+
+    def test_shared_prefetched_grouphashes_only_new_once(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        prefetched_grouphashes = bulk_get_or_create_grouphashes(self.project, ["maisey"])
+
+        with patch(
+            "sentry.grouping.ingest.hashing.should_handle_grouphash_metadata", return_value=False
+        ) as should_handle_metadata_spy:
+            for _ in range(2):
+                get_or_create_grouphashes(
+                    event,
+                    self.project,
+                    {},
+                    ["maisey"],
+                    DEFAULT_GROUPING_CONFIG,
+                    prefetched_grouphashes=prefetched_grouphashes,
+                )
+
+        assert [call.args[1] for call in should_handle_metadata_spy.call_args_list] == [
+            True,
+            False,
+        ]
@@ -268,6 +268,37 @@ def test_parameterize_regex_experiment_cached_compiled():
     mocked_pattern.assert_called_once()
 
 
+def test_parameterize_cached_content_replays_match_counts(parameterizer):
+    input_str = "Dog 1231 ate 12 shoes at 0x40000015"
+    expected = "Dog <int> ate <int> shoes at <hex>"
+
+    assert parameterizer.parametrize_w_regex(input_str) == expected
+    assert dict(parameterizer.matches_counter) == {"int": 2, "hex": 1}
+
+    second_parameterizer = Parameterizer(regex_pattern_keys=parameterizer._regex_pattern_keys)
+    with mock.patch(
+        "sentry.grouping.parameterization._make_regex_from_patterns"
+    ) as make_regex_spy:
+        assert second_parameterizer.parametrize_w_regex(input_str) == expected
+        assert second_parameterizer.parametrize_w_regex(input_str) == expected
+
+    # The cached result was used, but the matches were still counted
+    assert make_regex_spy.call_count == 0
+    assert dict(second_parameterizer.matches_counter) == {"int": 4, "hex": 2}
+
+
+def test_parameterize_skips_content_without_trigger_chars(parameterizer):
+    input_str = "Something went wrong while fetching the dogs"
+
+    with mock.patch(
+        "sentry.grouping.parameterization._make_regex_from_patterns"
+    ) as make_regex_spy:
+        assert parameterizer.parametrize_w_regex(input_str) == input_str
+
+    assert make_regex_spy.call_count == 0
+    assert not parameterizer.matches_counter
+
+
 # These are test cases that we should fix
 @pytest.mark.xfail()
 @pytest.mark.parametrize(
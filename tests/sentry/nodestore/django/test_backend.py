@@ -1,3 +1,4 @@
+import base64
 import pickle
 from datetime import timedelta
 from unittest import mock
@@ -6,8 +7,10 @@ import pytest
 from django.utils import timezone
 
 from sentry.nodestore.base import json_dumps
+from sentry.nodestore.compression import ZSTD_MAGIC
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.nodestore.django.models import Node
+from sentry.testutils.helpers import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils.strings import compress
 
@@ -52,6 +55,31 @@ class TestDjangoNodeStorage:
             b'{"foo":"bar"}'
         )
 
+    def test_set_zstd(self):
+        ns = DjangoNodeStorage(compression="zstd")
+        # Make sure nodes are read back from the database
+        ns.cache = self.ns.cache = None
+        ns.set("d2502ebbd7df41ceba8d3275595cac33", {"foo": "bar"})
+
+        data = Node.objects.get(id="d2502ebbd7df41ceba8d3275595cac33").data
+        assert base64.b64decode(data).startswith(ZSTD_MAGIC)
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+
+        # Nodes stay readable when switching back to zlib
+        assert self.ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+
+    @override_options({"nodestore.segmented-encoding.enabled": True})
+    def test_get_subkey_zstd_segmented(self):
+        ns = DjangoNodeStorage(compression="zstd")
+        ns.cache = None
+        ns.set_subkeys(
+            "d2502ebbd7df41ceba8d3275595cac33", {None: {"foo": "a"}, "other": {"foo": "b"}}
+        )
+
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "a"}
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33", subkey="other") == {"foo": "b"}
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33", subkey="missing") is None
+
     def test_delete(self):
         node = Node.objects.create(id="d2502ebbd7df41ceba8d3275595cac33", data='{"foo": "bar"}')
 
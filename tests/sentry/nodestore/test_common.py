@@ -51,6 +51,15 @@ def test_set(ns):
     assert ns.get(node_id) == data
 
 
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_multi(ns):
+    nodes = {"a" * 32: {"foo": "a"}, "b" * 32: {"foo": "b"}}
+
+    ns.set_multi(nodes)
+
+    assert ns.get_multi(list(nodes)) == nodes
+
+
 @override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
 def test_delete(ns):
     node_id = "d2502ebbd7df41ceba8d3275595cac33"
@@ -98,3 +107,42 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_subkeys_multi(ns):
+    ns.set_subkeys_multi(
+        {
+            "node_1": {None: {"foo": "a"}, "other": {"foo": "b"}},
+            "node_2": {None: {"foo": "c"}},
+        }
+    )
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_2") == {"foo": "c"}
+    assert ns.get("node_2", subkey="other") is None
+
+    # Writing again replaces the existing nodes, including their subkeys
+    ns.set_subkeys_multi({"node_1": {None: {"foo": "d"}}})
+    assert ns.get("node_1") == {"foo": "d"}
+    assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.segmented-encoding.enabled": True,
+    }
+)
+def test_set_subkeys_segmented(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    # Nodes written in the previous format stay readable
+    with override_options({"nodestore.segmented-encoding.enabled": False}):
+        ns.set_subkeys("node_2", {None: {"foo": "c"}, "other": {"foo": "d"}})
+    assert ns.get("node_2") == {"foo": "c"}
+    assert ns.get("node_2", subkey="other") == {"foo": "d"}
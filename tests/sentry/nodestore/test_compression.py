@@ -0,0 +1,98 @@
+import zlib
+
+import pytest
+
+from sentry.nodestore.base import json_dumps
+from sentry.nodestore.compression import ZSTD_MAGIC, NodeCompressor, train_dictionary
+
+
+def _make_payload(i: int, platform: str = "python") -> bytes:
+    return json_dumps(
+        {
+            "platform": platform,
+            "event_id": f"{i:032x}",
+            "exception": {
+                "values": [
+                    {
+                        "type": "ValueError",
+                        "value": f"invalid literal for int() with base 10: '{i}'",
+                        "stacktrace": {
+                            "frames": [
+                                {
+                                    "filename": f"app/module_{j}.py",
+                                    "function": f"handler_{j}",
+                                    "lineno": i % 500 + j,
+                                    "in_app": True,
+                                }
+                                for j in range(5)
+                            ]
+                        },
+                    }
+                ]
+            },
+        }
+    ).encode("utf8")
+
+
+@pytest.fixture
+def python_dictionary(tmp_path):
+    path = tmp_path / "python.dict"
+    path.write_bytes(train_dictionary([_make_payload(i) for i in range(1000)], dict_size=8192))
+    return str(path)
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+def test_roundtrip(codec):
+    compressor = NodeCompressor(codec=codec)
+    payload = _make_payload(1)
+
+    compressed = compressor.compress(payload)
+    assert compressed != payload
+    assert compressor.decompress(compressed) == payload
+
+
+def test_decompress_is_independent_of_codec():
+    payload = _make_payload(1)
+
+    # Legacy zlib payloads stay readable after switching to zstd, and the
+    # other way around.
+    assert NodeCompressor(codec="zstd").decompress(zlib.compress(payload)) == payload
+    zstd_payload = NodeCompressor(codec="zstd").compress(payload)
+    assert zstd_payload.startswith(ZSTD_MAGIC)
+    assert NodeCompressor(codec="zlib").decompress(zstd_payload) == payload
+
+
+def test_decompress_uncompressed_payload():
+    compressor = NodeCompressor(codec="zstd")
+    assert compressor.decompress(b'{"foo":"bar"}') == b'{"foo":"bar"}'
+
+
+def test_invalid_codec():
+    with pytest.raises(ValueError):
+        NodeCompressor(codec="lz4")
+
+
+def test_dictionary(python_dictionary):
+    compressor = NodeCompressor(codec="zstd", dictionaries={"python": python_dictionary})
+    payload = _make_payload(1001)
+
+    with_dictionary = compressor.compress(payload, platform="python")
+    without_dictionary = compressor.compress(payload, platform="javascript")
+    assert len(with_dictionary) < len(without_dictionary)
+
+    assert compressor.decompress(with_dictionary) == payload
+    assert compressor.decompress(without_dictionary) == payload
+
+    # Nodes compressed with a dictionary can't be read once it's removed
+    with pytest.raises(ValueError):
+        NodeCompressor(codec="zstd").decompress(with_dictionary)
+
+
+def test_stream_reader():
+    payload = _make_payload(1)
+
+    for codec in ("zlib", "zstd"):
+        compressor = NodeCompressor(codec=codec)
+        reader = compressor.stream_reader(compressor.compress(payload))
+        assert reader.read(10) == payload[:10]
+        assert reader.read() == payload[10:]
@@ -1,4 +1,5 @@
 from time import time
+from unittest import mock
 
 from sentry.ratelimits.redis import RedisRateLimiter
 from sentry.testutils.cases import TestCase
@@ -71,3 +72,67 @@ class RedisRateLimiterTest(TestCase):
             assert self.backend.is_limited("foo", 1, self.project)
             self.backend.reset("foo", self.project)
             assert not self.backend.is_limited("foo", 1, self.project)
+
+
+class RedisRateLimiterLeaseTest(TestCase):
+    def setUp(self):
+        self.backend = RedisRateLimiter(lease_size=5)
+
+    def test_lease(self):
+        with freeze_time("2000-01-01"):
+            with mock.patch.object(
+                self.backend.client, "pipeline", wraps=self.backend.client.pipeline
+            ) as pipeline:
+                for i in range(1, 6):
+                    assert self.backend.is_limited_with_value("foo", 7)[:2] == (False, i)
+                assert pipeline.call_count == 1
+                assert self.backend.current_value("foo") == 5
+
+                assert self.backend.is_limited_with_value("foo", 7)[:2] == (False, 6)
+                assert self.backend.is_limited_with_value("foo", 7)[:2] == (False, 7)
+                assert self.backend.is_limited_with_value("foo", 7)[:2] == (True, 8)
+                assert pipeline.call_count == 2
+                assert self.backend.current_value("foo") == 10
+
+    def test_lease_shared_counter(self):
+        other = RedisRateLimiter(lease_size=5)
+
+        with freeze_time("2000-01-01"):
+            assert not self.backend.is_limited("foo", 7)
+            # The other process claims the next block and can only use what is
+            # left below the limit.
+            assert not other.is_limited("foo", 7)
+            assert not other.is_limited("foo", 7)
+            assert other.is_limited("foo", 7)
+
+    def test_lease_expire(self):
+        with freeze_time("2000-01-01") as frozen_time:
+            assert self.backend.is_limited_with_value("foo", 1, window=10)[:2] == (False, 1)
+            assert self.backend.is_limited_with_value("foo", 1, window=10)[:2] == (True, 2)
+
+            frozen_time.shift(10)
+            assert self.backend.is_limited_with_value("foo", 1, window=10)[:2] == (False, 1)
+            assert len(self.backend._leases) == 1
+
+    def test_lease_reset(self):
+        with freeze_time("2000-01-01"):
+            assert not self.backend.is_limited("foo", 1)
+            assert self.backend.is_limited("foo", 1)
+            self.backend.reset("foo")
+            assert not self.backend.is_limited("foo", 1)
+
+    def test_lease_claimed_without_lock(self):
+        pipeline = self.backend.client.pipeline
+
+        def unlocked_pipeline(*args, **kwargs):
+            # Checks of other keys must not wait for the round trip to redis
+            assert not self.backend._leases_lock.locked()
+            return pipeline(*args, **kwargs)
+
+        with (
+            freeze_time("2000-01-01"),
+            mock.patch.object(self.backend.client, "pipeline", side_effect=unlocked_pipeline),
+        ):
+            assert self.backend.is_limited_with_value("foo", 7)[:2] == (False, 1)
+            assert self.backend.is_limited_with_value("bar", 7)[:2] == (False, 1)
+            assert self.backend.is_limited_with_value("foo", 7)[:2] == (False, 2)
@@ -71,3 +71,57 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_bulk(limiter):
+    quotas = [
+        Quota(
+            window_seconds=10,
+            granularity_seconds=1,
+            limit=3,
+        )
+    ]
+
+    requests = [
+        RequestedQuota(prefix=prefix, requested=1, quotas=quotas)
+        for prefix in ["foo", "bar", "foo", "foo", "foo", "bar"]
+    ]
+    resp = limiter.check_and_use_quotas_bulk(requests, timestamp=TIMESTAMP_OFFSET)
+    assert resp == [
+        GrantedQuota(prefix="foo", granted=1, reached_quotas=[]),
+        GrantedQuota(prefix="bar", granted=1, reached_quotas=[]),
+        GrantedQuota(prefix="foo", granted=1, reached_quotas=[]),
+        GrantedQuota(prefix="foo", granted=1, reached_quotas=[]),
+        GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas),
+        GrantedQuota(prefix="bar", granted=1, reached_quotas=[]),
+    ]
+
+    # The quota used in bulk is visible to regular checks
+    resp = limiter.check_and_use_quotas(
+        [
+            RequestedQuota(prefix="foo", requested=1, quotas=quotas),
+            RequestedQuota(prefix="bar", requested=2, quotas=quotas),
+        ],
+        timestamp=TIMESTAMP_OFFSET + 1,
+    )
+    assert resp == [
+        GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas),
+        GrantedQuota(prefix="bar", granted=1, reached_quotas=quotas),
+    ]
+
+
+def test_bulk_global_quota(limiter):
+    global_quota = Quota(
+        window_seconds=10,
+        granularity_seconds=1,
+        limit=2,
+        prefix_override="global",
+    )
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=5), global_quota]
+
+    resp = limiter.check_and_use_quotas_bulk(
+        [RequestedQuota(prefix=prefix, requested=1, quotas=quotas) for prefix in "abc"],
+        timestamp=TIMESTAMP_OFFSET,
+    )
+    assert [grant.granted for grant in resp] == [1, 1, 0]
+    assert resp[2].reached_quotas == [global_quota]
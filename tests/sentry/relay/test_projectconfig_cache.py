@@ -1,6 +1,7 @@
 from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
+from sentry.relay.projectconfig_cache.delta import apply_delta, create_delta
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import metrics
 
@@ -18,6 +19,24 @@ def test_delete_count(monkeypatch):
     )
 
 
+@django_db_all
+def test_set_if_unchanged():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"a": {"foo": "bar", "rev": "1"}, "b": {"foo": "bar", "rev": "1"}})
+
+    conflicts = cache.set_many(
+        {"a": {"foo": "baz", "rev": "2"}, "b": {"foo": "baz", "rev": "3"}, "c": {"rev": "4"}},
+        expected_revisions={"a": "1", "b": "0", "c": "0"},
+    )
+
+    assert sorted(conflicts) == ["b", "c"]
+    assert cache.get("a") == {"foo": "baz", "rev": "2"}
+    assert cache.get_rev("a") == "2"
+    assert cache.get("b") == {"foo": "bar", "rev": "1"}
+    assert cache.get_rev("b") == "1"
+    assert cache.get("c") is None
+
+
 @django_db_all
 def test_read_write():
     cache = redis.RedisProjectConfigCache()
@@ -34,3 +53,46 @@ def test_read_write():
 
     assert cache.get_rev(dsn1) == "my_rev_123"
     assert cache.get_rev(dsn2) is None
+
+
+@django_db_all
+def test_delta():
+    cache = redis.RedisProjectConfigCache()
+
+    value1 = {"rev": "rev1", "config": {"a": 1, "b": [1, 2], "c": "foo"}}
+    value2 = {"rev": "rev2", "config": {"a": 1, "b": [1, 2, 3]}}
+
+    cache.set_many({"dsn": value1})
+    assert cache.get_delta("dsn", "rev0") is None
+    assert cache.get_delta("dsn", "rev1") == {"baseRev": "rev1", "rev": "rev1", "patch": {}}
+
+    cache.set_many({"dsn": value2})
+    delta = cache.get_delta("dsn", "rev1")
+    assert delta == {
+        "baseRev": "rev1",
+        "rev": "rev2",
+        "patch": {"rev": "rev2", "config": {"b": [1, 2, 3], "c": None}},
+    }
+    assert apply_delta(value1, delta["patch"]) == value2
+
+    # Only the delta from the previous revision is kept
+    cache.set_many({"dsn": {**value2, "rev": "rev3"}})
+    assert cache.get_delta("dsn", "rev1") is None
+    assert cache.get_delta("dsn", "rev2") is not None
+
+    cache.delete_many(["dsn"])
+    assert cache.get_delta("dsn", "rev2") is None
+    assert cache.get_delta("dsn", "rev3") is None
+
+
+def test_create_delta():
+    old = {"rev": "1", "config": {"a": {"b": 1, "c": 2}, "d": [None]}, "e": 1}
+    new = {"rev": "2", "config": {"a": {"b": 1, "c": 3}, "d": [None]}, "f": {"g": 1}}
+
+    patch = create_delta(old, new)
+    assert patch == {"rev": "2", "config": {"a": {"c": 3}}, "e": None, "f": {"g": 1}}
+    assert apply_delta(old, patch) == new
+
+    # Setting a value to `None` cannot be expressed in a merge patch.
+    assert create_delta(old, {**new, "e": None}) is None
+    assert create_delta(old, {**new, "f": {"g": None}}) is None
@@ -1,11 +1,20 @@
+from array import array
+from unittest import mock
+
 import pytest
 from snuba_sdk import Entity
 
 from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
 from sentry.exceptions import InvalidSearchQuery
+from sentry.models.group import Group
 from sentry.search.events.constants import TIMESTAMP_FIELDS
 from sentry.search.events.types import SnubaParams
-from sentry.search.snuba.executors import GroupAttributesPostgresSnubaQueryExecutor
+from sentry.search.snuba.executors import (
+    GroupAttributesPostgresSnubaQueryExecutor,
+    estimate_chunk_size,
+    fetch_sorted_candidate_ids,
+    intersect_sorted_candidate_ids,
+)
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now
 
@@ -56,3 +65,31 @@ class GroupAttributesPostgresSnubaQueryExecutorTest(SnubaTestCase, TestCase):
                         end=self.two_min_ago,
                     ),
                 )
+
+
+def test_estimate_chunk_size():
+    # 10 results needed at 10% selectivity, plus headroom
+    assert estimate_chunk_size(10, 0.1, limit=5, max_chunk_size=1000) == 120
+    # Never smaller than the page size
+    assert estimate_chunk_size(1, 1.0, limit=25, max_chunk_size=1000) == 25
+    # Never larger than the maximum chunk size
+    assert estimate_chunk_size(100, 0.001, limit=25, max_chunk_size=1000) == 1000
+
+
+def test_intersect_sorted_candidate_ids():
+    candidate_ids = array("q", [2, 3, 5, 8, 13])
+    assert intersect_sorted_candidate_ids(candidate_ids, [13, 1, 5, 14, 2]) == [13, 5, 2]
+    assert intersect_sorted_candidate_ids(array("q"), [1, 2]) == []
+
+
+class FetchSortedCandidateIdsTest(TestCase):
+    @mock.patch("sentry.search.snuba.executors.CANDIDATE_BLOCK_SIZE", 2)
+    def test_fetch_in_blocks(self):
+        groups = [self.create_group(project=self.project) for _ in range(5)]
+        queryset = Group.objects.filter(project=self.project)
+
+        candidate_ids = fetch_sorted_candidate_ids(queryset, max_candidates=5)
+        assert candidate_ids is not None
+        assert list(candidate_ids) == sorted(group.id for group in groups)
+
+        assert fetch_sorted_candidate_ids(queryset, max_candidates=4) is None
@@ -1,10 +1,11 @@
 from datetime import timedelta
+from unittest import mock
 
 import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalIndexerCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -240,3 +241,51 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+def test_local_cache(use_case_id: str) -> None:
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=2,
+    )
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+        }
+    ):
+        cache.clear()
+        namespace = "test"
+        values = {f"{use_case_id}:1:a": 1, f"{use_case_id}:1:b": 2}
+        local_indexer_cache.set_many(namespace, values)
+
+        # Served from the local cache without consulting the shared cache
+        cache.clear()
+        assert local_indexer_cache.get_many(namespace, values.keys()) == values
+        assert local_indexer_cache.get(namespace, f"{use_case_id}:1:a") == 1
+
+        # Misses are read from the shared cache and kept locally, evicting the
+        # least recently used entry
+        cache.set(local_indexer_cache._make_cache_key(f"{use_case_id}:1:c"), 3)
+        assert local_indexer_cache.get_many(namespace, [f"{use_case_id}:1:c"]) == {
+            f"{use_case_id}:1:c": 3
+        }
+        cache.clear()
+        assert local_indexer_cache.get_many(
+            namespace, [f"{use_case_id}:1:a", f"{use_case_id}:1:b", f"{use_case_id}:1:c"]
+        ) == {f"{use_case_id}:1:a": 1, f"{use_case_id}:1:b": None, f"{use_case_id}:1:c": 3}
+
+        local_indexer_cache.delete(namespace, f"{use_case_id}:1:a")
+        assert local_indexer_cache.get(namespace, f"{use_case_id}:1:a") is None
+
+
+def test_local_cache_ttl() -> None:
+    local_cache = LocalIndexerCache(max_size=10, ttl=60)
+    with mock.patch("time.monotonic", return_value=1000):
+        local_cache.set_many("test", {"a": 1})
+        assert local_cache.get_many("test", ["a"]) == {"a": 1}
+        assert local_cache.get_many("other", ["a"]) == {}
+
+    with mock.patch("time.monotonic", return_value=1060):
+        assert local_cache.get_many("test", ["a"]) == {}
@@ -0,0 +1,57 @@
+import time
+from unittest import mock
+
+import pytest
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import Message, Partition, Topic, Value
+
+from sentry.spans.buffer import SpansBuffer
+from sentry.spans.consumers.process.flusher import SpanFlusher
+
+
+def _message(payload: int) -> Message[int]:
+    return Message(Value(payload, {Partition(Topic("test"), 0): 1}))
+
+
+@pytest.fixture
+def flusher(monkeypatch, request):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+    flusher = SpanFlusher(
+        SpansBuffer(assigned_shards=list(range(5))),
+        max_flush_segments=10,
+        produce_to_pipe=lambda payload: None,
+        next_step=mock.Mock(),
+        max_processes=2,
+    )
+    request.addfinalizer(flusher.join)
+    return flusher
+
+
+def test_shards_distributed_across_processes(flusher):
+    assert flusher.process_shards == [[0, 2, 4], [1, 3]]
+    assert len(flusher.processes) == 2
+
+
+def test_backpressure(flusher):
+    # Stop the flusher threads so they don't reset the backpressure flags
+    flusher.stopped.value = True
+    for process in flusher.processes:
+        process.join()
+
+    now = int(time.time())
+    flusher.submit(_message(now + 100))
+    assert flusher.next_step.submit.call_count == 1
+
+    flusher.process_backpressure_since[1].value = now
+
+    with pytest.raises(MessageRejected):
+        flusher.submit(_message(now + 200))
+    assert flusher.next_step.submit.call_count == 1
+
+    # The clock keeps advancing so that the flushers can catch up
+    assert flusher.current_drift.value >= 199
+
+    flusher.process_backpressure_since[1].value = 0
+    flusher.submit(_message(now + 200))
+    assert flusher.next_step.submit.call_count == 2
@@ -0,0 +1,82 @@
+from sentry.spans.consumers.process_segments.columns import SegmentColumns
+from tests.sentry.spans.consumers.process import build_mock_span
+
+
+def _build_spans():
+    return [
+        build_mock_span(
+            project_id=1,
+            start_timestamp_precise=1609455605.0,
+            end_timestamp_precise=1609455606.0,
+            span_id="cccccccccccccccc",
+            parent_span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp_precise=1609455601.5,
+            end_timestamp_precise=1609455602.0,
+            span_id="dddddddddddddddd",
+            parent_span_id="bbbbbbbbbbbbbbbb",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp_precise=1609455600.5,
+            end_timestamp_precise=1609455602.0,
+            span_id="eeeeeeeeeeeeeeee",
+            parent_span_id="ffffffffffffffff",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp_precise=1609455601.0,
+            end_timestamp_precise=1609455603.0,
+            span_id="bbbbbbbbbbbbbbbb",
+            parent_span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            is_segment=True,
+            start_timestamp_precise=1609455600.0,
+            end_timestamp_precise=1609455610.0,
+            span_id="aaaaaaaaaaaaaaaa",
+        ),
+    ]
+
+
+def test_columns():
+    spans = _build_spans()
+    columns = SegmentColumns(spans)
+
+    assert len(columns) == len(spans)
+    assert list(columns) == spans
+    assert columns[4] is spans[4]
+    assert list(columns.start) == [span["start_timestamp_precise"] for span in spans]
+    assert list(columns.end) == [span["end_timestamp_precise"] for span in spans]
+    assert list(columns.parent) == [4, 3, -1, 4, -1]
+    assert columns.get_children(4) == [0, 3]
+    assert columns.get_children(3) == [1]
+    assert columns.get_children(2) == []
+
+
+def test_tree_order():
+    spans = _build_spans()
+    columns = SegmentColumns(spans)
+
+    # Depth first from the segment span with siblings ordered by start time,
+    # followed by orphaned spans.
+    assert [spans[index]["span_id"] for index in columns.tree_order()] == [
+        "aaaaaaaaaaaaaaaa",
+        "bbbbbbbbbbbbbbbb",
+        "dddddddddddddddd",
+        "cccccccccccccccc",
+        "eeeeeeeeeeeeeeee",
+    ]
+
+
+def test_tree_order_duplicate_span_ids():
+    spans = _build_spans()
+    spans.append(dict(spans[0]))
+    columns = SegmentColumns(spans)
+
+    order = columns.tree_order()
+    assert len(order) == len(spans) - 1
+    assert 5 not in order
@@ -496,3 +496,86 @@ def test_flush_rebalance(buffer: SpansBuffer):
     assert not rv
 
     assert_clean(buffer.client)
+
+
+def _build_segment(num_children: int) -> list[Span]:
+    return [
+        Span(
+            payload=_payload(f"{i:016x}".encode("ascii")),
+            trace_id="a" * 32,
+            span_id=f"{i:016x}",
+            parent_span_id="b" * 16,
+            project_id=1,
+        )
+        for i in range(1, num_children + 1)
+    ] + [
+        Span(
+            payload=_payload(b"b" * 16),
+            trace_id="a" * 32,
+            span_id="b" * 16,
+            parent_span_id=None,
+            is_segment_span=True,
+            project_id=1,
+        )
+    ]
+
+
+def test_large_subsegment(buffer: SpansBuffer):
+    # More spans than the script adds to a set at once
+    spans = _build_segment(2500)
+
+    with mock.patch.object(
+        buffer.client, "pipeline", wraps=buffer.client.pipeline
+    ) as pipeline_mock:
+        process_spans(spans, buffer, now=0)
+    # One pipeline running the script for the single subsegment, one updating the queue
+    assert pipeline_mock.call_count == 2
+
+    assert_ttls(buffer.client)
+
+    rv = buffer.flush_segments(now=11)
+    _normalize_output(rv)
+    segment_key = _segment_id(1, "a" * 32, "b" * 16)
+    assert list(rv) == [segment_key]
+    assert {span.payload["span_id"] for span in rv[segment_key].spans} == {
+        span.span_id for span in spans
+    }
+
+    buffer.done_flush_segments(rv)
+    assert buffer.flush_segments(now=90) == {}
+
+    assert_clean(buffer.client)
+
+
+def test_flush_paged_segment(buffer: SpansBuffer):
+    buffer.segment_page_size = 10
+
+    spans = _build_segment(100)
+    process_spans(spans, buffer, now=0)
+
+    rv = buffer.flush_segments(now=11)
+    segment_key = _segment_id(1, "a" * 32, "b" * 16)
+    assert len(rv[segment_key].spans) == len(spans)
+
+    buffer.done_flush_segments(rv)
+    assert_clean(buffer.client)
+
+
+def test_flush_segment_size_exceeded(buffer: SpansBuffer):
+    spans = _build_segment(100)
+    buffer.segment_page_size = 10
+    buffer.max_segment_bytes = sum(len(span.payload) for span in spans[:50])
+
+    process_spans(spans, buffer, now=0)
+
+    with mock.patch("sentry.spans.buffer.metrics.incr") as incr:
+        rv = buffer.flush_segments(now=11)
+
+    segment_key = _segment_id(1, "a" * 32, "b" * 16)
+    span_ids = {span.payload["span_id"] for span in rv[segment_key].spans}
+    # The segment span is kept even if it is read after the limit is reached.
+    assert "b" * 16 in span_ids
+    assert len(span_ids) in (50, 51)
+    incr.assert_any_call(
+        "spans.buffer.flush_segments.segment_size_exceeded", amount=len(spans) - len(span_ids)
+    )
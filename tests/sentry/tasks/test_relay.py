@@ -13,10 +13,12 @@ from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDe
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_projectkey_config,
     invalidate_project_config,
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.task_runner import BurstTaskRunner
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -128,6 +130,26 @@ def invalidation_debounce_cache(monkeypatch):
     return debounce_cache
 
 
+@pytest.fixture
+def partial_invalidation_debounce_cache(monkeypatch):
+    debounce_caches: dict[str, RedisProjectConfigDebounceCache] = {}
+
+    def get_partial_invalidation(sections):
+        sections_key = ":".join(sorted(sections))
+        if sections_key not in debounce_caches:
+            debounce_caches[sections_key] = RedisProjectConfigDebounceCache(
+                key_prefix=f"relayconfig-partial-invalidation-dedup:{sections_key}"
+            )
+        return debounce_caches[sections_key]
+
+    monkeypatch.setattr(
+        "sentry.relay.projectconfig_debounce_cache.get_partial_invalidation",
+        get_partial_invalidation,
+    )
+
+    return get_partial_invalidation
+
+
 @django_db_all
 def test_debounce(
     monkeypatch,
@@ -406,6 +428,46 @@ class TestInvalidationTask:
             },
         ]
 
+    def test_debounce_partial(
+        self,
+        monkeypatch,
+        default_project,
+        invalidation_debounce_cache,
+        partial_invalidation_debounce_cache,
+        django_cache,
+    ):
+        tasks = []
+
+        def apply_async(args=None, kwargs=None, countdown=None):
+            assert not args
+            tasks.append(kwargs)
+
+        monkeypatch.setattr("sentry.tasks.relay.invalidate_project_config.apply_async", apply_async)
+
+        for trigger in (
+            "dynamic_sampling:boost_release",
+            "dynamic_sampling_boost_low_volume_projects",
+            "alerts:create-on-demand-metric",
+        ):
+            schedule_invalidate_project_config(project_id=default_project.id, trigger=trigger)
+
+        # Partial invalidations do not debounce full invalidations.
+        schedule_invalidate_project_config(project_id=default_project.id, trigger="test")
+
+        # A pending full invalidation also recomputes the sampling section.
+        partial_invalidation_debounce_cache(["sampling"]).mark_task_done(
+            public_key=None, project_id=default_project.id, organization_id=None
+        )
+        schedule_invalidate_project_config(
+            project_id=default_project.id, trigger="dynamic_sampling:boost_release"
+        )
+
+        assert [(task["trigger"], task.get("sections")) for task in tasks] == [
+            ("dynamic_sampling:boost_release", ["sampling"]),
+            ("alerts:create-on-demand-metric", ["metricExtraction"]),
+            ("test", None),
+        ]
+
     def test_invalidate(
         self,
         monkeypatch,
@@ -454,6 +516,94 @@ class TestInvalidationTask:
             assert new_cfg is not None
             assert new_cfg != cfg
 
+    def test_invalidate_partial(
+        self,
+        default_project,
+        default_projectkey,
+        redis_cache,
+        invalidation_debounce_cache,
+        task_runner,
+        django_cache,
+    ):
+        cfg = compute_projectkey_config(default_projectkey)
+        cfg["config"]["sampling"] = "stale"
+        cfg["config"]["dummy-key"] = "val"
+        redis_cache.set_many({default_projectkey.public_key: cfg})
+
+        with task_runner():
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="dynamic_sampling:boost_release"
+            )
+
+        new_cfg = redis_cache.get(default_projectkey.public_key)
+        # Only the sampling section is recomputed, everything else is reused.
+        assert new_cfg["config"].get("sampling") != "stale"
+        assert new_cfg["config"]["dummy-key"] == "val"
+        assert new_cfg["rev"] != cfg["rev"]
+
+        # Partial invalidations do not debounce full invalidations.
+        assert not invalidation_debounce_cache.is_debounced(
+            public_key=None, project_id=default_project.id, organization_id=None
+        )
+
+    def test_invalidate_partial_conflict(
+        self,
+        default_project,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        cfg = compute_projectkey_config(default_projectkey)
+        cfg["config"]["dummy-key"] = "val"
+        redis_cache.set_many({default_projectkey.public_key: cfg})
+        full_cfg = compute_projectkey_config(default_projectkey)
+
+        from sentry.relay.config import update_project_config
+
+        def concurrent_full_recompute(*args, **kwargs):
+            # A full recompute finishes while the partial one is in flight.
+            redis_cache.set_many({default_projectkey.public_key: full_cfg})
+            return update_project_config(*args, **kwargs)
+
+        with (
+            mock.patch(
+                "sentry.relay.config.update_project_config", side_effect=concurrent_full_recompute
+            ),
+            task_runner(),
+        ):
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="dynamic_sampling:boost_release"
+            )
+
+        # The stale parts of the config the partial update was based on are not
+        # written back, the config is computed in full instead.
+        new_cfg = redis_cache.get(default_projectkey.public_key)
+        assert "dummy-key" not in new_cfg["config"]
+        assert new_cfg["rev"] not in (cfg["rev"], full_cfg["rev"])
+
+    def test_invalidate_partial_disabled(
+        self,
+        default_project,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        redis_cache.set_many({default_projectkey.public_key: {"dummy-key": "val"}})
+
+        with (
+            override_options({"relay.project-config.partial-invalidation.enabled": False}),
+            task_runner(),
+        ):
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="dynamic_sampling:boost_release"
+            )
+
+        new_cfg = redis_cache.get(default_projectkey.public_key)
+        assert "dummy-key" not in new_cfg
+        assert new_cfg["disabled"] is False
+
     @mock.patch(
         "sentry.tasks.relay._schedule_invalidate_project_config",
         wraps=_schedule_invalidate_project_config,
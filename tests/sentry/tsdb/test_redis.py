@@ -191,6 +191,34 @@ class RedisTSDBTest(TestCase):
         )
         assert sum_results == {1: 0, 2: 0}
 
+    def test_get_range_many_keys(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+
+        def timestamp(d):
+            t = int(d.timestamp())
+            return t - (t % 3600)
+
+        # More keys than vnodes, so that several keys share each hash
+        keys = list(range(1, self.db.vnodes * 2 + 1))
+        for key in keys:
+            self.db.incr(TSDBModel.project, key, dts[key % 4], count=key)
+
+        results = self.db.get_range(TSDBModel.project, keys, dts[0], dts[-1])
+        assert results == {
+            key: [(timestamp(dts[i]), key if i == key % 4 else 0) for i in range(4)]
+            for key in keys
+        }
+
+        self.db.merge(TSDBModel.project, 1, keys[1:], now)
+
+        results = self.db.get_range(TSDBModel.project, keys, dts[0], dts[-1])
+        assert results[1] == [
+            (timestamp(dts[i]), sum(key for key in keys if key % 4 == i)) for i in range(4)
+        ]
+        for key in keys[1:]:
+            assert results[key] == [(timestamp(dts[i]), 0) for i in range(4)]
+
     def test_count_distinct(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -128,3 +128,20 @@ def test_multiple_key_operations(properties: Properties) -> None:
     store.delete_many(all_keys)
 
     assert dict(store.get_many(all_keys)) == {}
+
+
+def test_set_many(properties: Properties) -> None:
+    store = properties.store
+
+    items = dict(itertools.islice(properties.items, 10))
+    store.set_many(list(items.items()))
+
+    assert dict(store.get_many(list(items.keys()))) == items
+
+    # Test overwriting a subset of the keys.
+    updated = dict(zip(list(items)[:5], itertools.islice(properties.values, 5)))
+    store.set_many(list(updated.items()))
+
+    assert dict(store.get_many(list(items.keys()))) == {**items, **updated}
+
+    store.delete_many(list(items.keys()))
@@ -19,10 +19,13 @@ from sentry.utils.performance_issues.detectors.n_plus_one_db_span_detector impor
     NPlusOneDBSpanDetector,
 )
 from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
     EventPerformanceProblem,
     _detect_performance_problems,
     detect_performance_problems,
     get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
 )
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
 
@@ -697,3 +700,30 @@ class EventPerformanceProblemTest(TestCase):
 )
 def test_total_span_time(spans, duration):
     assert total_span_time(spans) == pytest.approx(duration, 0.01)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "event_name",
+    [
+        "consecutive-http/consecutive-http-basic",
+        "m-n-plus-one-db/m-n-plus-one-graphql",
+        "m-n-plus-one-db/m-n-plus-one-mostly-http",
+        "n-plus-one-api-calls/n-plus-one-api-calls-in-issue-stream",
+        "n-plus-one-in-django-index-view",
+        "query-waterfall-in-django-random-view",
+        "slow-db-spans",
+        "uncompressed-assets/uncompressed-script-asset",
+    ],
+)
+def test_run_detectors_on_data(event_name):
+    event = get_event(event_name)
+    settings = get_detection_settings()
+
+    fused_detectors = [detector_class(settings, event) for detector_class in DETECTOR_CLASSES]
+    run_detectors_on_data(fused_detectors, event)
+
+    for fused_detector in fused_detectors:
+        detector = type(fused_detector)(settings, event)
+        run_detector_on_data(detector, event)
+        assert fused_detector.stored_problems == detector.stored_problems
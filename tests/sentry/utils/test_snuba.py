@@ -3,21 +3,29 @@ from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
+from snuba_sdk import Column, Condition, Entity, Limit, Op, Query, Request
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
+from sentry.locks import locks
 from sentry.models.grouprelease import GroupRelease
 from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.utils import json
 from sentry.utils.snuba import (
     ROUND_UP,
     RetrySkipTimeout,
     SnubaQueryParams,
+    SnubaRequest,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -443,3 +451,112 @@ def test_retries():
         snuba_pool.urlopen("POST", "/query", body="{}")
 
     assert connection_mock.request.call_count == 1
+
+
+class QueryCacheTest(TestCase):
+    def _request(self, end: datetime) -> Request:
+        return Request(
+            dataset="events",
+            app_id="tests",
+            tenant_ids={"referrer": "testing.test", "organization_id": 1},
+            query=Query(
+                Entity("events"),
+                select=[Column("event_id")],
+                where=[
+                    Condition(Column("project_id"), Op.EQ, 1),
+                    Condition(Column("timestamp"), Op.GTE, end - timedelta(days=1)),
+                    Condition(Column("timestamp"), Op.LT, end),
+                ],
+                limit=Limit(1),
+            ),
+        )
+
+    def _snuba_request(self, end: datetime | None = None) -> SnubaRequest:
+        request = self._request(end or datetime(2024, 1, 1, 9, 0, 10))
+        # Set by `_apply_cache_and_build_results` before the cache key is built
+        request.parent_api = "<missing>"
+        return SnubaRequest(
+            request=request,
+            referrer=None,
+            forward=lambda x: x,
+            reverse=lambda x: x,
+        )
+
+    def test_cache_key_time_bucket(self):
+        request = self._request(datetime(2024, 1, 1, 9, 0, 10))
+        same_bucket = self._request(datetime(2024, 1, 1, 9, 0, 50))
+        next_bucket = self._request(datetime(2024, 1, 1, 9, 1, 10))
+
+        assert get_cache_key(request) != get_cache_key(same_bucket)
+        assert get_cache_key(request, 60) == get_cache_key(same_bucket, 60)
+        assert get_cache_key(request, 60) != get_cache_key(next_bucket, 60)
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": []}])
+    def test_coalesce_disabled_by_default(self, bulk_snuba_query):
+        snuba_request = self._snuba_request()
+        cache_key = get_cache_key(snuba_request.request)
+
+        lease = locks.get(f"{cache_key}:lease", duration=10, name="test")
+        with lease.acquire(), mock.patch("sentry.utils.snuba.time.sleep") as sleep:
+            results = _apply_cache_and_build_results([snuba_request], use_cache=True)
+
+        assert results == [{"data": []}]
+        assert bulk_snuba_query.call_count == 1
+        assert sleep.call_count == 0
+
+    @override_settings(SENTRY_SNUBA_CACHE_LEASE_SECONDS=10)
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesce_identical_queries(self, bulk_snuba_query):
+        snuba_request = self._snuba_request()
+        cache_key = get_cache_key(snuba_request.request)
+
+        def sleep(_):
+            # Another worker finishes running the query
+            cache.set(cache_key, json.dumps({"data": [{"event_id": "a"}]}))
+
+        lease = locks.get(f"{cache_key}:lease", duration=10, name="test")
+        with lease.acquire(), mock.patch("sentry.utils.snuba.time.sleep", side_effect=sleep):
+            results = _apply_cache_and_build_results([snuba_request], use_cache=True)
+
+        assert results == [{"data": [{"event_id": "a"}]}]
+        assert bulk_snuba_query.call_count == 0
+
+    @override_settings(SENTRY_SNUBA_CACHE_LEASE_SECONDS=10)
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": []}])
+    def test_coalesce_lease_released_without_result(self, bulk_snuba_query):
+        snuba_request = self._snuba_request()
+        cache_key = get_cache_key(snuba_request.request)
+
+        lease = locks.get(f"{cache_key}:lease", duration=10, name="test")
+        lease.acquire()
+        with mock.patch("sentry.utils.snuba.time.sleep", side_effect=lambda _: lease.release()):
+            results = _apply_cache_and_build_results([snuba_request], use_cache=True)
+
+        assert results == [{"data": []}]
+        assert bulk_snuba_query.call_count == 1
+        assert json.loads(cache.get(cache_key)) == {"data": []}
+        assert not lease.locked()
+
+    @override_settings(SENTRY_SNUBA_CACHE_LEASE_SECONDS=10)
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": []}])
+    def test_coalesce_releases_leases_before_waiting(self, bulk_snuba_query):
+        leading_request = self._snuba_request()
+        waiting_request = self._snuba_request(datetime(2024, 1, 2, 9, 0, 10))
+        leading_key = get_cache_key(leading_request.request)
+        waiting_key = get_cache_key(waiting_request.request)
+
+        def sleep(_):
+            # Our own query has been run, cached and its lease released, so
+            # that a worker waiting on it can make progress.
+            assert json.loads(cache.get(leading_key)) == {"data": []}
+            assert not locks.get(f"{leading_key}:lease", duration=10, name="test").locked()
+            cache.set(waiting_key, json.dumps({"data": [{"event_id": "a"}]}))
+
+        lease = locks.get(f"{waiting_key}:lease", duration=10, name="test")
+        with lease.acquire(), mock.patch("sentry.utils.snuba.time.sleep", side_effect=sleep):
+            results = _apply_cache_and_build_results(
+                [leading_request, waiting_request], use_cache=True
+            )
+
+        assert results == [{"data": []}, {"data": [{"event_id": "a"}]}]
+        assert bulk_snuba_query.call_count == 1
@@ -22,6 +22,7 @@ from sentry.testutils.abstract import Abstract
 from sentry.testutils.cases import PerformanceIssueTestCase, SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now
 from sentry.utils.samples import load_data
+from sentry.utils.snuba import bulk_snuba_queries
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 exception = {
@@ -404,6 +405,64 @@ class TagStorageTest(TestCase, SnubaTestCase, SearchIssueTestMixin, PerformanceI
             == 1
         )
 
+    def test_get_groups_tag_value_count(self):
+        perf_group, env = self.perf_group_and_env
+
+        groups = [self.proj1group1, self.proj1group2, perf_group]
+        tenant_ids = {"referrer": "r", "organization_id": 1234}
+
+        result = self.ts.get_groups_tag_value_count(groups, env.id, "foo", tenant_ids=tenant_ids)
+        assert set(result) == {group.id for group in groups}
+        for group in groups:
+            expected = self.ts.get_group_tag_value_count(group, env.id, "foo", tenant_ids)
+            assert result[group.id] == (expected or 0)
+
+    def test_get_groups_tag_keys_and_top_values(self):
+        perf_group, env = self.perf_group_and_env
+        groups = [self.proj1group1, self.proj1group2, perf_group]
+        tenant_ids = {"referrer": "r", "organization_id": 1234}
+
+        result = self.ts.get_groups_tag_keys_and_top_values(groups, [env.id], tenant_ids=tenant_ids)
+        assert set(result) == {group.id for group in groups}
+
+        for group in groups:
+            expected = self.ts.get_group_tag_keys_and_top_values(
+                group, [env.id], tenant_ids=tenant_ids
+            )
+            assert {k.key: k.count for k in result[group.id]} == {k.key: k.count for k in expected}
+            assert {k.key: set(k.top_values) for k in result[group.id]} == {
+                k.key: set(k.top_values) for k in expected
+            }
+
+        result = self.ts.get_groups_tag_keys_and_top_values(
+            groups, [env.id], keys=["foo"], value_limit=1, tenant_ids=tenant_ids
+        )
+        for keys in result.values():
+            assert all(k.key == "foo" and len(k.top_values) <= 1 for k in keys)
+
+    def test_get_groups_tag_keys_and_top_values_splits_truncated_batches(self):
+        groups = [self.proj1group1, self.proj1group2]
+        tenant_ids = {"referrer": "r", "organization_id": 1234}
+
+        with (
+            mock.patch("sentry.tagstore.snuba.backend.BULK_GROUP_TAGS_ROW_LIMIT", 2),
+            mock.patch(
+                "sentry.tagstore.snuba.backend.bulk_snuba_queries",
+                wraps=bulk_snuba_queries,
+            ) as bulk_queries,
+        ):
+            result = self.ts.get_groups_tag_keys_and_top_values(
+                groups, [self.proj1env1.id], tenant_ids=tenant_ids
+            )
+
+        # Both groups have more than 2 tag keys, so the batch of both groups is
+        # split and each group is queried again on its own.
+        assert bulk_queries.call_count == 2
+        assert len(bulk_queries.call_args_list[0].args[0]) == 2
+        assert len(bulk_queries.call_args_list[1].args[0]) == 4
+        assert set(result) == {group.id for group in groups}
+        assert all(result.values())
+
     def test_get_tag_keys(self):
         expected_keys = {
             "baz",